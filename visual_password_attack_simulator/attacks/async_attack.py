@@ -0,0 +1,285 @@
+"""
+Ejecución de ataques desde asyncio.
+
+`AsyncAttack` crea y ejecuta un ataque en un ejecutor (hilos o procesos)
+y lo expone al bucle de eventos como un iterador asíncrono de eventos de
+progreso y un resultado que se puede esperar.  Es la alternativa sin Qt a
+``ui.attack_thread.AttackThread``: varios ataques pueden ejecutarse a la
+vez desde un mismo bucle (un panel web local, un banco de pruebas) sin un
+QThread por ataque.
+
+- Con un ``ProcessPoolExecutor`` el ataque se construye y se ejecuta en
+  otro proceso; los eventos y la cancelación viajan por una cola y un
+  evento de un ``multiprocessing.Manager``.  La clase del ataque y sus
+  argumentos deben poder serializarse con pickle.
+- Con cualquier otro ejecutor (por defecto, el de hilos del bucle) el
+  ataque se ejecuta en un hilo del mismo proceso.
+
+Ejemplo::
+
+    run = AsyncAttack(DictionaryAttack, objetivo, executor=pool)
+    async for event in run:
+        if isinstance(event, ProgressEvent):
+            print(event.attempts)
+    result = await run
+
+`cancel` detiene el ataque (que termina como al pulsar "Detener" y guarda
+su punto de control si lo tiene); cancelar la tarea que espera el
+resultado también lo detiene.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional, Sequence, Type, Union
+
+from .base_attack import BaseAttack
+
+# Segundos entre comprobaciones de la cancelación y de la cola remota
+POLL_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Señal ``progress``: intentos, total estimado (0 si se desconoce) y segundos."""
+    attempts: int
+    total: int
+    elapsed: float
+
+
+@dataclass(frozen=True)
+class KeyspaceEvent:
+    """Señal ``keyspace_progress``: posición y tamaño del espacio de claves."""
+    position: int
+    size: int
+
+
+@dataclass(frozen=True)
+class FoundEvent:
+    """Señal ``found``: contraseña descubierta, intentos y segundos."""
+    password: str
+    attempts: int
+    elapsed: float
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    """Señal ``log``."""
+    message: str
+
+
+AttackEvent = Union[ProgressEvent, KeyspaceEvent, FoundEvent, LogEvent]
+
+
+@dataclass
+class AttackResult:
+    """Resultado de un ataque terminado.
+
+    Atributos:
+        found: Contraseñas descubiertas, en orden.
+        attempts: Intentos del último progreso publicado (exacto al terminar).
+        elapsed: Segundos de ataque.
+        cancelled: ``True`` si se detuvo antes de descubrir todos los
+            objetivos o agotar los candidatos.
+    """
+    found: List[FoundEvent] = field(default_factory=list)
+    attempts: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+
+# Marca de fin de la secuencia de eventos
+_END = None
+
+
+def _execute(
+    attack_cls: Type[BaseAttack],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    events: Any,
+    cancel: Any,
+) -> AttackResult:
+    """Construye y ejecuta el ataque; corre en el hilo o proceso del ejecutor.
+
+    De ``events`` solo se usa ``put`` y de ``cancel``, ``is_set`` y
+    ``wait``, de modo que sirven tanto los objetos de ``threading`` como
+    los de un ``Manager``.
+    """
+    result = AttackResult()
+    try:
+        attack = attack_cls(*args, **kwargs)
+
+        def on_progress(attempts: int, total: int, elapsed: float) -> None:
+            result.attempts, result.elapsed = attempts, elapsed
+            events.put(ProgressEvent(attempts, total, elapsed))
+
+        def on_found(password: str, attempts: int, elapsed: float) -> None:
+            event = FoundEvent(password, attempts, elapsed)
+            result.found.append(event)
+            events.put(event)
+
+        attack.progress.connect(on_progress)
+        attack.keyspace_progress.connect(lambda position, size: events.put(KeyspaceEvent(position, size)))
+        attack.found.connect(on_found)
+        attack.log.connect(lambda message: events.put(LogEvent(message)))
+
+        done = threading.Event()
+
+        def watch_cancel() -> None:
+            while not done.is_set():
+                if cancel.wait(POLL_INTERVAL):
+                    attack.stop()
+                    return
+
+        watcher = threading.Thread(target=watch_cancel, daemon=True)
+        watcher.start()
+        try:
+            attack.run()
+        finally:
+            done.set()
+            watcher.join()
+        result.cancelled = cancel.is_set() and bool(attack.pending_digests)
+        return result
+    finally:
+        events.put(_END)
+
+
+class _LoopQueue:
+    """Entrega a una ``asyncio.Queue`` elementos puestos desde otro hilo."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, target: "asyncio.Queue[Any]") -> None:
+        self._loop = loop
+        self._target = target
+
+    def put(self, item: Any) -> None:
+        self._loop.call_soon_threadsafe(self._target.put_nowait, item)
+
+
+class AsyncAttack:
+    """Ataque ejecutado en un ejecutor y consumido desde asyncio.
+
+    El ataque empieza la primera vez que se itera, se espera o se llama a
+    `start` (dentro de un bucle en ejecución).  Los eventos se guardan
+    hasta que alguien los consume; solo debe haber un consumidor.
+    """
+
+    def __init__(
+        self,
+        attack_cls: Type[BaseAttack],
+        *args: Any,
+        executor: Optional[Executor] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.attack_cls = attack_cls
+        self.args = args
+        self.kwargs = kwargs
+        self.executor = executor
+        self._events: Optional["asyncio.Queue[Any]"] = None
+        self._future: Optional["asyncio.Future[AttackResult]"] = None
+        self._cancel: Any = None
+        self._cancel_requested = False
+
+    @property
+    def started(self) -> bool:
+        return self._future is not None
+
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def start(self) -> None:
+        """Lanza el ataque en el ejecutor; no hace nada si ya se lanzó."""
+        if self._future is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            # Las colas de multiprocessing no se pueden pasar a las tareas de
+            # un pool; las del Manager sí
+            manager = multiprocessing.get_context("spawn").Manager()
+            remote_events = manager.Queue()
+            self._cancel = manager.Event()
+            remote = self.executor.submit(
+                _execute, self.attack_cls, self.args, self.kwargs, remote_events, self._cancel
+            )
+            threading.Thread(
+                target=self._pump,
+                args=(manager, remote_events, remote, _LoopQueue(loop, self._events)),
+                daemon=True,
+            ).start()
+            work = asyncio.wrap_future(remote)
+        else:
+            self._cancel = threading.Event()
+            work = loop.run_in_executor(
+                self.executor, _execute, self.attack_cls, self.args, self.kwargs,
+                _LoopQueue(loop, self._events), self._cancel,
+            )
+        if self._cancel_requested:
+            self._cancel.set()
+        self._future = asyncio.ensure_future(work)
+
+    @staticmethod
+    def _pump(manager: Any, remote: Any, work: Future, local: _LoopQueue) -> None:
+        """Reenvía los eventos del proceso del ataque al bucle (en su propio hilo)."""
+        try:
+            while True:
+                try:
+                    item = remote.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # Si el proceso murió sin enviar el final, se cierra igualmente
+                    if work.done():
+                        local.put(_END)
+                        return
+                    continue
+                local.put(item)
+                if item is _END:
+                    return
+        finally:
+            manager.shutdown()
+
+    def cancel(self) -> None:
+        """Pide al ataque que se detenga; el resultado indica ``cancelled``."""
+        self._cancel_requested = True
+        if self._cancel is not None and not self.done():
+            self._cancel.set()
+
+    async def events(self) -> AsyncIterator[AttackEvent]:
+        """Eventos del ataque hasta que termina."""
+        self.start()
+        while True:
+            event = await self._events.get()
+            if event is _END:
+                # Para que otra iteración posterior también termine
+                self._events.put_nowait(_END)
+                return
+            yield event
+
+    def __aiter__(self) -> AsyncIterator[AttackEvent]:
+        return self.events()
+
+    async def result(self) -> AttackResult:
+        """Espera a que termine el ataque.
+
+        Si se cancela la tarea que espera, también se detiene el ataque.
+        """
+        self.start()
+        try:
+            return await asyncio.shield(self._future)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def __await__(self) -> Generator[Any, None, AttackResult]:
+        return self.result().__await__()
+
+    async def __aenter__(self) -> "AsyncAttack":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if not self.done():
+            self.cancel()
+            await asyncio.shield(self._future)
+
@@ -1,53 +1,480 @@
 """
 Módulo base para los ataques de contraseñas.
 
-Contiene la clase `AttackThread`, una subclase de QThread que define la
-interfaz común para las diferentes estrategias de ataque implementadas en el
-simulador.  Cada ataque debe heredar de `AttackThread` y sobrescribir el
-método `run` para realizar la búsqueda concreta.  Los ataques emiten
-señales para informar al interfaz gráfico sobre el progreso y el resultado.
+Contiene la clase `BaseAttack`, que define la interfaz común para las
+diferentes estrategias de ataque implementadas en el simulador, y
+`KeyspaceAttack`, la base de los ataques que recorren un `Keyspace`
+(fuerza bruta y máscara).  Cada ataque debe heredar de una de ellas y
+sobrescribir el método `run` para realizar la búsqueda concreta.  Los
+ataques emiten señales (`Signal`) para informar sobre el progreso y el
+resultado.
+
+Este módulo no depende de Qt: los ataques se pueden ejecutar en cualquier
+hilo o proceso (por ejemplo, desde ``bench``).  La interfaz gráfica los
+ejecuta en un QThread mediante ``ui.attack_thread.AttackThread``, que
+reenvía estas señales a señales de Qt.
 """
 
+import hashlib
+import inspect
 import time
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from ..utils.checkpoint import CHECKPOINT_INTERVAL, Checkpoint, discard_checkpoint
+from ..utils.hash_rate import HashRates, estimate_seconds
+from ..utils.hash_utils import DigestSet, decode_digest, digest_set, find_digest_matches
+from ..utils.keyspace import Keyspace
+from ..utils.parallel_search import ParallelKeyspaceSearch
+
+# Máximo de actualizaciones de progreso por segundo hacia la interfaz
+PROGRESS_UPDATES_PER_SECOND = 20
+# Intervalo mínimo (segundos) entre mensajes "Probando: ..." en el log
+CANDIDATE_LOG_INTERVAL = 0.5
+
+
+class ProgressThrottle:
+    """Limita la frecuencia con la que se publica el progreso.
+
+    Evita saturar la cola de eventos de la interfaz con millones de
+    señales entre hilos.  Solo decide *cuándo* emitir; el conteo exacto
+    lo mantiene el ataque.  Una tasa menor o igual que cero desactiva la
+    limitación.
+    """
+
+    def __init__(self, max_rate: float = PROGRESS_UPDATES_PER_SECOND) -> None:
+        self.interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._next_emit = 0.0
+
+    def reset(self) -> None:
+        """Permite que la siguiente consulta emita inmediatamente."""
+        self._next_emit = 0.0
+
+    def ready(self, now: float) -> bool:
+        """Indica si ha pasado el intervalo mínimo desde la última emisión."""
+        if now < self._next_emit:
+            return False
+        self._next_emit = now + self.interval
+        return True
+
+
+class Signal:
+    """Señal mínima sin Qt, con la misma forma de uso que ``pyqtSignal``.
+
+    Los receptores se llaman en el hilo que emite, en el orden en que se
+    conectaron.
+    """
+
+    def __init__(self) -> None:
+        self._slots: List[Callable[..., Any]] = []
+
+    def connect(self, slot: Callable[..., Any]) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Callable[..., Any]) -> None:
+        self._slots.remove(slot)
 
-from PyQt5.QtCore import QThread, pyqtSignal
+    def emit(self, *args: Any) -> None:
+        for slot in list(self._slots):
+            slot(*args)
 
 
-class AttackThread(QThread):
-    """Hilo base para ejecutar un ataque contra un hash.
+class BaseAttack:
+    """Ataque contra uno o varios hashes.
+
+    Cada candidato se hashea una sola vez y se consulta en
+    ``pending_digests``; cada acierto emite `found` y la búsqueda continúa
+    hasta descubrir todos los objetivos o agotar los candidatos.
 
     Atributos:
-        target_hash: El hash SHA‑256 de la contraseña que se intenta descubrir.
-        running: Bandera que indica si el hilo debe seguir ejecutándose.
+        target_hashes: Hashes SHA‑256 (hexadecimales) que se intentan
+            descubrir, sin duplicados y en el orden recibido.
+        target_digests: Los mismos hashes decodificados a 32 bytes.
+        target_hash: El primero de ellos.
+        target_digest: El primero decodificado a 32 bytes.
+        pending_digests: Conjunto de hashes binarios aún sin descubrir; los
+            ataques lo consultan para cada candidato (un `DigestSet` a partir
+            de `DIGEST_SET_THRESHOLD` objetivos).
+        running: Bandera que indica si el ataque debe seguir ejecutándose.
         start_time: Marca de tiempo al inicio del ataque.
+        checkpoint_path: Archivo donde guardar puntos de control (``None``
+            los desactiva).
+        attempts_offset: Intentos de una ejecución anterior que se suman
+            a los de esta al reanudar.
+        scheduler: Planificador que reparte la CPU entre ataques
+            simultáneos (lo asigna ``AttackScheduler.run``; ``None`` sin
+            planificador).
 
     Señales:
         progress(int, int, float): número de intentos realizados, total
             estimado (puede ser 0 si no se conoce) y segundos transcurridos.
-        found(str, int, float): emitida cuando se descubre la contraseña.
+            Se emite como máximo `PROGRESS_UPDATES_PER_SECOND` veces por
+            segundo y siempre una última vez con el conteo exacto.
+        keyspace_progress(int, int): posición exacta dentro del espacio de
+            claves y tamaño de ese espacio; solo la emiten los ataques que
+            recorren un `Keyspace` (fuerza bruta y máscara).
+        found(str, int, float): emitida por cada contraseña descubierta.
         log(str): mensajes de log o depuración.
         finished(): cuando el ataque finaliza (éxito o no).
     """
-    progress = pyqtSignal(int, int, float)
-    found = pyqtSignal(str, int, float)
-    log = pyqtSignal(str)
 
-    def __init__(self, target_hash: str, parent: Optional[object] = None) -> None:
-        super().__init__(parent)
-        self.target_hash = target_hash
+    # Parámetro del constructor que indica dónde continuar; ``None`` si el
+    # ataque no se puede reanudar
+    resume_param: Optional[str] = None
+
+    def __init__(
+        self,
+        target_hash: Union[str, Iterable[str]],
+        progress_rate: float = PROGRESS_UPDATES_PER_SECOND,
+    ) -> None:
+        self.progress = Signal()
+        self.keyspace_progress = Signal()
+        self.found = Signal()
+        self.log = Signal()
+        self.finished = Signal()
+        hashes = [target_hash] if isinstance(target_hash, str) else list(target_hash)
+        self.target_hashes: List[str] = []
+        self.target_digests: List[bytes] = []
+        seen: Set[bytes] = set()
+        for hex_digest in hashes:
+            digest = decode_digest(hex_digest)
+            if digest not in seen:
+                seen.add(digest)
+                self.target_digests.append(digest)
+                self.target_hashes.append(hex_digest.strip())
+        del seen
+        if not self.target_digests:
+            raise ValueError("Se necesita al menos un hash objetivo")
+        self.target_hash = self.target_hashes[0]
+        self.target_digest = self.target_digests[0]
+        # Con muchos objetivos, un `DigestSet` compacto en lugar de un set
+        self.pending_digests: Union[Set[bytes], DigestSet] = digest_set(self.target_digests)
         self.running = True
         self.start_time: float = 0.0
         self.total_candidates: int = 0  # Si se conoce de antemano
+        self.keyspace_size: int = 0  # Tamaño del espacio de claves recorrido
+        self._progress_throttle = ProgressThrottle(progress_rate)
+        self._log_throttle = ProgressThrottle(1.0 / CANDIDATE_LOG_INTERVAL)
+        self.checkpoint_path: Optional[Path] = None
+        self.attempts_offset = 0
+        self.elapsed_offset = 0.0
+        self._checkpoint_throttle = ProgressThrottle(1.0 / CHECKPOINT_INTERVAL)
+        self.scheduler: Optional[Any] = None
 
     def stop(self) -> None:
-        """Solicita la detención del hilo."""
+        """Solicita la detención del ataque."""
         self.running = False
 
     def log_message(self, message: str) -> None:
         """Envía un mensaje de log a través de la señal correspondiente."""
         self.log.emit(message)
 
+    def begin_progress(self) -> None:
+        """Marca el inicio del ataque y reinicia la limitación de progreso."""
+        self.start_time = time.time() - self.elapsed_offset
+        self._progress_throttle.reset()
+        self._log_throttle.reset()
+        # El primer punto de control se escribe tras un intervalo completo
+        self._checkpoint_throttle.ready(time.time())
+
+    def report_progress(
+        self,
+        attempts: int,
+        candidate: Optional[str] = None,
+        position: Optional[int] = None,
+    ) -> None:
+        """Publica el progreso si ha transcurrido el intervalo mínimo.
+
+        Bajo un ``scheduler.AttackScheduler`` es también el punto en el que
+        el ataque espera o cede su turno.
+
+        Args:
+            attempts: Intentos realizados hasta el momento.
+            candidate: Último candidato probado; se muestra en el log con
+                una frecuencia todavía menor que el progreso.
+            position: Índice absoluto dentro del espacio de claves, si el
+                ataque recorre uno.
+        """
+        if self.scheduler is not None:
+            self.scheduler.tick(self, attempts)
+        now = time.time()
+        if not self._progress_throttle.ready(now):
+            return
+        self.progress.emit(self.attempts_offset + attempts, self.total_candidates, now - self.start_time)
+        if position is not None:
+            self.keyspace_progress.emit(position, self.keyspace_size)
+        if candidate is not None and self._log_throttle.ready(now):
+            self.log_message(f"Probando: {candidate}")
+
+    def finish_progress(self, attempts: int, position: Optional[int] = None) -> float:
+        """Emite siempre el conteo final exacto y devuelve el tiempo transcurrido."""
+        elapsed = time.time() - self.start_time
+        self.progress.emit(self.attempts_offset + attempts, self.total_candidates, elapsed)
+        if position is not None:
+            self.keyspace_progress.emit(position, self.keyspace_size)
+        return elapsed
+
+    @property
+    def cracked_count(self) -> int:
+        """Número de objetivos descubiertos hasta el momento."""
+        return len(self.target_hashes) - len(self.pending_digests)
+
+    def match_batch(self, batch: Sequence[bytes]) -> List[int]:
+        """Hashea un lote de candidatos codificados y devuelve las posiciones
+        de los que coinciden con algún objetivo pendiente."""
+        return find_digest_matches(batch, self.pending_digests)
+
+    def report_found(self, password: str, attempts: int, position: Optional[int] = None) -> bool:
+        """Registra una contraseña descubierta y emite `found`.
+
+        Los candidatos repetidos cuyo hash ya se había descubierto se
+        ignoran.
+
+        Returns:
+            ``True`` si ya no quedan objetivos pendientes.
+        """
+        digest = hashlib.sha256(password.encode('utf-8')).digest()
+        if digest in self.pending_digests:
+            self.pending_digests.discard(digest)
+            elapsed = self.finish_progress(attempts, position)
+            self.found.emit(password, self.attempts_offset + attempts, elapsed)
+        return not self.pending_digests
+
+    def log_exhausted(self, message: str) -> None:
+        """Informa del final de una búsqueda que no descubrió todos los objetivos.
+
+        Con un único objetivo se registra ``message`` tal cual; con varios
+        se indica cuántos se descubrieron.
+        """
+        if len(self.target_hashes) > 1 and self.cracked_count:
+            self.log_message(
+                f"Búsqueda agotada: {self.cracked_count} de {len(self.target_hashes)} hashes descubiertos."
+            )
+        else:
+            self.log_message(message)
+
+    def checkpoint_params(self) -> Dict[str, Any]:
+        """Parámetros del constructor (sin ``resume_param``) que identifican el ataque."""
+        return {}
+
+    def resume_from(self, checkpoint: Checkpoint) -> None:
+        """Continúa un punto de control: objetivos pendientes, intentos y tiempo.
+
+        La posición se pasa al constructor mediante ``resume_param``.
+        """
+        pending = {decode_digest(hex_digest) for hex_digest in checkpoint.pending_hashes}
+        self.pending_digests &= pending
+        self.attempts_offset = checkpoint.attempts
+        self.elapsed_offset = checkpoint.elapsed
+
+    def save_checkpoint(self, position: int, attempts: int, force: bool = False) -> None:
+        """Guarda un punto de control si ha pasado `CHECKPOINT_INTERVAL`.
+
+        Args:
+            position: Posición desde la que continuar.
+            attempts: Intentos de esta ejecución hasta ``position``.
+            force: Escribe aunque no haya pasado el intervalo (al cancelar).
+        """
+        if self.checkpoint_path is None or self.resume_param is None:
+            return
+        now = time.time()
+        if not self._checkpoint_throttle.ready(now) and not force:
+            return
+        Checkpoint(
+            attack=type(self).__name__,
+            params=self.checkpoint_params(),
+            target_hashes=self.target_hashes,
+            pending_hashes=[
+                hex_digest
+                for hex_digest, digest in zip(self.target_hashes, self.target_digests)
+                if digest in self.pending_digests
+            ],
+            position=position,
+            attempts=self.attempts_offset + attempts,
+            elapsed=now - self.start_time,
+        ).save(self.checkpoint_path)
+
+    def clear_checkpoint(self) -> None:
+        """Borra el punto de control al terminar el ataque."""
+        if self.checkpoint_path is not None:
+            discard_checkpoint(self.checkpoint_path)
+
+    def candidate_count(self) -> Optional[int]:
+        """Candidatos (o hashes) que costaría agotar el ataque, sin ejecutarlo.
+
+        Por defecto es `total_candidates` si ya se conoce; ``None`` si no
+        se puede saber sin recorrer los candidatos.
+        """
+        return self.total_candidates or None
+
+    @classmethod
+    def count_from_metadata(cls, params: Dict[str, Any]) -> Optional[int]:
+        """Candidatos que costaría agotar el ataque, sin construirlo.
+
+        ``params`` son los argumentos del constructor, con sus valores por
+        defecto.  Solo se leen metadatos (índices y cabeceras), nunca los
+        candidatos; ``None`` si el total no se conoce sin recorrerlos.
+        """
+        return None
+
+    @classmethod
+    def _estimate_rate(cls, rates: HashRates, params: Dict[str, Any]) -> float:
+        """Candidatos/s con los que se recorrería el ataque (ruta por lotes)."""
+        return rates.rate()
+
+    @classmethod
+    def estimate(cls, rates: HashRates, *args: Any, **kwargs: Any) -> Tuple[Optional[int], Optional[float]]:
+        """Candidatos y segundos para agotar el ataque, sin construirlo.
+
+        Recibe los mismos argumentos que el constructor (ver
+        `count_from_metadata`); ambos valores son ``None`` si el total no
+        se conoce.  Solo consulta metadatos (índices, cabeceras de los
+        binarios, el `Keyspace`), así que la interfaz puede llamarlo desde
+        su hilo.
+        """
+        bound = inspect.signature(cls).bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        count = cls.count_from_metadata(params)
+        if count is None:
+            return None, None
+        return count, estimate_seconds(count, cls._estimate_rate(rates, params))
+
+    def iter_candidates(self) -> Iterator[str]:
+        """Candidatos que probaría `run`, en el mismo orden y sin hashearlos.
+
+        Permite medir la generación por separado del hashing.  Los ataques
+        que no enumeran candidatos (la tabla arcoíris) no generan ninguno.
+        """
+        return iter(())
+
     # Método run a implementar por cada subclase
     def run(self) -> None:  # pragma: no cover
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+class KeyspaceAttack(BaseAttack):
+    """Ataque que recorre los candidatos válidos de un `Keyspace`.
+
+    Las subclases construyen el espacio y lo asignan con `set_keyspace`;
+    `run` lo recorre en el hilo actual o, con ``workers > 1``, repartido
+    entre procesos (``utils.parallel_search``).  ``start_index`` es la
+    posición del espacio desde la que continuar.
+
+    Atributos de clase:
+        attack_label: Nombre del ataque en los mensajes del log.
+        exhausted_message: Mensaje al agotar el espacio sin éxito.
+    """
+
+    resume_param = 'start_index'
+    attack_label = "Ataque"
+    exhausted_message = "Ataque finalizado sin éxito."
+
+    def __init__(
+        self,
+        target_hash: Union[str, Iterable[str]],
+        workers: int = 1,
+        start_index: int = 0,
+    ) -> None:
+        super().__init__(target_hash)
+        self.workers = max(1, workers)
+        self.start_index = max(0, start_index)
+        self.keyspace: Optional[Keyspace] = None
+
+    @classmethod
+    def build_keyspace(cls, params: Dict[str, Any]) -> Keyspace:
+        """Espacio de claves que recorrería el ataque con los argumentos
+        ``params`` del constructor."""
+        raise NotImplementedError
+
+    @classmethod
+    def count_from_metadata(cls, params: Dict[str, Any]) -> Optional[int]:
+        keyspace = cls.build_keyspace(params)
+        return keyspace.valid_count() - keyspace.count_valid_below(max(0, params['start_index']))
+
+    @classmethod
+    def _estimate_rate(cls, rates: HashRates, params: Dict[str, Any]) -> float:
+        # Prefijos reutilizados, repartidos entre los procesos del ataque
+        return rates.rate(keyspace=True, workers=params['workers'])
+
+    def set_keyspace(self, keyspace: Keyspace) -> None:
+        """Asigna el espacio de claves y su total de candidatos válidos."""
+        self.keyspace = keyspace
+        self.keyspace_size = keyspace.size
+        # Solo se cuentan (y se prueban) los candidatos que cumplen la política
+        self.total_candidates = keyspace.valid_count()
+
+    def _attempts_below(self, position: int) -> int:
+        """Candidatos válidos entre ``start_index`` y ``position``."""
+        keyspace = self.keyspace
+        return keyspace.count_valid_below(position) - keyspace.count_valid_below(self.start_index)
+
+    def _log_cancelled(self) -> None:
+        self.log_message(f"{self.attack_label} cancelado por el usuario.")
+
+    def candidate_count(self) -> Optional[int]:
+        # Exacto, aunque sea 0 (ningún candidato cumple la política)
+        return self.total_candidates
+
+    def iter_candidates(self) -> Iterator[str]:
+        for _, candidate in self.keyspace.iter_valid(self.start_index):
+            yield candidate
+
+    def run(self) -> None:
+        if self.workers > 1:
+            self._run_parallel()
+            return
+        self.begin_progress()
+        attempts = 0
+        # Los candidatos que comparten prefijo reutilizan su estado SHA‑256
+        search = self.keyspace.search_valid(self.pending_digests, self.start_index)
+        for checked, position, candidate, found in search:
+            attempts += checked
+            if found:
+                if self.report_found(candidate, attempts, position):
+                    self.clear_checkpoint()
+                    self.running = False
+                    self.finished.emit()
+                    return
+                continue
+            self.report_progress(attempts, candidate, position)
+            self.save_checkpoint(position + 1, attempts)
+            if not self.running:
+                self.finish_progress(attempts, position + 1)
+                self.save_checkpoint(position + 1, attempts, force=True)
+                self._log_cancelled()
+                self.finished.emit()
+                return
+        # Si se alcanza aquí, no se descubrieron todos los objetivos
+        self.finish_progress(attempts, self.keyspace.indices.stop)
+        self.clear_checkpoint()
+        self.log_exhausted(self.exhausted_message)
+        self.finished.emit()
+
+    def _run_parallel(self) -> None:
+        """Reparte el espacio de claves entre varios procesos."""
+        self.begin_progress()
+        self.log_message(f"{self.attack_label} en paralelo con {self.workers} procesos.")
+        # Con planificador, cada porción espera a que le conceda un trabajador
+        lane = self.scheduler.lane(self) if self.scheduler is not None else None
+        search = ParallelKeyspaceSearch(
+            self.keyspace[self.start_index:], self.pending_digests.copy(), self.workers, lane=lane
+        )
+
+        def on_progress(attempts: int, position: int) -> None:
+            self.report_progress(attempts, position=position)
+            self.save_checkpoint(position, self._attempts_below(position))
+
+        search.run(lambda: not self.running, on_progress, self.report_found)
+        self.finish_progress(search.attempts, search.position)
+        if not self.pending_digests:
+            self.clear_checkpoint()
+            self.running = False
+        elif not self.running:
+            # Se reanuda desde la posición por debajo de la cual todo está probado
+            self.save_checkpoint(search.position, self._attempts_below(search.position), force=True)
+            self._log_cancelled()
+        else:
+            self.clear_checkpoint()
+            self.log_exhausted(self.exhausted_message)
+        self.finished.emit()
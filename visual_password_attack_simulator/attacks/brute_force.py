@@ -2,71 +2,68 @@
 Implementación de un ataque de fuerza bruta.
 
 Este módulo proporciona la clase `BruteForceAttack` que hereda de
-``AttackThread``.  Genera sistemáticamente todas las combinaciones de un
+``BaseAttack``.  Genera sistemáticamente todas las combinaciones de un
 alfabeto limitado hasta una longitud máxima especificada.  A cada
 combinación se le aplica la función de hash SHA‑256 y se compara con el
 hash objetivo.  Para mantener la demo receptiva, el tamaño del alfabeto y
 la longitud máxima se establecen de forma conservadora.  Cada pocas
 iteraciones se emiten señales de progreso y log.
+
+La enumeración solo produce candidatos que cumplen la política (ver
+``Keyspace.iter_valid``), de modo que no se pierde tiempo generando y
+descartando combinaciones, y los candidatos que comparten prefijo
+reutilizan su estado SHA‑256 (ver ``Keyspace.search_valid``).  Con
+``workers > 1`` el espacio de claves se reparte en rangos de índices
+entre varios procesos (ver ``utils.parallel_search``).
 """
 
-import itertools
-import time
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from .base_attack import AttackThread
-from ..utils.hash_utils import sha256_hash
-from ..utils.password_requirements import (
-    ALLOWED_CHARACTERS,
-    PASSWORD_LENGTH,
-    meets_password_requirements,
-)
+from .base_attack import KeyspaceAttack
+from ..utils.keyspace import Keyspace
+from ..utils.password_requirements import ALLOWED_CHARACTERS, PASSWORD_LENGTH
 
 
-class BruteForceAttack(AttackThread):
+class BruteForceAttack(KeyspaceAttack):
     """Ataque de fuerza bruta limitado por la política vigente."""
 
+    attack_label = "Ataque de fuerza bruta"
+    exhausted_message = "Fuerza bruta finalizada sin éxito."
+
     def __init__(
         self,
         target_hash: str,
         alphabet: Optional[str] = None,
         max_length: Optional[int] = None,
         password_length: int = PASSWORD_LENGTH,
+        workers: int = 1,
+        start_index: int = 0,
     ) -> None:
-        """Inicializa el ataque de fuerza bruta adaptado a la política."""
-        super().__init__(target_hash)
+        """Inicializa el ataque de fuerza bruta adaptado a la política.
+
+        ``workers`` indica cuántos procesos usar; 1 mantiene la búsqueda
+        secuencial dentro del hilo.  ``start_index`` permite reanudar desde
+        una posición concreta del espacio de claves.
+        """
+        super().__init__(target_hash, workers, start_index)
+        self.alphabet, self.length = self._resolve(alphabet, max_length, password_length)
+        self.set_keyspace(Keyspace.brute_force(self.alphabet, self.length))
+
+    @staticmethod
+    def _resolve(
+        alphabet: Optional[str],
+        max_length: Optional[int],
+        password_length: int,
+    ) -> Tuple[str, int]:
+        """Alfabeto (restringido a los caracteres permitidos) y longitud."""
         raw_alphabet = alphabet or ALLOWED_CHARACTERS
         filtered = ''.join(ch for ch in raw_alphabet if ch in ALLOWED_CHARACTERS)
-        self.alphabet = filtered or ALLOWED_CHARACTERS
-        resolved_length = password_length or max_length or PASSWORD_LENGTH
-        self.length = resolved_length
-        self.total_candidates = len(self.alphabet) ** self.length
+        return filtered or ALLOWED_CHARACTERS, password_length or max_length or PASSWORD_LENGTH
+
+    @classmethod
+    def build_keyspace(cls, params: Dict[str, Any]) -> Keyspace:
+        alphabet, length = cls._resolve(params['alphabet'], params['max_length'], params['password_length'])
+        return Keyspace.brute_force(alphabet, length)
 
-    def run(self) -> None:
-        self.start_time = time.time()
-        attempts = 0
-        for combo in itertools.product(self.alphabet, repeat=self.length):
-            if not self.running:
-                self.log_message("Ataque de fuerza bruta cancelado por el usuario.")
-                self.finished.emit()
-                return
-            candidate = ''.join(combo)
-            if not meets_password_requirements(candidate):
-                continue
-            attempts += 1
-            h = sha256_hash(candidate)
-            if h == self.target_hash:
-                elapsed = time.time() - self.start_time
-                self.found.emit(candidate, attempts, elapsed)
-                self.running = False
-                self.finished.emit()
-                return
-            elapsed = time.time() - self.start_time
-            self.progress.emit(attempts, self.total_candidates, elapsed)
-            if attempts % 500 == 0:
-                self.log_message(f"Probando: {candidate}")
-        # Si se alcanza aquí, no se encontró la contraseña
-        elapsed = time.time() - self.start_time
-        self.progress.emit(attempts, self.total_candidates, elapsed)
-        self.log_message("Fuerza bruta finalizada sin éxito.")
-        self.finished.emit()
+    def checkpoint_params(self) -> Dict[str, Any]:
+        return {'alphabet': self.alphabet, 'password_length': self.length}
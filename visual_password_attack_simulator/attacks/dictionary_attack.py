@@ -8,74 +8,217 @@ contraseñas que se encuentran en listas de contraseñas filtradas o
 palabras del diccionario.  Para mantener la demo ágil, se emite
 progreso después de cada entrada procesada y se permite cancelar la
 ejecución en cualquier momento.
+
+El diccionario se lee una sola vez: el total de entradas válidas sale del
+índice persistente (``utils.dictionary_index``) y, si aún no existe, el
+propio ataque lo construye mientras recorre el archivo.  El índice
+también permite empezar en una entrada concreta sin leer las anteriores.
+Las entradas válidas, ya codificadas, se guardan en la caché compartida
+(``utils.candidate_cache``), así que las ejecuciones siguientes empiezan a
+hashear de inmediato.
+
+Si el diccionario tiene su binario de ancho fijo al día
+(``utils.dictionary_format``), el ataque lo abre con ``mmap`` y hashea
+sus registros por lotes, sin leer ni convertir el texto.
+También se puede pasar un ``.bin`` como ``dictionary_path``.
 """
 
-import time
+import itertools
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional, Sequence
 
-from .base_attack import AttackThread
-from ..utils.hash_utils import sha256_hash
-from ..utils.password_requirements import meets_password_requirements
+from .base_attack import BaseAttack
+from ..utils.candidate_cache import CANDIDATE_CACHE
+from ..utils.dictionary_format import open_binary_dictionary
+from ..utils.dictionary_index import DictionaryIndex, IndexBuilder, parse_entry
+from ..utils.hash_utils import HASH_BATCH_SIZE
 
 BATCH_SIZE = 1000
+DEFAULT_DICTIONARY_PATH = Path(__file__).resolve().parent.parent / "dictionary.txt"
+
+
+def _stored_count(dictionary_path: Path, index: Optional[DictionaryIndex]) -> Optional[int]:
+    """Entradas válidas según el índice o, sin él, la cabecera del binario."""
+    if index is not None:
+        return index.count
+    binary = open_binary_dictionary(dictionary_path)
+    if binary is None:
+        return None
+    with binary:
+        return len(binary)
 
 
-class DictionaryAttack(AttackThread):
+class DictionaryAttack(BaseAttack):
     """Ataque basado en un diccionario de palabras."""
 
-    def __init__(self, target_hash: str, dictionary_path: Optional[str] = None) -> None:
+    resume_param = 'start_entry'
+
+    def __init__(
+        self,
+        target_hash: str,
+        dictionary_path: Optional[str] = None,
+        start_entry: int = 0,
+    ) -> None:
+        """Prepara el ataque sin recorrer el diccionario.
+
+        ``start_entry`` indica la primera entrada válida a probar, para
+        reanudar un ataque anterior.
+        """
         super().__init__(target_hash)
         # Establecer ruta del diccionario; si no se proporciona se usa el
         # diccionario incluido en el paquete
-        if dictionary_path is None:
-            dictionary_path = Path(__file__).resolve().parent.parent / "dictionary.txt"
-        self.dictionary_path = Path(dictionary_path)
-        # Calcular total de entradas para progreso
+        self.dictionary_path = Path(dictionary_path or DEFAULT_DICTIONARY_PATH)
+        self.start_entry = max(0, start_entry)
+        # El índice persistente (o la cabecera del binario) da el total sin
+        # leer el diccionario; si no existe, se construye durante la primera
+        # ejecución
+        self.index = DictionaryIndex.load(self.dictionary_path)
+        count = _stored_count(self.dictionary_path, self.index)
+        self.total_candidates = max(0, count - self.start_entry) if count is not None else 0
+
+    @classmethod
+    def count_from_metadata(cls, params: Dict[str, Any]) -> Optional[int]:
+        dictionary_path = Path(params['dictionary_path'] or DEFAULT_DICTIONARY_PATH)
+        count = _stored_count(dictionary_path, DictionaryIndex.load(dictionary_path))
+        return max(0, count - max(0, params['start_entry'])) if count is not None else None
+
+    def checkpoint_params(self) -> Dict[str, Any]:
+        return {'dictionary_path': str(self.dictionary_path.resolve())}
+
+    def _total_from(self, count: int) -> int:
+        """Total de intentos, incluidos los de la ejecución reanudada."""
+        return max(0, count - self.start_entry) + self.attempts_offset
+
+    def _cancel(self, attempts: int, entry: int) -> None:
+        self.finish_progress(attempts)
+        self.save_checkpoint(entry, attempts, force=True)
+        self.log_message("Ataque de diccionario cancelado por el usuario.")
+        self.finished.emit()
+
+    def candidate_count(self) -> Optional[int]:
+        if self.total_candidates:
+            return self.total_candidates
+        # Sin índice se cuentan las entradas de la caché, que `run` reutiliza
         try:
-            total = 0
-            with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
-                while True:
-                    batch = [line.strip() for _, line in zip(range(BATCH_SIZE), f)]
-                    if not batch:
-                        break
-                    total += sum(1 for word in batch if meets_password_requirements(word))
-            self.total_candidates = total
-        except Exception:
-            self.total_candidates = 0
+            candidates = CANDIDATE_CACHE.valid_candidates(self.dictionary_path)
+        except FileNotFoundError:
+            return None
+        return max(0, len(candidates) - self.start_entry) if candidates is not None else None
+
+    def iter_candidates(self) -> Iterator[str]:
+        binary = open_binary_dictionary(self.dictionary_path)
+        if binary is not None:
+            with binary:
+                yield from binary.words(self.start_entry)
+            return
+        candidates = CANDIDATE_CACHE.valid_candidates(self.dictionary_path)
+        if candidates is not None:
+            for candidate in itertools.islice(candidates, self.start_entry, None):
+                yield candidate.decode('utf-8')
+            return
+        offset, entry = self.index.locate(self.start_entry) if self.index is not None else (0, 0)
+        with self.dictionary_path.open('rb') as f:
+            f.seek(offset)
+            for raw in f:
+                word = parse_entry(raw)
+                if word is None:
+                    continue
+                if entry >= self.start_entry:
+                    yield word
+                entry += 1
 
     def run(self) -> None:
-        self.start_time = time.time()
+        self.begin_progress()
+        binary = open_binary_dictionary(self.dictionary_path)
+        if binary is not None:
+            with binary:
+                self._run_records(binary)
+            return
+        try:
+            candidates = CANDIDATE_CACHE.valid_candidates(self.dictionary_path)
+        except FileNotFoundError:
+            candidates = None  # La ruta en streaming informa del error
+        if candidates is None:
+            self._run_streaming()
+        else:
+            self._run_records(candidates)
+
+    def _run_records(self, candidates: Sequence[bytes]) -> None:
+        """Recorre entradas ya validadas y codificadas.
+
+        ``candidates`` es la lista de la caché o el binario proyectado en
+        memoria (`BinaryDictionary`), que se lee lote a lote.
+        """
+        self.total_candidates = self._total_from(len(candidates))
+        attempts = 0
+        for start in range(self.start_entry, len(candidates), HASH_BATCH_SIZE):
+            if not self.running:
+                self._cancel(attempts, start)
+                return
+            batch = candidates[start:start + HASH_BATCH_SIZE]
+            for match in self.match_batch(batch):
+                if self.report_found(batch[match].decode('utf-8'), attempts + match + 1):
+                    self.clear_checkpoint()
+                    self.running = False
+                    self.finished.emit()
+                    return
+            attempts += len(batch)
+            self.report_progress(attempts, batch[-1].decode('utf-8'))
+            self.save_checkpoint(start + len(batch), attempts)
+        self.finish_progress(attempts)
+        self.clear_checkpoint()
+        self.log_exhausted("Ataque de diccionario finalizado sin éxito.")
+        self.finished.emit()
+
+    def _run_streaming(self) -> None:
+        """Lee el diccionario por bloques; se usa si no cabe en la caché."""
         attempts = 0
         try:
-            with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
+            stat = self.dictionary_path.stat()
+            index = self.index or DictionaryIndex.load(self.dictionary_path, verify=True)
+            if index is not None:
+                self.total_candidates = self._total_from(index.count)
+            # Sin índice, esta misma pasada lo construye
+            builder = IndexBuilder() if index is None else None
+            offset, entry = index.locate(self.start_entry) if index is not None else (0, 0)
+            with self.dictionary_path.open('rb') as f:
+                f.seek(offset)
                 while True:
-                    batch = [line.strip() for _, line in zip(range(BATCH_SIZE), f)]
+                    batch = list(itertools.islice(f, BATCH_SIZE))
                     if not batch:
                         break
-                    for word in batch:
-                        if not self.running:
-                            self.log_message("Ataque de diccionario cancelado por el usuario.")
-                            self.finished.emit()
-                            return
-                        if not word or not meets_password_requirements(word):
+                    if not self.running:
+                        self._cancel(attempts, max(entry, self.start_entry))
+                        return
+                    words = []
+                    for raw in batch:
+                        word = parse_entry(raw)
+                        if builder is not None:
+                            builder.add(raw, word is not None)
+                        if word is None:
                             continue
-                        attempts += 1
-                        h = sha256_hash(word)
-                        if h == self.target_hash:
-                            elapsed = time.time() - self.start_time
-                            self.found.emit(word, attempts, elapsed)
+                        if entry >= self.start_entry:
+                            words.append(word)
+                        entry += 1
+                    if not words:
+                        continue
+                    for match in self.match_batch([word.encode('utf-8') for word in words]):
+                        if self.report_found(words[match], attempts + match + 1):
+                            self.clear_checkpoint()
                             self.running = False
                             self.finished.emit()
                             return
-                        elapsed = time.time() - self.start_time
-                        self.progress.emit(attempts, self.total_candidates, elapsed)
-                        if attempts % 500 == 0:
-                            self.log_message(f"Probando: {word}")
+                    attempts += len(words)
+                    self.report_progress(attempts, words[-1])
+                    self.save_checkpoint(entry, attempts)
+            if builder is not None:
+                self.index = builder.finish(self.dictionary_path, stat)
+                if self.index is not None:
+                    self.total_candidates = self._total_from(self.index.count)
         except FileNotFoundError:
             self.log_message(f"No se encontró el diccionario: {self.dictionary_path}")
         # Finalizar
-        elapsed = time.time() - self.start_time
-        self.progress.emit(attempts, self.total_candidates, elapsed)
-        self.log_message("Ataque de diccionario finalizado sin éxito.")
+        self.finish_progress(attempts)
+        self.clear_checkpoint()
+        self.log_exhausted("Ataque de diccionario finalizado sin éxito.")
         self.finished.emit()
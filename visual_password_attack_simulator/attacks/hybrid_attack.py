@@ -6,41 +6,69 @@ aproximarse a contraseñas compuestas por palabras comunes seguidas de
 números (por ejemplo, "contraseña123").  Se usa una lista de palabras
 base y para cada una se generan sufijos desde 0 hasta un máximo
 configurable.  Cada combinación se compara con el hash objetivo.
+
+Por defecto los candidatos de cada palabra se recorren sin repeticiones
+sobre el espacio enumerable de ``utils.hybrid_space`` (patrón × variante
+leet × año × dígito × símbolo), lo que da un total conocido y
+ejecuciones reproducibles; el muestreo aleatorio original sigue
+disponible con ``deterministic=False``.
 """
 
+import contextlib
 import random
-import re
-import time
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
+from typing import Iterable, Iterator, Optional
 
-from .base_attack import AttackThread
-from ..utils.hash_utils import sha256_hash
+from .base_attack import BaseAttack
+from ..utils.candidate_cache import CANDIDATE_CACHE
+from ..utils.hash_utils import iter_batches
+from ..utils.hybrid_space import (
+    DIGITS,
+    LEET_MAP,
+    MAX_BASE_LENGTH,
+    NON_ALNUM_RE,
+    SPECIALS_PRIORITY,
+    YEARS,
+    HybridSpace,
+    selected_count,
+)
 from ..utils.password_requirements import (
     ALLOWED_SPECIAL_CHARACTERS,
     PASSWORD_LENGTH,
     meets_password_requirements,
 )
 
-MAX_BASE_LENGTH = PASSWORD_LENGTH
-NON_ALNUM_RE = re.compile(r'[^A-Za-z0-9]')
-YEARS = [str(y) for y in range(2000, 2027)]
-LEET_MAP = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "$"}
-DIGITS = "0123456789"
-SPECIALS_PRIORITY: Sequence[str] = tuple(ch for ch in "*.-_@=+#$%&." if ch in ALLOWED_SPECIAL_CHARACTERS)
 
-
-class HybridAttack(AttackThread):
+class HybridAttack(BaseAttack):
     """Ataque híbrido: palabra de diccionario + sufijo numérico."""
 
-    def __init__(self, target_hash: str, dictionary_path: Optional[str] = None, max_suffix: int = 999) -> None:
+    def __init__(
+        self,
+        target_hash: str,
+        dictionary_path: Optional[str] = None,
+        max_suffix: int = 999,
+        deterministic: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            max_suffix: Candidatos por palabra base (0 recorre todos en el
+                modo determinista).
+            deterministic: Recorre el espacio de `HybridSpace` sin
+                repeticiones; con ``False`` se sortean combinaciones como
+                antes.
+            seed: En el modo determinista, toma una muestra aleatoria
+                reproducible en lugar de una equiespaciada.
+        """
         super().__init__(target_hash)
         if dictionary_path is None:
             dictionary_path = Path(__file__).resolve().parent.parent / "hybrid_bases.txt"
         self.dictionary_path = Path(dictionary_path)
         self.max_suffix = max_suffix
-        # El número total de candidatos depende de la combinación de variaciones,
-        # números y símbolos; lo dejamos como desconocido (0) para el panel.
+        self.deterministic = deterministic
+        self.seed = seed
+        # El total se calcula mientras se recorren las bases (modo
+        # determinista); en el modo aleatorio queda como desconocido (0).
         self.total_candidates = 0
 
     def _sanitize_word(self, word: str) -> str:
@@ -127,6 +155,12 @@ class HybridAttack(AttackThread):
 
     def _generate_candidates(self, base_word: str) -> Iterable[str]:
         """Produce candidatos combinando la palabra base con patrones human-like."""
+        if self.deterministic:
+            return HybridSpace(base_word).select(self.max_suffix, self.seed)
+        return self._sample_candidates(base_word)
+
+    def _sample_candidates(self, base_word: str) -> Iterator[str]:
+        """Sortea ``max_suffix`` combinaciones de variante y patrón (modo aleatorio)."""
         cleaned = self._sanitize_word(base_word)
         variants = [variant for variant in self._base_variants(cleaned) if variant]
         if not variants:
@@ -152,39 +186,86 @@ class HybridAttack(AttackThread):
             seen.add(candidate)
             yield candidate
 
+    def _iter_candidates(self, lines: Iterable[str], bases: Optional[int] = None) -> Iterator[str]:
+        """Encadena los candidatos de todas las palabras base.
+
+        Con ``bases`` (número de palabras; 0 si no se conoce) el modo
+        determinista va actualizando `total_candidates` sin contar antes
+        todas las bases: mientras las recorre lo extrapola con la media de
+        las ya vistas y al agotarlas es exacto.
+        """
+        counting = bases is not None and self.deterministic
+        counted = 0
+        for seen, base_word in enumerate(lines, 1):
+            base_word = base_word.strip()
+            if not base_word:
+                continue
+            if not counting:
+                yield from self._generate_candidates(base_word)
+                continue
+            space = HybridSpace(base_word)
+            counted += min(space.count, self.max_suffix) if self.max_suffix else space.count
+            self.total_candidates = counted * bases // seen
+            yield from space.select(self.max_suffix, self.seed)
+        if counting:
+            self.total_candidates = counted
+
+    def _count_candidates(self, words: Iterable[str]) -> int:
+        """Total exacto de candidatos del modo determinista."""
+        total = 0
+        for base_word in words:
+            if not self.running:
+                break
+            total += selected_count(base_word, self.max_suffix)
+        return total
+
+    def candidate_count(self) -> Optional[int]:
+        # Solo el modo determinista tiene un total conocido
+        if not self.deterministic:
+            return None
+        try:
+            words = CANDIDATE_CACHE.base_words(self.dictionary_path)
+        except FileNotFoundError:
+            return None
+        return self._count_candidates(words) if words is not None else None
+
+    def iter_candidates(self) -> Iterator[str]:
+        words = CANDIDATE_CACHE.base_words(self.dictionary_path)
+        if words is not None:
+            yield from self._iter_candidates(words)
+            return
+        with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
+            yield from self._iter_candidates(f)
+
     def run(self) -> None:
-        self.start_time = time.time()
+        self.begin_progress()
         attempts = 0
         try:
-            with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
-                for base_word in f:
+            words = CANDIDATE_CACHE.base_words(self.dictionary_path)
+            with contextlib.ExitStack() as stack:
+                if words is None:
+                    # El archivo no cabe en la caché: se lee en streaming
+                    words = stack.enter_context(
+                        self.dictionary_path.open('r', encoding='utf-8', errors='ignore')
+                    )
+                    bases = 0
+                else:
+                    bases = len(words)
+                for batch in iter_batches(self._iter_candidates(words, bases)):
                     if not self.running:
+                        self.finish_progress(attempts)
                         self.log_message("Ataque h?brido cancelado por el usuario.")
                         self.finished.emit()
                         return
-                    base_word = base_word.strip()
-                    if not base_word:
-                        continue
-                    for candidate in self._generate_candidates(base_word):
-                        if not self.running:
-                            self.log_message("Ataque h?brido cancelado por el usuario.")
-                            self.finished.emit()
-                            return
-                        attempts += 1
-                        h = sha256_hash(candidate)
-                        if h == self.target_hash:
-                            elapsed = time.time() - self.start_time
-                            self.found.emit(candidate, attempts, elapsed)
+                    for match in self.match_batch([candidate.encode('utf-8') for candidate in batch]):
+                        if self.report_found(batch[match], attempts + match + 1):
                             self.running = False
                             self.finished.emit()
                             return
-                        elapsed = time.time() - self.start_time
-                        self.progress.emit(attempts, self.total_candidates, elapsed)
-                        if attempts % 500 == 0:
-                            self.log_message(f"Probando: {candidate}")
+                    attempts += len(batch)
+                    self.report_progress(attempts, batch[-1])
         except FileNotFoundError:
             self.log_message(f"No se encontr? el diccionario: {self.dictionary_path}")
-        elapsed = time.time() - self.start_time
-        self.progress.emit(attempts, self.total_candidates, elapsed)
-        self.log_message("Ataque h?brido finalizado sin ?xito.")
+        self.finish_progress(attempts)
+        self.log_exhausted("Ataque h?brido finalizado sin ?xito.")
         self.finished.emit()
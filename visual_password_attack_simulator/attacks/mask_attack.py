@@ -8,68 +8,85 @@ dos dígitos.  Este módulo interpreta la máscara, genera todas las
 combinaciones posibles dentro de ese patrón y compara sus hashes con el
 objetivo.  Se trata de un ataque más eficiente que la fuerza bruta cuando
 se conoce la estructura aproximada de la contraseña.
+
+La enumeración solo produce candidatos que cumplen la política (ver
+``Keyspace.search_valid``, que además reutiliza el estado SHA‑256 de los
+prefijos compartidos).  Con ``workers > 1`` el espacio de claves se
+reparte en rangos de índices entre varios procesos (ver
+``utils.parallel_search``).
 """
 
-import itertools
-import time
 from pathlib import Path
-from typing import List, Optional
-
-from .base_attack import AttackThread
-from ..utils.hash_utils import sha256_hash
-from ..utils.password_requirements import (
-    ALLOWED_CHARACTERS,
-    ALLOWED_SPECIAL_CHARACTERS,
-    meets_password_requirements,
-)
+from typing import Any, Callable, Dict, List, Optional
 
+from .base_attack import KeyspaceAttack
+from ..utils.keyspace import Keyspace, parse_mask
+# Los conjuntos de la máscara se definían aquí; se reexportan para que
+# ``from ..attacks.mask_attack import MASK_SETS`` siga funcionando
+from ..utils.keyspace import MASK_SETS  # noqa: F401
+from ..utils.password_requirements import ALLOWED_CHARACTERS
 
-MASK_SETS = {
-    'u': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
-    'l': 'abcdefghijklmnopqrstuvwxyz',
-    'd': '0123456789',
-    's': ALLOWED_SPECIAL_CHARACTERS,
-    'a': ALLOWED_CHARACTERS,
-}
+DEFAULT_MASK = '?u?l?l?l?d?d'
 
 
-class MaskAttack(AttackThread):
+class MaskAttack(KeyspaceAttack):
     """Ataque de máscara de patrón."""
 
+    attack_label = "Ataque de máscara"
+    exhausted_message = "Ataque de máscara finalizado sin éxito."
+
     def __init__(
         self,
         target_hash: str,
         mask: Optional[str] = None,
         mask_source: Optional[str] = None,
         use_custom: bool = False,
+        workers: int = 1,
+        start_index: int = 0,
     ) -> None:
-        super().__init__(target_hash)
+        super().__init__(target_hash, workers, start_index)
         self.mask = mask
         self.mask_source = Path(mask_source) if mask_source else None
         self.use_custom = use_custom
         self.alphabets: List[str] = []
         self.total_candidates = 1
         self._load_mask()
+        self.set_keyspace(Keyspace(self.alphabets))
 
     def _load_mask(self) -> None:
-        mask_pattern = self.mask
-        if self.mask_source and self.mask_source.exists():
+        self._parse_mask(self._mask_pattern(self.mask, self.mask_source, self.log_message))
+
+    @classmethod
+    def _mask_pattern(
+        cls,
+        mask: Optional[str],
+        mask_source: Optional[Path],
+        log: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Máscara derivada de la primera línea de ``mask_source`` o, si no
+        hay, ``mask`` o la predeterminada."""
+        if mask_source and mask_source.exists():
             try:
-                with self.mask_source.open('r', encoding='utf-8', errors='ignore') as f:
+                with mask_source.open('r', encoding='utf-8', errors='ignore') as f:
                     base = f.readline().strip()
                     if base:
-                        mask_pattern = self._mask_from_base(base)
+                        return cls._mask_from_base(base)
             except FileNotFoundError:
-                self.log_message(f"No se encontró la máscara personalizada: {self.mask_source}")
-        if not mask_pattern:
-            mask_pattern = '?u?l?l?l?d?d'
-        self._parse_mask(mask_pattern)
+                if log is not None:
+                    log(f"No se encontró la máscara personalizada: {mask_source}")
+        return mask or DEFAULT_MASK
+
+    @classmethod
+    def build_keyspace(cls, params: Dict[str, Any]) -> Keyspace:
+        mask_source = Path(params['mask_source']) if params['mask_source'] else None
+        return Keyspace(parse_mask(cls._mask_pattern(params['mask'], mask_source)))
 
-    def _mask_from_base(self, base: str) -> str:
+    @staticmethod
+    def _mask_from_base(base: str) -> str:
         """Crea una máscara aproximada a partir de una base."""
         filtered = ''.join(ch for ch in base if ch in ALLOWED_CHARACTERS)
         if not filtered:
-            return '?u?l?l?l?d?d'
+            return DEFAULT_MASK
         mask_parts: List[str] = []
         for ch in filtered[:10]:
             if ch.isupper():
@@ -88,50 +105,10 @@ class MaskAttack(AttackThread):
         return mask_str
 
     def _parse_mask(self, mask: str) -> None:
-        self.alphabets.clear()
+        self.alphabets = parse_mask(mask)
         self.total_candidates = 1
-        i = 0
-        while i < len(mask):
-            if mask[i] == '?':
-                i += 1
-                if i < len(mask):
-                    code = mask[i]
-                    chars = MASK_SETS.get(code, '')
-                    self.alphabets.append(chars)
-                    self.total_candidates *= max(1, len(chars))
-                else:
-                    break
-            else:
-                self.alphabets.append(mask[i])
-                self.total_candidates *= 1
-            i += 1
+        for chars in self.alphabets:
+            self.total_candidates *= max(1, len(chars))
 
-    def run(self) -> None:
-        self.start_time = time.time()
-        attempts = 0
-        # Generar combinaciones de acuerdo con la máscara
-        for combo in itertools.product(*self.alphabets):
-            if not self.running:
-                self.log_message("Ataque de máscara cancelado por el usuario.")
-                self.finished.emit()
-                return
-            candidate = ''.join(combo)
-            if not meets_password_requirements(candidate):
-                continue
-            attempts += 1
-            h = sha256_hash(candidate)
-            if h == self.target_hash:
-                elapsed = time.time() - self.start_time
-                self.found.emit(candidate, attempts, elapsed)
-                self.running = False
-                self.finished.emit()
-                return
-            elapsed = time.time() - self.start_time
-            self.progress.emit(attempts, self.total_candidates, elapsed)
-            if attempts % 500 == 0:
-                self.log_message(f"Probando: {candidate}")
-        # Finalizar sin éxito
-        elapsed = time.time() - self.start_time
-        self.progress.emit(attempts, self.total_candidates, elapsed)
-        self.log_message("Ataque de máscara finalizado sin éxito.")
-        self.finished.emit()
+    def checkpoint_params(self) -> Dict[str, Any]:
+        return {'alphabets': self.alphabets}
@@ -7,30 +7,131 @@ recuperación rápida de contraseñas conocidas.  En esta simulación se
 utiliza una pequeña tabla en memoria cargada desde un archivo para
 demostrar la diferencia de rendimiento con respecto a ataques que
 necesitan calcular hashes para cada intento.
+
+Si existe la versión binaria de la tabla (``rainbow_table.bin``, generada
+por ``generate_rainbow_table.py``) se abre con ``mmap`` y cada consulta es
+una búsqueda binaria sobre los hashes ordenados, sin cargar la tabla en
+memoria.  La tabla en texto se mantiene como alternativa.
+
+Los hashes que no estén en la tabla directa se buscan en las tablas de
+cadenas (``rainbow_chains.bin``, ver ``utils/rainbow_chains.py``) si
+existen: cada consulta recorre las cadenas desde la última columna hacia
+la primera, cambiando memoria por tiempo de cálculo.
+
+Las tablas se abren al empezar `run` y se cierran al terminar: construir
+el ataque no lee ni proyecta ningún archivo.
 """
 
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .base_attack import AttackThread
+from .base_attack import BaseAttack
+from ..utils.hash_utils import decode_digest
 from ..utils.password_requirements import meets_password_requirements
+from ..utils.rainbow_chains import RainbowChainTable
+from ..utils.rainbow_format import RainbowTableFile
 
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parent.parent / "rainbow_table.txt"
+DEFAULT_CHAINS_PATH = Path(__file__).resolve().parent.parent / "rainbow_chains.bin"
 
-class RainbowTableAttack(AttackThread):
+
+class RainbowTableAttack(BaseAttack):
     """Ataque que utiliza una tabla precomputada de hashes."""
 
-    def __init__(self, target_hash: str, table_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        target_hash: str,
+        table_path: Optional[str] = None,
+        chains_path: Optional[str] = None,
+    ) -> None:
         super().__init__(target_hash)
-        if table_path is None:
-            table_path = Path(__file__).resolve().parent.parent / "rainbow_table.txt"
-        self.table_path = Path(table_path)
-        self.rainbow_map = {}  # hash -> contraseña
+        self.table_path = Path(table_path or DEFAULT_TABLE_PATH)
+        # Las cadenas son opcionales: sin ruta explícita solo se usan si existen
+        self.chains_explicit = chains_path is not None
+        self.chains_path = Path(chains_path) if self.chains_explicit else DEFAULT_CHAINS_PATH
+        self.rainbow_map: Dict[bytes, str] = {}  # hash (32 bytes) -> contraseña
+        self.binary_table: Optional[RainbowTableFile] = None
+        self.chain_table: Optional[RainbowChainTable] = None
         self.total_candidates = 0
+
+    @classmethod
+    def count_from_metadata(cls, params: Dict[str, Any]) -> Optional[int]:
+        # Una consulta por objetivo en la tabla directa, que no hace falta
+        # abrir, más las de las cadenas según su cabecera
+        target_hash = params['target_hash']
+        hashes = [target_hash] if isinstance(target_hash, str) else list(target_hash)
+        targets = len({decode_digest(hex_digest) for hex_digest in hashes})
+        chains_path = params['chains_path']
+        path = Path(chains_path) if chains_path is not None else DEFAULT_CHAINS_PATH
+        try:
+            with RainbowChainTable(path) as table:
+                return targets + cls._chain_hashes(targets, table)
+        except (OSError, ValueError):
+            return targets
+
+    @staticmethod
+    def _chain_hashes(targets: int, table: RainbowChainTable) -> int:
+        """Hashes de las consultas en las cadenas en el peor caso: L·(L−1)/2
+        por tabla y objetivo."""
+        length = table.chain_length
+        return targets * table.table_count * length * (length - 1) // 2
+
+    def _open_chains(self) -> None:
+        """Abre las tablas de cadenas, si existen o se indicaron."""
+        if not (self.chains_explicit or self.chains_path.exists()):
+            return
+        try:
+            self.chain_table = RainbowChainTable(self.chains_path)
+        except FileNotFoundError:
+            self.log_message(f"No se encontraron las cadenas arcoíris: {self.chains_path}")
+        except ValueError as exc:
+            self.log_message(str(exc))
+
+    def _open_table(self) -> None:
+        """Abre la tabla directa binaria o, en su defecto, carga la de texto."""
+        binary_path = self._binary_path()
+        if binary_path is not None:
+            try:
+                self.binary_table = RainbowTableFile(binary_path)
+                self.total_candidates = len(self.binary_table)
+                return
+            except FileNotFoundError:
+                self.log_message(f"No se encontró la tabla arcoíris: {binary_path}")
+                return
+            except ValueError as exc:
+                self.log_message(str(exc))
+                if binary_path == self.table_path:
+                    return
         self._load_table()
 
+    def _binary_path(self) -> Optional[Path]:
+        """Ruta de la tabla binaria a usar, o ``None`` para leer el texto.
+
+        Se usa la ruta indicada si ya es ``.bin``; si es la tabla en texto,
+        se usa su ``.bin`` hermano siempre que no sea más antiguo que ella.
+        """
+        if self.table_path.suffix == '.bin':
+            return self.table_path
+        binary_path = self.table_path.with_suffix('.bin')
+        try:
+            binary_mtime = binary_path.stat().st_mtime
+        except OSError:
+            return None
+        try:
+            if self.table_path.stat().st_mtime > binary_mtime:
+                return None
+        except OSError:
+            pass
+        return binary_path
+
+    def _lookup(self, digest: bytes) -> Optional[str]:
+        if self.binary_table is not None:
+            return self.binary_table.lookup(digest)
+        return self.rainbow_map.get(digest)
+
     def _load_table(self) -> None:
-        """Carga la tabla de hashes desde disco."""
+        """Carga la tabla de hashes en texto desde disco."""
         try:
             with self.table_path.open('r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
@@ -38,25 +139,81 @@ class RainbowTableAttack(AttackThread):
                     if ':' in line:
                         h, pwd = line.split(':', 1)
                         if meets_password_requirements(pwd):
-                            self.rainbow_map[h] = pwd
+                            try:
+                                self.rainbow_map[decode_digest(h)] = pwd
+                            except ValueError:
+                                continue
                 self.total_candidates = len(self.rainbow_map)
         except FileNotFoundError:
             self.log_message(f"No se encontró la tabla arcoíris: {self.table_path}")
 
+    def candidate_count(self) -> Optional[int]:
+        return self.count_from_metadata({'target_hash': self.target_hashes, 'chains_path': self.chains_path})
+
     def run(self) -> None:
-        self.start_time = time.time()
-        attempts = 0
-        # La tabla arcoíris permite consulta directa
-        elapsed = 0.0
-        if self.target_hash in self.rainbow_map:
-            password = self.rainbow_map[self.target_hash]
-            attempts = 1
-            elapsed = time.time() - self.start_time
-            self.found.emit(password, attempts, elapsed)
-        else:
-            attempts = len(self.rainbow_map)
-            elapsed = time.time() - self.start_time
-            self.log_message("La contraseña no está en la tabla arcoíris.")
-        # Emitir progreso final
-        self.progress.emit(attempts, self.total_candidates, elapsed)
-        self.finished.emit()
+        self.begin_progress()
+        # La tabla arcoíris permite consulta directa de cada objetivo; se
+        # confirma el resultado hasheando la contraseña por si la tabla
+        # estuviera corrupta
+        try:
+            self._open_table()
+            self._open_chains()
+            for lookups, digest in enumerate(self.target_digests, 1):
+                password = self._lookup(digest)
+                if password is not None and self.match_batch([password.encode('utf-8')]):
+                    if self.report_found(password, lookups):
+                        self.finished.emit()
+                        return
+            attempts = self.total_candidates
+            if self.chain_table is not None:
+                if not self._walk_chains():
+                    self.finished.emit()
+                    return
+                attempts = self.chain_table.hashes
+            # Emitir progreso final
+            self.finish_progress(attempts)
+            self.log_exhausted("La contraseña no está en la tabla arcoíris.")
+            self.finished.emit()
+        finally:
+            if self.binary_table is not None:
+                self.binary_table.close()
+                self.binary_table = None
+            if self.chain_table is not None:
+                self.chain_table.close()
+                self.chain_table = None
+            self.rainbow_map = {}
+
+    def _walk_chains(self) -> bool:
+        """Busca los objetivos pendientes recorriendo las tablas de cadenas.
+
+        El progreso cuenta los hashes calculados durante las consultas.
+
+        Returns:
+            ``False`` si el ataque terminó (todos descubiertos o cancelado).
+        """
+        table = self.chain_table
+        # El número de hashes de las consultas no se conoce de antemano
+        self.total_candidates = 0
+        self.log_message(
+            f"Recorriendo {table.table_count} tablas de cadenas ({table.chain_count} cadenas de longitud "
+            f"{table.chain_length}, cobertura teórica {table.coverage():.1%})."
+        )
+
+        def should_stop() -> bool:
+            self.report_progress(table.hashes)
+            return not self.running
+
+        for digest in self.target_digests:
+            if digest not in self.pending_digests:
+                continue
+            start = time.time()
+            password = table.lookup(digest, should_stop)
+            if not self.running:
+                self.finish_progress(table.hashes)
+                self.log_message("Ataque de tabla arcoíris cancelado por el usuario.")
+                return False
+            self.log_message(f"Consulta en las cadenas: {time.time() - start:.2f}s ({table.hashes} hashes acumulados).")
+            if password is not None and self.report_found(password, table.hashes):
+                self.running = False
+                return False
+        return True
@@ -4,102 +4,149 @@ Implementación de un ataque basado en reglas de transformación.
 Este ataque aplica un conjunto de reglas de manipulación (mangling) a
 palabras de un diccionario para generar variantes que los usuarios a
 menudo emplean, como poner la primera letra en mayúsculas, sustituir
-letras por números o añadir sufijos comunes.  Las transformaciones se
-aplican individualmente o en combinación limitada para evitar un número
-explosivo de candidatos.  Cada variante se compara con el hash de la
-contraseña objetivo.
+letras por números o añadir sufijos comunes.  Las reglas se leen de un
+archivo con sintaxis de estilo hashcat (por defecto ``default.rule``) y
+se compilan una vez con ``utils.rule_engine``, que las aplica a lotes de
+palabras.  Cada variante se compara con el hash de la contraseña
+objetivo.
+
+Si el diccionario tiene su binario de ancho fijo al día
+(``utils.dictionary_format``) y este contiene todas sus palabras, las
+palabras base se leen de él con ``mmap``, decodificadas por bloques y sin
+partir el texto en líneas.
 """
 
-import time
+import contextlib
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .base_attack import BaseAttack
+from ..utils.candidate_cache import CANDIDATE_CACHE
+from ..utils.dictionary_format import BinaryDictionary, open_binary_dictionary
+from ..utils.hash_utils import iter_batches
+from ..utils.packed_passwords import RECORD_SIZE
+from ..utils.rule_engine import DEFAULT_RULES_PATH, RuleProgram
 
-from .base_attack import AttackThread
-from ..utils.hash_utils import sha256_hash
-from ..utils.password_requirements import meets_password_requirements
+# Palabras base que se transforman juntas en cada lote
+WORD_BATCH_SIZE = 256
+DEFAULT_DICTIONARY_PATH = Path(__file__).resolve().parent.parent / "dictionary.txt"
 
 
-class RuleBasedAttack(AttackThread):
+class RuleBasedAttack(BaseAttack):
     """Ataque basado en reglas de mangling."""
 
-    def __init__(self, target_hash: str, dictionary_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        target_hash: str,
+        dictionary_path: Optional[str] = None,
+        rules_path: Optional[str] = None,
+    ) -> None:
         super().__init__(target_hash)
-        if dictionary_path is None:
-            dictionary_path = Path(__file__).resolve().parent.parent / "dictionary.txt"
-        self.dictionary_path = Path(dictionary_path)
-        # No podemos estimar fácilmente el total ya que depende de las reglas
+        self.dictionary_path = Path(dictionary_path or DEFAULT_DICTIONARY_PATH)
+        self.rules_path = Path(rules_path) if rules_path else DEFAULT_RULES_PATH
+        # Las reglas se compilan una sola vez para todo el ataque
+        self.program = RuleProgram.from_file(self.rules_path)
+        # El total se estima al empezar, si el diccionario está en la caché
         self.total_candidates = 0
 
+    @classmethod
+    def count_from_metadata(cls, params: Dict[str, Any]) -> Optional[int]:
+        # Sin binario completo habría que leer las palabras base
+        binary = cls._open_binary(Path(params['dictionary_path'] or DEFAULT_DICTIONARY_PATH))
+        if binary is None:
+            return None
+        with binary:
+            words = len(binary)
+        rules_path = Path(params['rules_path']) if params['rules_path'] else DEFAULT_RULES_PATH
+        program = RuleProgram.from_file(rules_path)
+        return program.estimate(Counter({RECORD_SIZE: words}))
+
+    @staticmethod
+    def _open_binary(dictionary_path: Path) -> Optional[BinaryDictionary]:
+        """Binario del diccionario si tiene todas las palabras base.
+
+        El binario solo guarda las entradas que cumplen la política, y
+        las reglas pueden volver válidas palabras que no la cumplen.
+        """
+        binary = open_binary_dictionary(dictionary_path)
+        if binary is not None and binary.skipped:
+            binary.close()
+            return None
+        return binary
+
     def apply_rules(self, word: str) -> List[str]:
-        """Genera variantes de una palabra aplicando reglas sencillas.
+        """Genera variantes de una palabra aplicando las reglas compiladas.
 
         La lista contiene la palabra original y las variantes.
         """
-        variants = set()
-        variants.add(word)
-        # Regla: primera letra en mayúsculas
-        if word:
-            variants.add(word[0].upper() + word[1:])
-        # Regla: última letra en mayúsculas
-        if len(word) > 1:
-            variants.add(word[:-1] + word[-1].upper())
-        # Regla: sustitución de caracteres por números/símbolos
-        substitutions = {
-            'a': '@', 'A': '@',
-            'e': '3', 'E': '3',
-            'i': '1', 'I': '1',
-            'o': '0', 'O': '0',
-            's': '5', 'S': '5',
-            'l': '1', 'L': '1',
-        }
-        for ch, repl in substitutions.items():
-            if ch in word:
-                variants.add(word.replace(ch, repl))
-        # Regla: añadir sufijos
-        suffixes = ['123', '!', '!23', '2024']
-        for suf in suffixes:
-            variants.add(word + suf)
-        # Devolver como lista única
-        return list(variants)
+        return self.program.apply(word)
+
+    def _iter_candidates(self, lines: Iterable[str]) -> Iterator[str]:
+        """Genera las variantes válidas del diccionario, por lotes de palabras."""
+        words = (line.strip() for line in lines)
+        for batch in iter_batches(filter(None, words), WORD_BATCH_SIZE):
+            yield from self.program.apply_batch(batch)
+
+    def candidate_count(self) -> Optional[int]:
+        binary = self._open_binary(self.dictionary_path)
+        if binary is not None:
+            with binary:
+                # Todos los registros tienen la misma longitud
+                return self.program.estimate(Counter({RECORD_SIZE: len(binary)}))
+        try:
+            words = CANDIDATE_CACHE.base_words(self.dictionary_path)
+        except FileNotFoundError:
+            return None
+        return self.program.estimate(Counter(map(len, words))) if words is not None else None
+
+    def iter_candidates(self) -> Iterator[str]:
+        binary = self._open_binary(self.dictionary_path)
+        if binary is not None:
+            with binary:
+                yield from self._iter_candidates(binary.words())
+            return
+        words = CANDIDATE_CACHE.base_words(self.dictionary_path)
+        if words is not None:
+            yield from self._iter_candidates(words)
+            return
+        with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
+            yield from self._iter_candidates(f)
 
     def run(self) -> None:
-        self.start_time = time.time()
+        self.begin_progress()
         attempts = 0
         try:
-            with self.dictionary_path.open('r', encoding='utf-8', errors='ignore') as f:
-                for base_word in f:
+            binary = self._open_binary(self.dictionary_path)
+            words = CANDIDATE_CACHE.base_words(self.dictionary_path) if binary is None else None
+            with contextlib.ExitStack() as stack:
+                if binary is not None:
+                    stack.enter_context(binary)
+                    words = binary.words()
+                    self.total_candidates = self.program.estimate(Counter({RECORD_SIZE: len(binary)}))
+                elif words is None:
+                    # El archivo no cabe en la caché: se lee en streaming
+                    words = stack.enter_context(
+                        self.dictionary_path.open('r', encoding='utf-8', errors='ignore')
+                    )
+                else:
+                    self.total_candidates = self.program.estimate(Counter(map(len, words)))
+                for batch in iter_batches(self._iter_candidates(words)):
                     if not self.running:
+                        self.finish_progress(attempts)
                         self.log_message("Ataque por reglas cancelado por el usuario.")
                         self.finished.emit()
                         return
-                    base_word = base_word.strip()
-                    if not base_word:
-                        continue
-                    variants = self.apply_rules(base_word)
-                    for cand in variants:
-                        if not self.running:
-                            self.log_message("Ataque por reglas cancelado por el usuario.")
-                            self.finished.emit()
-                            return
-                        if not meets_password_requirements(cand):
-                            continue
-                        attempts += 1
-                        h = sha256_hash(cand)
-                        if h == self.target_hash:
-                            elapsed = time.time() - self.start_time
-                            self.found.emit(cand, attempts, elapsed)
+                    for match in self.match_batch([cand.encode('utf-8') for cand in batch]):
+                        if self.report_found(batch[match], attempts + match + 1):
                             self.running = False
                             self.finished.emit()
                             return
-                        elapsed = time.time() - self.start_time
-                        # total_candidates permanece 0 ya que es indeterminado
-                        self.progress.emit(attempts, 0, elapsed)
-                        if attempts % 500 == 0:
-                            self.log_message(f"Probando: {cand}")
+                    attempts += len(batch)
+                    self.report_progress(attempts, batch[-1])
         except FileNotFoundError:
             self.log_message(f"No se encontró el diccionario: {self.dictionary_path}")
         # Finalizar
-        elapsed = time.time() - self.start_time
-        self.progress.emit(attempts, 0, elapsed)
-        self.log_message("Ataque por reglas finalizado sin éxito.")
+        self.finish_progress(attempts)
+        self.log_exhausted("Ataque por reglas finalizado sin éxito.")
         self.finished.emit()
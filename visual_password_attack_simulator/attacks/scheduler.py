@@ -0,0 +1,318 @@
+"""
+Planificador de ataques simultáneos.
+
+Sin coordinación, cada pestaña lanza su propio hilo y los ataques en
+paralelo crean cada uno un pool con todos los núcleos menos uno: varios a
+la vez sobresuscriben la CPU y dejan sin tiempo a la interfaz.
+`AttackScheduler` reparte un presupuesto fijo de trabajadores (por
+defecto ``default_workers()``, los núcleos menos uno) entre los ataques
+activos:
+
+- Los ataques secuenciales piden un turno (*slice*) de `SLICE_SECONDS`
+  cada vez que publican progreso (ver ``BaseAttack.report_progress``).  Un
+  turno ocupa un trabajador y una plaza de hilo; como todos los hilos del
+  proceso comparten el GIL, solo hay `THREAD_SLOTS` plazas.
+- Los ataques en paralelo (``ParallelKeyspaceSearch``) piden un trabajador
+  por cada porción del espacio de claves que envían a su pool (ver
+  `lane`).
+
+Cuando varios ataques esperan, el recurso libre se asigna al de menor
+tiempo virtual (planificación por *stride*): cada ataque acumula el
+tiempo de trabajador usado dividido por su peso, y el peso crece cuanto
+menor es su tiempo esperado hasta descubrir la contraseña (candidatos
+restantes entre su velocidad).  Así la tabla arcoíris y el diccionario
+avanzan antes que la fuerza bruta sin que esta se quede nunca sin turno.
+`shares` devuelve la fracción del presupuesto que ha usado cada ataque.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .base_attack import BaseAttack
+from ..utils.parallel_search import default_workers
+
+# Duración de un turno de un ataque secuencial
+SLICE_SECONDS = 0.2
+# Hilos de ataque que se ejecutan a la vez (comparten el GIL)
+THREAD_SLOTS = 1
+# Candidatos/s supuestos hasta medir la velocidad del ataque
+DEFAULT_RATE = 1_000_000.0
+# Candidatos supuestos cuando el ataque no conoce su total
+UNKNOWN_CANDIDATES = 10 ** 9
+# Cada cuánto se comprueba, mientras se espera turno, si el ataque se detuvo
+WAIT_INTERVAL = 0.1
+
+
+@dataclass(eq=False)
+class _Job:
+    """Estado de un ataque dentro del planificador."""
+    attack: BaseAttack
+    started: float
+    vtime: float = 0.0
+    weight: float = 1.0
+    # Trabajadores en uso y desde cuándo (para contabilizar su tiempo)
+    held: int = 0
+    since: float = 0.0
+    thread_slot: bool = False
+    slice_end: float = 0.0
+    waiting: bool = False
+    # Los ataques en paralelo no esperan bloqueados sino que vuelven a
+    # preguntar; su espera caduca si dejan de hacerlo
+    wait_expires: float = 0.0
+    pooled: bool = False
+    attempts: int = 0
+    # Tiempo de trabajador acumulado y el visto en la última llamada a `shares`
+    busy: float = 0.0
+    busy_seen: float = 0.0
+    # Número de orden de llegada, para desempatar
+    order: int = 0
+
+
+class WorkerLane:
+    """Trabajadores de un ataque en paralelo, uno por porción en vuelo.
+
+    Se obtiene con `AttackScheduler.lane`; ``ParallelKeyspaceSearch`` llama a
+    `try_acquire` antes de enviar cada porción y a `release` cuando termina.
+    """
+
+    def __init__(self, scheduler: "AttackScheduler", job: _Job) -> None:
+        self._scheduler = scheduler
+        self._job = job
+
+    def try_acquire(self) -> bool:
+        """Reserva un trabajador si hay uno libre y le corresponde al ataque."""
+        return self._scheduler._try_acquire_worker(self._job)
+
+    def release(self) -> None:
+        """Devuelve un trabajador."""
+        self._scheduler._release_workers(self._job, 1)
+
+
+class AttackScheduler:
+    """Reparte un presupuesto de trabajadores entre los ataques activos.
+
+    Args:
+        workers: Trabajadores disponibles (por defecto, los núcleos menos uno).
+        thread_slots: Ataques secuenciales que se ejecutan a la vez.
+        slice_seconds: Duración de un turno secuencial.
+        default_rate: Candidatos/s supuestos para un ataque hasta medir el
+            suyo (por ejemplo, los de ``utils.hash_rate``).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        thread_slots: int = THREAD_SLOTS,
+        slice_seconds: float = SLICE_SECONDS,
+        default_rate: float = DEFAULT_RATE,
+    ) -> None:
+        self.workers = max(1, workers or default_workers())
+        self.thread_slots = max(1, thread_slots)
+        self.slice_seconds = slice_seconds
+        self.default_rate = default_rate
+        self._cond = threading.Condition()
+        self._jobs: Dict[BaseAttack, _Job] = {}
+        self._free_workers = self.workers
+        self._free_threads = self.thread_slots
+        self._arrivals = 0
+        self._shares_at = time.monotonic()
+
+    # -- ciclo de vida --------------------------------------------------------
+
+    def run(self, attack: BaseAttack) -> None:
+        """Ejecuta ``attack.run()`` bajo el planificador (en el hilo actual)."""
+        self._register(attack)
+        try:
+            attack.run()
+        finally:
+            self._unregister(attack)
+
+    def _register(self, attack: BaseAttack) -> None:
+        now = time.monotonic()
+        with self._cond:
+            # Un ataque nuevo empieza con el menor tiempo virtual activo, para
+            # no acaparar los recursos hasta alcanzar a los demás
+            vtime = min((job.vtime for job in self._jobs.values()), default=0.0)
+            self._arrivals += 1
+            job = _Job(attack=attack, started=now, vtime=vtime, order=self._arrivals)
+            job.weight = self._weight(job, now)
+            self._jobs[attack] = job
+        attack.scheduler = self
+
+    def _unregister(self, attack: BaseAttack) -> None:
+        with self._cond:
+            job = self._jobs.pop(attack, None)
+            if job is not None:
+                self._return(job, job.held, time.monotonic())
+                if job.thread_slot:
+                    job.thread_slot = False
+                    self._free_threads += 1
+                self._cond.notify_all()
+        attack.scheduler = None
+
+    def lane(self, attack: BaseAttack) -> Optional[WorkerLane]:
+        """Trabajadores para la búsqueda en paralelo de ``attack``.
+
+        El ataque deja de pedir turnos secuenciales: su hilo solo coordina
+        el pool.  Devuelve ``None`` si el ataque no está registrado.
+        """
+        with self._cond:
+            job = self._jobs.get(attack)
+            if job is None:
+                return None
+            job.pooled = True
+            if job.thread_slot:
+                self._return(job, job.held, time.monotonic())
+                job.thread_slot = False
+                self._free_threads += 1
+                self._cond.notify_all()
+            return WorkerLane(self, job)
+
+    # -- turnos secuenciales --------------------------------------------------
+
+    def tick(self, attack: BaseAttack, attempts: int) -> None:
+        """Punto de planificación de un ataque secuencial.
+
+        Lo llama ``BaseAttack.report_progress``.  Si el ataque no tiene
+        turno, espera a obtenerlo; si su turno terminó y otro ataque espera,
+        lo cede y vuelve a la cola.  Si el ataque se detiene mientras
+        espera, continúa sin turno para terminar cuanto antes.
+        """
+        with self._cond:
+            job = self._jobs.get(attack)
+            if job is None:
+                return
+            job.attempts = attempts
+            if job.pooled:
+                return
+            now = time.monotonic()
+            if job.thread_slot and now < job.slice_end:
+                return
+            if job.thread_slot:
+                job.weight = self._weight(job, now)
+                # Al ceder su plaza de hilo, también cuentan los que la esperan
+                if not self._rivals(job, now, thread_free=True):
+                    job.slice_end = now + self.slice_seconds
+                    return
+                self._return(job, 1, now)
+                job.thread_slot = False
+                self._free_threads += 1
+                self._cond.notify_all()
+            job.waiting = True
+            try:
+                while not self._grantable(job, thread=True):
+                    if not attack.running:
+                        return
+                    self._cond.wait(WAIT_INTERVAL)
+                job.thread_slot = True
+                self._free_threads -= 1
+                self._take(job, 1, time.monotonic())
+                job.slice_end = time.monotonic() + self.slice_seconds
+            finally:
+                job.waiting = False
+
+    # -- trabajadores de los ataques en paralelo ------------------------------
+
+    def _try_acquire_worker(self, job: _Job) -> bool:
+        with self._cond:
+            if job.attack not in self._jobs:
+                return False
+            now = time.monotonic()
+            job.weight = self._weight(job, now)
+            if not self._grantable(job, thread=False):
+                # Queda en espera para que se le tenga en cuenta al repartir
+                job.waiting = True
+                job.wait_expires = now + 2 * WAIT_INTERVAL
+                return False
+            job.waiting = False
+            self._take(job, 1, time.monotonic())
+            return True
+
+    def _release_workers(self, job: _Job, count: int) -> None:
+        with self._cond:
+            if job.attack not in self._jobs:
+                return
+            self._return(job, min(count, job.held), time.monotonic())
+            self._cond.notify_all()
+
+    # -- reparto --------------------------------------------------------------
+
+    def _grantable(self, job: _Job, thread: bool) -> bool:
+        """Indica si hay un recurso libre y ``job`` es a quien le toca."""
+        if self._free_workers <= 0 or (thread and self._free_threads <= 0):
+            return False
+        key = (job.vtime, job.order)
+        rivals = self._rivals(job, time.monotonic(), thread_free=self._free_threads > 0)
+        return all(key <= (other.vtime, other.order) for other in rivals)
+
+    def _rivals(self, job: _Job, now: float, thread_free: bool) -> List[_Job]:
+        """Otros ataques que esperan un recurso que estaría libre."""
+        return [
+            other for other in self._jobs.values()
+            if other.waiting and other is not job
+            and (other.wait_expires > now if other.pooled else thread_free)
+        ]
+
+    def _take(self, job: _Job, count: int, now: float) -> None:
+        self._account(job, now)
+        job.held += count
+        self._free_workers -= count
+
+    def _return(self, job: _Job, count: int, now: float) -> None:
+        if count <= 0:
+            return
+        self._account(job, now)
+        job.held -= count
+        self._free_workers += count
+
+    @staticmethod
+    def _account(job: _Job, now: float) -> None:
+        """Suma el tiempo de trabajador usado desde la última contabilización."""
+        used = job.held * (now - job.since) if job.held else 0.0
+        job.busy += used
+        job.vtime += used / job.weight
+        job.since = now
+
+    def _weight(self, job: _Job, now: float) -> float:
+        """Peso según el tiempo esperado hasta descubrir la contraseña.
+
+        Menos segundos esperados, más peso; el logaritmo evita que los
+        ataques con espacios enormes se queden prácticamente sin turno.
+        """
+        attack = job.attack
+        total = attack.total_candidates or UNKNOWN_CANDIDATES
+        remaining = max(1, total - job.attempts)
+        elapsed = now - job.started
+        rate = job.attempts / elapsed if job.attempts and elapsed > 0 else self.default_rate
+        expected = remaining / max(rate, 1.0)
+        return 1.0 / (1.0 + math.log10(1.0 + expected))
+
+    # -- consulta -------------------------------------------------------------
+
+    def shares(self) -> Dict[BaseAttack, float]:
+        """Fracción del presupuesto usada por cada ataque desde la llamada anterior.
+
+        La fracción es el tiempo de trabajador usado entre el disponible
+        (``workers`` por los segundos transcurridos), de modo que la suma
+        es menor que 1 si sobran trabajadores.  Solo debe consultarla un
+        receptor (por ejemplo, un temporizador de la interfaz).
+        """
+        now = time.monotonic()
+        with self._cond:
+            capacity = self.workers * (now - self._shares_at)
+            self._shares_at = now
+            shares: Dict[BaseAttack, float] = {}
+            for attack, job in self._jobs.items():
+                self._account(job, now)
+                used = job.busy - job.busy_seen
+                job.busy_seen = job.busy
+                shares[attack] = min(1.0, used / capacity) if capacity > 0 else 0.0
+        return shares
+
+    def active(self) -> List[BaseAttack]:
+        """Ataques registrados, en orden de llegada."""
+        with self._cond:
+            return [job.attack for job in sorted(self._jobs.values(), key=lambda job: job.order)]
@@ -0,0 +1,6 @@
+"""Punto de entrada: ``python -m visual_password_attack_simulator.bench`` (ver ``bench.suite``)."""
+
+from .suite import main
+
+if __name__ == "__main__":
+    main()
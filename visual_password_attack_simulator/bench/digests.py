@@ -0,0 +1,106 @@
+"""
+Benchmark de los conjuntos de hashes objetivo.
+
+Para varios tamaños de objetivos compara la ruta original (``set`` de
+hashes hexadecimales y ``hexdigest`` por candidato) con un ``set`` de
+resúmenes binarios y con `DigestSet` (filtro de Bloom + arreglo ordenado).
+Informa la memoria de cada estructura con sus elementos, las consultas/s
+con resúmenes ya calculados (casi todas fallidas, como en un ataque) y
+los candidatos/s hasheando y consultando.
+
+Uso:
+    python -m visual_password_attack_simulator.bench.digests [--targets N ...] [--probes P]
+"""
+
+import argparse
+import hashlib
+import random
+import time
+import tracemalloc
+from typing import Callable, Container, List, Tuple
+
+from ..utils.hash_utils import DigestSet, find_digest_matches, iter_batches
+
+
+def _build(factory: Callable[[], Container]) -> Tuple[Container, float, float]:
+    """Construye la estructura y devuelve ``(estructura, MB, segundos)``.
+
+    La memoria se mide en una segunda construcción (tracemalloc ralentiza
+    la asignación); ``factory`` debe crear sus propios objetos para que
+    cuenten los elementos y no solo la tabla.
+    """
+    start = time.perf_counter()
+    structure = factory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    measured = factory()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+    return structure, size / (1024 * 1024), elapsed
+
+
+def _rate(count: int, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def _lookups(structure: Container, probes: List) -> int:
+    return sum(1 for probe in probes if probe in structure)
+
+
+def _legacy_pipeline(candidates: List[bytes], hex_targets: Container[str]) -> int:
+    sha256 = hashlib.sha256
+    return sum(1 for candidate in candidates if sha256(candidate).hexdigest() in hex_targets)
+
+
+def _batched_pipeline(candidates: List[bytes], targets: Container[bytes]) -> int:
+    return sum(len(find_digest_matches(batch, targets)) for batch in iter_batches(candidates))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="números de hashes objetivo a medir")
+    parser.add_argument("--probes", type=int, default=300_000, help="consultas y candidatos por medición")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    candidates = [rng.getrandbits(64).to_bytes(8, 'little') for _ in range(args.probes)]
+    for count in args.targets:
+        digests = [rng.getrandbits(256).to_bytes(32, 'little') for _ in range(count)]
+        # Una de cada cien consultas acierta
+        hits = [hashlib.sha256(candidate).digest() for candidate in candidates[::100]]
+        digests.extend(hits)
+        probes = [hashlib.sha256(candidate).digest() for candidate in candidates]
+        hex_probes = [digest.hex() for digest in probes]
+
+        # Como en `BaseAttack`, los objetivos llegan en hexadecimal
+        hex_digests = [digest.hex() for digest in digests]
+        hex_set, hex_mb, hex_time = _build(lambda: {digest.hex() for digest in digests})
+        bytes_set, bytes_mb, bytes_time = _build(lambda: {bytes.fromhex(digest) for digest in hex_digests})
+        compact, compact_mb, compact_time = _build(
+            lambda: DigestSet([bytes.fromhex(digest) for digest in hex_digests])
+        )
+
+        print(f"[OBJETIVOS] {len(digests):,} hashes")
+        rows = [
+            ("set hexadecimal", hex_mb, hex_time,
+             _rate(len(probes), lambda: _lookups(hex_set, hex_probes)),
+             _rate(len(candidates), lambda: _legacy_pipeline(candidates, hex_set))),
+            ("set binario", bytes_mb, bytes_time,
+             _rate(len(probes), lambda: _lookups(bytes_set, probes)),
+             _rate(len(candidates), lambda: _batched_pipeline(candidates, bytes_set))),
+            ("DigestSet", compact_mb, compact_time,
+             _rate(len(probes), lambda: _lookups(compact, probes)),
+             _rate(len(candidates), lambda: _batched_pipeline(candidates, compact))),
+        ]
+        for name, mb, build, lookups, pipeline in rows:
+            print(f"  {name:<16}: {mb:8.1f} MB  construcción {build:6.2f}s  "
+                  f"{lookups:12,.0f} consultas/s  {pipeline:12,.0f} candidatos/s")
+        print(f"  filtro de Bloom : {compact.filter_bytes / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark de la ruta de hashing de los ataques.
+
+Compara la ruta original (``sha256_hash`` por candidato y comparación de
+cadenas hexadecimales) con la ruta por lotes de ``hash_utils``
+(``find_digest_match`` sobre bytes y resúmenes binarios) aislando el
+hashing, y el bucle original de la fuerza bruta (``itertools.product``
+sobre todo el alfabeto, validación de cada combinación y una señal de
+progreso por intento) con el recorrido actual de `Keyspace`, por lotes y
+con ``Keyspace.search_valid``, que reutiliza el estado SHA‑256 de cada
+prefijo.
+
+El bucle original recorre millones de combinaciones inválidas antes de
+reunir unos cientos de miles de válidas, así que se mide sobre
+``--legacy-candidates`` intentos.
+
+Uso:
+    python -m visual_password_attack_simulator.bench.hashing [--candidates N] [--repeat R]
+"""
+
+import argparse
+import itertools
+import time
+from typing import Callable, List
+
+from ..attacks.base_attack import Signal
+from ..utils.hash_utils import (
+    decode_digest,
+    find_digest_match,
+    iter_batches,
+    sha256_hash,
+)
+from ..utils.keyspace import Keyspace
+from ..utils.password_requirements import (
+    ALLOWED_CHARACTERS,
+    ALLOWED_SPECIAL_CHARACTERS,
+    FORBIDDEN_CHARACTERS,
+    PASSWORD_LENGTH,
+)
+
+# Hash que no coincide con ningún candidato: se recorre siempre el lote entero
+MISSING_HASH = sha256_hash("no-existe")
+
+
+def _rate(count: int, func: Callable[[], object], repeat: int) -> float:
+    """Mejor tasa (elementos/s) de ``repeat`` ejecuciones."""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def _legacy_hash_only(candidates: List[str]) -> None:
+    for candidate in candidates:
+        if sha256_hash(candidate) == MISSING_HASH:
+            break
+
+
+def _batched_hash_only(encoded: List[List[bytes]]) -> None:
+    target = decode_digest(MISSING_HASH)
+    for batch in encoded:
+        find_digest_match(batch, target)
+
+
+def _legacy_meets_requirements(password: str) -> bool:
+    """Comprobación de la política tal como la hacía el bucle original."""
+    if len(password) != PASSWORD_LENGTH:
+        return False
+    if any(ch in FORBIDDEN_CHARACTERS for ch in password):
+        return False
+    if not all(ch in ALLOWED_CHARACTERS for ch in password):
+        return False
+    if not any(ch.islower() for ch in password):
+        return False
+    if not any(ch.isupper() for ch in password):
+        return False
+    if not any(ch.isdigit() for ch in password):
+        return False
+    if not any(ch in ALLOWED_SPECIAL_CHARACTERS for ch in password):
+        return False
+    return True
+
+
+def _legacy_pipeline(count: int) -> None:
+    # Bucle de ``BruteForceAttack.run`` anterior a `Keyspace`; la señal de
+    # progreso por intento se sustituye por una llamada sin receptores
+    progress = Signal()
+    start_time = time.time()
+    attempts = 0
+    for combo in itertools.product(ALLOWED_CHARACTERS, repeat=PASSWORD_LENGTH):
+        candidate = ''.join(combo)
+        if not _legacy_meets_requirements(candidate):
+            continue
+        attempts += 1
+        if sha256_hash(candidate) == MISSING_HASH:
+            break
+        progress.emit(attempts, 0, time.time() - start_time)
+        if attempts >= count:
+            break
+
+
+def _batched_pipeline(count: int) -> None:
+    target = decode_digest(MISSING_HASH)
+    keyspace = Keyspace.brute_force(ALLOWED_CHARACTERS, PASSWORD_LENGTH)
+    valid = itertools.islice(keyspace.iter_valid(), count)
+    for batch in iter_batches(valid):
+        find_digest_match([candidate.encode('ascii') for _, candidate in batch], target)
+
+
+def _prefix_pipeline(count: int) -> None:
+    target = decode_digest(MISSING_HASH)
+    keyspace = Keyspace.brute_force(ALLOWED_CHARACTERS, PASSWORD_LENGTH)
+    checked = 0
+    for tried, _, _, _ in keyspace.search_valid({target}):
+        checked += tried
+        if checked >= count:
+            break
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=300_000, help="candidatos válidos por medición")
+    parser.add_argument(
+        "--legacy-candidates", type=int, default=10_000, help="intentos válidos del bucle original"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones de cada medición (se toma la mejor)")
+    args = parser.parse_args()
+    count = args.candidates
+
+    keyspace = Keyspace.brute_force(ALLOWED_CHARACTERS, PASSWORD_LENGTH)
+    sample = keyspace.sample(count)
+    encoded = [[candidate.encode('ascii') for candidate in batch] for batch in iter_batches(sample)]
+
+    legacy = _rate(count, lambda: _legacy_hash_only(sample), args.repeat)
+    batched = _rate(count, lambda: _batched_hash_only(encoded), args.repeat)
+    print(f"[HASH] sha256_hash + hex      : {legacy:12,.0f} hashes/s")
+    print(f"[HASH] find_digest_match      : {batched:12,.0f} hashes/s  (x{batched / legacy:.2f})")
+
+    legacy_count = min(count, args.legacy_candidates)
+    legacy = _rate(legacy_count, lambda: _legacy_pipeline(legacy_count), args.repeat)
+    batched = _rate(count, lambda: _batched_pipeline(count), args.repeat)
+    prefix = _rate(count, lambda: _prefix_pipeline(count), args.repeat)
+    print(f"[FUERZA BRUTA] ruta original  : {legacy:12,.0f} intentos/s")
+    print(f"[FUERZA BRUTA] ruta por lotes : {batched:12,.0f} intentos/s  (x{batched / legacy:.2f})")
+    print(f"[FUERZA BRUTA] prefijos       : {prefix:12,.0f} intentos/s  (x{prefix / legacy:.2f})")
+
+
+if __name__ == "__main__":
+    main()
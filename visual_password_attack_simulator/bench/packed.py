@@ -0,0 +1,91 @@
+"""
+Benchmark de la representación de los diccionarios generados.
+
+Compara la ruta original (``set`` de ``str`` y ``sorted``) con
+`PackedPasswords` (registros de 10 bytes, orden y deduplicación como
+enteros ``uint64`` con NumPy o con ``sorted`` sin él) sobre contraseñas
+sintéticas con un porcentaje de repetidas.  Informa la memoria de la
+estructura con sus elementos y el tiempo de construirla y de obtener las
+contraseñas ordenadas y sin repetir.
+
+Uso:
+    python -m visual_password_attack_simulator.bench.packed [--count N ...] [--duplicates F]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from ..utils import packed_passwords
+from ..utils.packed_passwords import PackedPasswords
+from ..utils.password_requirements import ALLOWED_CHARACTERS, PASSWORD_LENGTH
+
+
+def _measure(factory: Callable[[], object]) -> Tuple[object, float, float]:
+    """Construye con ``factory`` y devuelve ``(resultado, MB, segundos)``.
+
+    Igual que en ``bench.digests``, la memoria se mide en una segunda
+    construcción porque tracemalloc ralentiza la asignación.
+    """
+    start = time.perf_counter()
+    result = factory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    measured = factory()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+    return result, size / (1024 * 1024), elapsed
+
+
+def _timed(func: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _passwords(count: int, duplicates: float, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    unique = max(1, int(count * (1 - duplicates)))
+    words = [''.join(rng.choice(ALLOWED_CHARACTERS) for _ in range(PASSWORD_LENGTH)) for _ in range(unique)]
+    words.extend(rng.choice(words) for _ in range(count - unique))
+    return words
+
+
+def _packed(words: List[str]) -> PackedPasswords:
+    packed = PackedPasswords()
+    packed.extend(words)
+    return packed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="números de contraseñas a medir")
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fracción de contraseñas repetidas")
+    args = parser.parse_args()
+
+    backend = "NumPy" if packed_passwords.np is not None else "sorted (sin NumPy)"
+    print(f"[INFO] Orden empaquetado con {backend}")
+    for count in args.count:
+        words = _passwords(count, args.duplicates)
+        # Copias nuevas de cada cadena para que cuenten en la memoria del set
+        as_set, set_mb, set_build = _measure(lambda: {word[:5] + word[5:] for word in words})
+        packed, packed_mb, packed_build = _measure(lambda: _packed(words))
+        expected, set_sort = _timed(lambda: sorted(as_set))
+        result, packed_sort = _timed(lambda: packed.sorted_unique())
+        assert list(result) == expected
+
+        print(f"[CONTRASEÑAS] {count:,} ({len(expected):,} distintas)")
+        rows = [
+            ("set de str", set_mb, set_build, set_sort),
+            ("PackedPasswords", packed_mb, packed_build, packed_sort),
+        ]
+        for name, mb, build, sort in rows:
+            print(f"  {name:<16}: {mb:8.1f} MB  construcción {build:6.2f}s  orden y deduplicación {sort:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
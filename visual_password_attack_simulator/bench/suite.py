@@ -0,0 +1,296 @@
+"""
+Benchmark sin interfaz de todos los ataques.
+
+Genera datos sintéticos en un directorio temporal (diccionario, palabras
+para las reglas, bases del híbrido, tabla arcoíris directa y de cadenas)
+y ejecuta cada ataque en su propio proceso contra hashes objetivo que
+ningún candidato alcanza, de modo que cada ataque recorre todo su trabajo
+o consume el tiempo asignado.  Por ataque informa:
+
+- candidatos/s: generación sola (``iter_candidates``), sin hashear;
+- hashes/s: intentos/s de ``run`` (cada intento es un SHA‑256; en la tabla
+  arcoíris cuentan los hashes del recorrido de las cadenas);
+- RSS máximo del proceso;
+- tiempo hasta el primer candidato, incluida la preparación del ataque.
+
+Los resultados se guardan en JSON junto con el commit actual, de modo que
+se pueden comparar ejecuciones entre commits (``--compare``).
+
+Uso:
+    python -m visual_password_attack_simulator.bench [--attacks A ...] [--seconds S]
+        [--targets N] [--dictionary-size N] [--json RUTA] [--compare RUTA]
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..attacks.base_attack import BaseAttack
+from ..attacks.brute_force import BruteForceAttack
+from ..attacks.dictionary_attack import DictionaryAttack
+from ..attacks.hybrid_attack import HybridAttack
+from ..attacks.mask_attack import MaskAttack
+from ..attacks.rainbow_table import RainbowTableAttack
+from ..attacks.rule_based_attack import RuleBasedAttack
+from ..utils.dictionary_format import build_binary_dictionary
+from ..utils.hash_utils import sha256_hash
+from ..utils.keyspace import Keyspace, parse_mask
+from ..utils.password_requirements import ALLOWED_CHARACTERS, PASSWORD_LENGTH, meets_password_requirements
+from ..utils.rainbow_chains import generate_tables, write_chain_tables
+from ..utils.rainbow_format import write_rainbow_table
+
+RESULTS_VERSION = 1
+MASK = '?u?l?l?l?l?l?d?d?d?s'
+HYBRID_MAX_SUFFIX = 200
+# Tablas de cadenas pequeñas: el recorrido de cada consulta es rápido
+CHAIN_MASK = 'Abcdef?l?d?d?s'
+CHAIN_LENGTH = 100
+CHAIN_TABLES = 2
+CHAINS_PER_TABLE = 500
+
+
+def _brute_force(targets: List[str], data: Path) -> BaseAttack:
+    return BruteForceAttack(targets)
+
+
+def _mask(targets: List[str], data: Path) -> BaseAttack:
+    return MaskAttack(targets, mask=MASK)
+
+
+def _dictionary(targets: List[str], data: Path) -> BaseAttack:
+    return DictionaryAttack(targets, str(data / "dictionary.txt"))
+
+
+def _rules(targets: List[str], data: Path) -> BaseAttack:
+    return RuleBasedAttack(targets, str(data / "words.txt"))
+
+
+def _hybrid(targets: List[str], data: Path) -> BaseAttack:
+    return HybridAttack(targets, str(data / "bases.txt"), max_suffix=HYBRID_MAX_SUFFIX)
+
+
+def _rainbow(targets: List[str], data: Path) -> BaseAttack:
+    return RainbowTableAttack(targets, str(data / "rainbow_table.bin"), str(data / "rainbow_chains.bin"))
+
+
+ATTACKS: Dict[str, Callable[[List[str], Path], BaseAttack]] = {
+    "brute_force": _brute_force,
+    "mask": _mask,
+    "dictionary": _dictionary,
+    "rules": _rules,
+    "hybrid": _hybrid,
+    "rainbow": _rainbow,
+}
+
+
+def _random_word(rng: random.Random, alphabet: str, low: int, high: int) -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+
+def write_data(directory: Path, dictionary_size: int, seed: int = 0) -> None:
+    """Escribe los datos sintéticos de todos los ataques en ``directory``."""
+    rng = random.Random(seed)
+    passwords = set()
+    while len(passwords) < dictionary_size:
+        word = _random_word(rng, ALLOWED_CHARACTERS, PASSWORD_LENGTH, PASSWORD_LENGTH)
+        if meets_password_requirements(word):
+            passwords.add(word)
+    passwords = sorted(passwords)
+    (directory / "dictionary.txt").write_text('\n'.join(passwords) + '\n', encoding='utf-8')
+    # Como `generate_dictionary.py`, con su binario de ancho fijo
+    build_binary_dictionary(directory / "dictionary.txt")
+    # Palabras de 10 caracteres con mayúscula, dígitos y alguna "a": las
+    # sustituciones "sa@" de las reglas por defecto las hacen válidas
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = []
+    for _ in range(max(1, dictionary_size // 2)):
+        word = list(_random_word(rng, letters, 8, 8).capitalize() + _random_word(rng, '0123456789', 2, 2))
+        word[rng.randrange(1, 8)] = 'a'
+        words.append(''.join(word))
+    (directory / "words.txt").write_text('\n'.join(words) + '\n', encoding='utf-8')
+    bases = [_random_word(rng, letters, 4, 10) for _ in range(max(1, dictionary_size // 200))]
+    (directory / "bases.txt").write_text('\n'.join(bases) + '\n', encoding='utf-8')
+    write_rainbow_table(
+        directory / "rainbow_table.bin",
+        ((bytes.fromhex(sha256_hash(password)), password) for password in passwords),
+    )
+    keyspace = Keyspace(parse_mask(CHAIN_MASK))
+    tables = generate_tables(keyspace, CHAIN_LENGTH, CHAIN_TABLES, CHAINS_PER_TABLE, seed=seed)
+    write_chain_tables(directory / "rainbow_chains.bin", keyspace, CHAIN_LENGTH, tables)
+
+
+def synthetic_targets(count: int) -> List[str]:
+    """Hashes que ningún candidato alcanza (las cadenas no cumplen la política)."""
+    return [sha256_hash(f"objetivo-sintetico-{index}") for index in range(max(1, count))]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """RSS máximo del proceso actual, en MB; ``None`` si no se puede medir."""
+    # En Linux ``ru_maxrss`` conserva el máximo del proceso padre tras el
+    # fork de "spawn"; VmHWM es solo del proceso actual
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(name: str, data_dir: str, targets: List[str], seconds: float) -> Dict[str, Any]:
+    """Mide un ataque; se ejecuta en un proceso propio para aislar su RSS."""
+    factory = ATTACKS[name]
+    data = Path(data_dir)
+
+    # Generación sola: el primer candidato incluye la preparación del ataque
+    start = time.perf_counter()
+    attack = factory(targets, data)
+    setup = time.perf_counter() - start
+    first: Optional[float] = None
+    candidates = 0
+    deadline = time.perf_counter() + seconds
+    for _ in attack.iter_candidates():
+        if first is None:
+            # La tasa se mide desde el primer candidato: la espera inicial
+            # se informa aparte
+            first = time.perf_counter() - start
+        candidates += 1
+        if not candidates & 0x3FF and time.perf_counter() >= deadline:
+            break
+    generation = time.perf_counter() - start - first if first is not None else 0.0
+
+    # Ataque completo, limitado a ``seconds``
+    attack = factory(targets, data)
+    last_progress = [0]
+    found: List[str] = []
+    attack.progress.connect(lambda attempts, total, elapsed: last_progress.__setitem__(0, attempts))
+    attack.found.connect(lambda password, attempts, elapsed: found.append(password))
+    timer = threading.Timer(seconds, attack.stop)
+    timer.start()
+    run_start = time.perf_counter()
+    try:
+        attack.run()
+    finally:
+        timer.cancel()
+    run = time.perf_counter() - run_start
+    hashes = last_progress[0]
+    peak_rss = _peak_rss_mb()
+
+    return {
+        "attack": name,
+        "setup_s": round(setup, 6),
+        "time_to_first_candidate_s": None if first is None else round(first, 6),
+        "candidates": candidates,
+        "candidates_per_s": round((candidates - 1) / generation, 1) if candidates > 1 and generation > 0 else None,
+        "hashes": hashes,
+        "hashes_per_s": round(hashes / run, 1) if run > 0 else None,
+        "run_s": round(run, 6),
+        "completed": attack.running,
+        "found": len(found),
+        "peak_rss_mb": None if peak_rss is None else round(peak_rss, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _format(value: Optional[float], spec: str, suffix: str = "") -> str:
+    return "-" if value is None else format(value, spec) + suffix
+
+
+def _print_results(results: List[Dict[str, Any]], previous: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'ataque':<12} {'candidatos/s':>14} {'hashes/s':>14} {'RSS máx (MB)':>13} {'1.er candidato':>15}")
+    for result in results:
+        line = (
+            f"{result['attack']:<12} {_format(result['candidates_per_s'], ',.0f'):>14} "
+            f"{_format(result['hashes_per_s'], ',.0f'):>14} {_format(result['peak_rss_mb'], '.1f'):>13} "
+            f"{_format(result['time_to_first_candidate_s'], '.4f', 's'):>15}"
+        )
+        before = previous.get(result['attack'])
+        if before and before.get('hashes_per_s') and result['hashes_per_s']:
+            line += f"  hashes/s x{result['hashes_per_s'] / before['hashes_per_s']:.2f}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attacks", nargs="+", choices=sorted(ATTACKS), default=list(ATTACKS),
+                        help="ataques a medir (por defecto, todos)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="tiempo máximo de cada medición")
+    parser.add_argument("--targets", type=int, default=1, help="hashes objetivo sintéticos")
+    parser.add_argument("--dictionary-size", type=int, default=200_000, help="entradas del diccionario sintético")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de los datos sintéticos")
+    parser.add_argument("--json", type=Path, default=Path("bench_results.json"), help="archivo de resultados")
+    parser.add_argument("--compare", type=Path, help="resultados anteriores con los que comparar")
+    args = parser.parse_args()
+
+    previous: Dict[str, Dict[str, Any]] = {}
+    if args.compare is not None:
+        data = json.loads(args.compare.read_text(encoding='utf-8'))
+        previous = {result['attack']: result for result in data.get('results', [])}
+
+    targets = synthetic_targets(args.targets)
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        write_data(Path(data_dir), args.dictionary_size, args.seed)
+        print(f"[BENCH] datos sintéticos en {time.perf_counter() - start:.1f}s; "
+              f"{len(targets)} objetivo(s), máximo {args.seconds:g}s por medición")
+        # "spawn" y un proceso nuevo por ataque: el RSS máximo es solo suyo
+        ctx = multiprocessing.get_context("spawn")
+        for name in args.attacks:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+                results.append(executor.submit(measure, name, data_dir, targets, args.seconds).result())
+    _print_results(results, previous)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "seconds": args.seconds,
+            "targets": len(targets),
+            "dictionary_size": args.dictionary_size,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    print(f"[BENCH] resultados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
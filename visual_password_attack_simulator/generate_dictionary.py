@@ -33,6 +33,29 @@ Además:
   de MENOS de 10 caracteres (tal como aparecen en los archivos) para
   usarlas como diccionario base del ataque híbrido.
 
+La generación es en streaming y con memoria acotada: las fuentes se leen
+por bloques en un pool de procesos, las bases se deduplican con una
+ordenación externa (runs ordenadas en disco y mezcla final, ver
+``utils/external_sort.py``) y las variantes se generan por lotes en el
+mismo pool.  Ambos archivos se escriben ordenados, sin repetidos, a un
+temporal que sustituye al anterior al terminar:
+
+    python generate_dictionary.py --workers 8 --memory-mb 512 --seed 1
+
+``--memory-mb`` limita los búferes de ordenación (el resto va a
+``--tmp-dir``); ``--seed`` hace reproducible el resultado con cualquier
+número de procesos.
+
+La construcción es incremental: cada fuente tiene sus shards ordenados en
+``cache/dictionary/`` y ``manifest.json`` guarda el hash del contenido de
+cada una y los parámetros de generación.  En la siguiente ejecución solo
+se regeneran los shards de las fuentes que cambiaron y se vuelven a
+mezclar; ``--full`` lo regenera todo.
+
+Junto a ``dictionary.txt`` se escriben su índice (``dictionary.txt.idx``) y
+su versión binaria de ancho fijo (``dictionary.bin``, ver
+``utils/dictionary_format.py``), que los ataques abren con ``mmap``.
+
 REGLAS DEL PROYECTO:
 A. Debe contener exactamente 10 caracteres.
 B. Debe estar formada por dígitos, letras ASCII y al menos
@@ -45,11 +68,33 @@ Uso educativo para la vitrina de clase en IberoCDMX.
 NO usar ni reutilizar estas contraseñas en sistemas reales.
 """
 
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
 import random
 import string
 import re
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Set, Tuple
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+if __package__:
+    from .utils.dictionary_format import build_binary_dictionary, open_binary_dictionary
+    from .utils.dictionary_index import build_index
+    from .utils.external_sort import ExternalSorter, read_run, unique_merge, write_run
+    from .utils.parallel_search import default_workers
+else:  # Ejecutado como script: python generate_dictionary.py
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from visual_password_attack_simulator.utils.dictionary_format import build_binary_dictionary, open_binary_dictionary
+    from visual_password_attack_simulator.utils.dictionary_index import build_index
+    from visual_password_attack_simulator.utils.external_sort import ExternalSorter, read_run, unique_merge, write_run
+    from visual_password_attack_simulator.utils.parallel_search import default_workers
 
 # ==========================
 # Parámetros de configuración
@@ -67,6 +112,19 @@ MALE_NAMES_FILE = HERE / "male_names.csv"
 SURNAMES1_FILE = HERE / "surnames1.csv"
 SURNAMES2_FILE = HERE / "surnames2.csv"
 
+CHUNK_SIZE = 1 << 20          # bytes de cada fuente por bloque de lectura
+BASES_POR_LOTE = 2000         # bases limpias por lote de generación de variantes
+MEMORY_MB = 256               # memoria de los búferes de ordenación externa
+HASH_BLOCK = 1 << 20          # bytes por lectura al calcular el hash de una fuente
+
+# Construcción incremental: shards por fuente y manifiesto
+SHARDS_DIR = HERE / "cache" / "dictionary"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+# Versión de las reglas de generación; cambiarla invalida todos los shards
+GENERATOR_VERSION = 1
+INTERNAL_SOURCE = "internas"  # nombre del shard de las bases internas
+
 UPPER = string.ascii_uppercase          # A-Z
 LOWER = string.ascii_lowercase          # a-z
 DIGITS = string.digits                  # 0-9
@@ -173,6 +231,9 @@ COMMON_SPANISH_PASSWORDS = [
     "contrasena",  # en lugar de "contraseña"
 ]
 
+# bases internas (keywords y contraseñas comunes); reciben más variantes
+INTERNAL_BASES = frozenset(STUDENT_KEYWORDS) | frozenset(COMMON_SPANISH_PASSWORDS)
+
 
 # ==========================
 # Helpers de transformación
@@ -276,7 +337,9 @@ def generar_variantes_desde_base(base: str, max_variantes: int = 10) -> Set[str]
         leet_cap = aplicar_leet_simple(base_clean[0].upper() + base_clean[1:])
         roots.add(leet_cap)
 
-    roots = [r for r in roots if r]
+    # ordenadas: el orden de un set cambia entre procesos y una semilla
+    # no bastaría para repetir las mismas variantes
+    roots = sorted(r for r in roots if r)
     if not roots:
         return variantes
 
@@ -407,32 +470,20 @@ def raw_viable_for_hybrid(raw: str) -> bool:
 
 
 # ==========================
-# Carga de bases externas
+# Lectura de las fuentes externas por bloques
 # ==========================
 
-def cargar_bases_externas() -> Tuple[Set[str], Set[str], Set[str]]:
+def fuentes_externas() -> List[Path]:
     """
-    Carga palabras base desde:
+    Fuentes de bases en el orden en que se leen:
     - allwords.txt
     - password-list-mx.txt
     - female_names.csv
     - male_names.csv
     - surnames1.csv
     - surnames2.csv
-
-    Devuelve:
-      - bases: palabras base limpias (para generar variaciones)
-      - originales10: palabras EXACTAMENTE de 10 caracteres que,
-        tal cual están escritas, ya cumplen las reglas y se incluirán
-        directamente en el diccionario final.
-      - hybrid_bases_raw: palabras <10 chars "tal cual" (como en archivo),
-        filtradas, para usarlas como diccionario base en el ataque híbrido.
     """
-    bases: Set[str] = set()
-    originales10: Set[str] = set()
-    hybrid_bases_raw: Set[str] = set()
-
-    paths = [
+    return [
         ALLWORDS_FILE,
         PASSWORD_MX_FILE,
         FEMALE_NAMES_FILE,
@@ -441,176 +492,465 @@ def cargar_bases_externas() -> Tuple[Set[str], Set[str], Set[str]]:
         SURNAMES2_FILE,
     ]
 
-    for path in paths:
-        if not path.exists():
-            print(f"[WARN] Wordlist externo no encontrado: {path}")
+
+def iter_bloques(path: Path, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """
+    Divide ``path`` en bloques de unos ``chunk_bytes`` que terminan en fin
+    de línea.  Genera ``(desplazamiento, tamaño)``.
+    """
+    with path.open("rb") as fin:
+        total = os.fstat(fin.fileno()).st_size
+        offset = 0
+        while offset < total:
+            fin.seek(min(offset + chunk_bytes, total))
+            fin.readline()
+            end = min(fin.tell(), total)
+            yield offset, end - offset
+            offset = end
+
+
+def palabras_de_linea(line: str, is_csv: bool, nombres: bool) -> List[str]:
+    """
+    Palabras "tal cual" de una línea ya sin espacios en los extremos.
+
+    En los CSV se toma la primera columna (saltando cabeceras típicas) y,
+    si son nombres, se dividen los compuestos ("MARIA CARMEN"); en los TXT
+    se usa la línea completa.
+    """
+    if not is_csv:
+        return [line]
+    first_field = line.split(",")[0].strip().strip('"')
+    if not first_field:
+        return []
+    if first_field.lower() in ("name", "surname"):
+        return []
+    if nombres:
+        return [t.strip() for t in first_field.split() if t.strip()]
+    return [first_field]
+
+
+def procesar_bloque(path: Path, offset: int, size: int) -> Tuple[List[str], List[str], List[str], int]:
+    """
+    Procesa el bloque ``[offset, offset + size)`` de una fuente externa.
+
+    Cada proceso del pool lee su bloque directamente del archivo, de modo
+    que solo viaja entre procesos el resultado, ya sin repetidos dentro
+    del bloque.  Devuelve:
+      - bases: palabras base limpias (para generar variaciones)
+      - originales10: palabras EXACTAMENTE de 10 caracteres que,
+        tal cual están escritas, ya cumplen las reglas.
+      - hybrid: palabras <10 chars "tal cual", filtradas, para el
+        ataque híbrido.
+      - el número de líneas no vacías leídas.
+    """
+    is_csv = path.suffix.lower() == ".csv"
+    nombres = "female" in path.name.lower() or "male" in path.name.lower()
+    bases: Set[str] = set()
+    originales10: Set[str] = set()
+    hybrid: Set[str] = set()
+    count_lines = 0
+
+    with path.open("rb") as f:
+        f.seek(offset)
+        lines = f.read(size).splitlines()
+
+    for raw_line in lines:
+        line = raw_line.decode("utf-8", errors="ignore").strip()
+        if not line:
             continue
+        count_lines += 1
 
-        print(f"[INFO] Cargando wordlist externo: {path.name}")
-        count_lines = 0
-        is_csv = path.suffix.lower() == ".csv"
-
-        with path.open("r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                count_lines += 1
-
-                raw_items = []
-
-                if is_csv:
-                    # Tomamos la primera columna
-                    first_field = line.split(",")[0].strip().strip('"')
-                    if not first_field:
-                        continue
-                    lf = first_field.lower()
-                    # Saltamos cabeceras típicas
-                    if lf in ("name", "surname"):
-                        continue
-
-                    # Para nombres, dividimos nombres compuestos ("MARIA CARMEN")
-                    if "female" in path.name.lower() or "male" in path.name.lower():
-                        tokens = [t.strip() for t in first_field.split() if t.strip()]
-                        raw_items.extend(tokens)
-                    else:
-                        # Para apellidos usamos el campo completo
-                        raw_items.append(first_field)
-                else:
-                    # TXT plano: usamos la línea completa como raw
-                    raw_items.append(line)
-
-                for raw in raw_items:
-                    # Incluir "tal cual" si ya tiene 10 caracteres y cumple las reglas
-                    if len(raw) == 10 and cumple_reglas(raw):
-                        originales10.add(raw)
-
-                    # Guardar palabra "tal cual" para hybrid si < 10 caracteres y viable
-                    if raw_viable_for_hybrid(raw):
-                        hybrid_bases_raw.add(raw)
-
-                    # Limpiar para usar como base (minúsculas, [a-z0-9])
-                    w = limpiar_base(raw)
-                    if not w:
-                        continue
-
-                    # Si la palabra es demasiado larga, la truncamos como base
-                    if len(w) > 10:
-                        w = w[:10]
-
-                    # Longitud mínima razonable para base
-                    if len(w) >= 3:
-                        bases.add(w)
-
-                if count_lines % 100000 == 0:
-                    print(f"[INFO] Leídas {count_lines} líneas de {path.name}...")
+        for raw in palabras_de_linea(line, is_csv, nombres):
+            # Incluir "tal cual" si ya tiene 10 caracteres y cumple las reglas
+            if len(raw) == 10 and cumple_reglas(raw):
+                originales10.add(raw)
 
-        print(f"[INFO] Total de líneas leídas de {path.name}: {count_lines}")
+            # Guardar palabra "tal cual" para hybrid si < 10 caracteres y viable
+            if raw_viable_for_hybrid(raw):
+                hybrid.add(raw)
 
-    print(f"[INFO] Total de bases externas cargadas (limpias): {len(bases)}")
-    print(f"[INFO] Total de palabras de 10 caracteres válidas tal cual: {len(originales10)}")
-    print(f"[INFO] Total de palabras <10 chars guardadas para hybrid: {len(hybrid_bases_raw)}")
-    return bases, originales10, hybrid_bases_raw
+            # Limpiar para usar como base (minúsculas, [a-z0-9])
+            w = limpiar_base(raw)
+            if not w:
+                continue
 
+            # Si la palabra es demasiado larga, la truncamos como base
+            if len(w) > 10:
+                w = w[:10]
 
-def generar_contraseñas_desde_bases() -> Tuple[Set[str], Set[str], Set[str]]:
-    """
-    Genera contraseñas a partir de:
+            # Longitud mínima razonable para base
+            if len(w) >= 3:
+                bases.add(w)
 
-    - STUDENT_KEYWORDS
-    - COMMON_SPANISH_PASSWORDS
-    - Palabras provenientes de allwords/password-list-mx
-    - Nombres y apellidos de female_names.csv, male_names.csv,
-      surnames1.csv, surnames2.csv
+    return list(bases), list(originales10), list(hybrid), count_lines
+
+
+def generar_bloque_variantes(bases: List[str], seed: str) -> Tuple[List[str], int]:
+    """
+    Genera las variantes de un lote de bases limpias; devuelve también
+    el tamaño del lote para informar del progreso.
+
+    Al menos 5 variaciones por base viable; más para las bases internas
+    (palabras clave del contexto Ibero).  Cada base usa su propia semilla
+    (``seed`` y la base), de modo que sus variantes no dependen del lote,
+    del proceso ni de la fuente en que aparezca: la misma base en dos
+    shards da las mismas variantes y mezclarlos equivale a deduplicar las
+    bases de todas las fuentes.
+    """
+    variantes: Set[str] = set()
+    for base in bases:
+        random.seed(f"{seed}:{base}")
+        max_var = 2000 if base in INTERNAL_BASES else 10
+        variantes.update(generar_variantes_desde_base(base, max_variantes=max_var))
+    return list(variantes), len(bases)
 
-    Todas las contraseñas generadas (variantes) deben cumplir las reglas.
-    NO se generan contraseñas completamente aleatorias.
 
-    Devuelve:
-      - variantes: contraseñas generadas por reglas (10 chars)
-      - originales10: palabras incluidas "tal cual" (10 chars válidos)
-      - hybrid_bases_all: conjunto de palabras <10 chars "tal cual"
-        para usar en el ataque híbrido (incluye externas e internas).
+def mapear_acotado(executor: Optional[ProcessPoolExecutor], func, tasks: Iterable[tuple], workers: int) -> Iterator:
+    """
+    Aplica ``func`` a cada tupla de argumentos de ``tasks`` en el pool y
+    genera los resultados en orden, con a lo sumo ``workers * 2`` tareas
+    en vuelo para que la memoria no crezca con el tamaño de la entrada.
+    Sin pool se ejecuta en este proceso.
+    """
+    if executor is None:
+        for args in tasks:
+            yield func(*args)
+        return
+    pending: deque = deque()
+    for args in tasks:
+        pending.append(executor.submit(func, *args))
+        if len(pending) >= max(1, workers) * 2:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def escribir_ordenado(path: Path, words: Iterable[str]) -> int:
     """
-    # bases internas (keywords y contraseñas comunes)
-    bases_internas = set(STUDENT_KEYWORDS) | set(COMMON_SPANISH_PASSWORDS)
+    Escribe ``words`` (ya ordenadas y sin repetir) en un temporal y lo
+    mueve sobre ``path`` al terminar, de modo que nunca queda un archivo
+    a medio escribir.  Devuelve cuántas se escribieron.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    count = write_run(tmp, words)
+    os.replace(tmp, path)
+    return count
 
-    # bases externas + originales de 10 chars válidas + palabras <10 para hybrid
-    bases_externas, originales10, hybrid_bases_raw = cargar_bases_externas()
 
-    # También queremos incluir las internas como posibles bases "tal cual"
-    # para hybrid, siempre que cumplan la longitud y filtro de hybrid.
-    for w in (STUDENT_KEYWORDS + COMMON_SPANISH_PASSWORDS):
-        if raw_viable_for_hybrid(w):
-            hybrid_bases_raw.add(w)
+# ==========================
+# Manifiesto de la construcción incremental
+# ==========================
 
-    # Todas las bases limpias para variaciones
-    bases = bases_internas | bases_externas
-    total_bases = len(bases)
-    print(f"[INFO] Generando variantes a partir de {total_bases} bases limpias...")
+def huella_archivo(path: Path, previous: Optional[dict] = None) -> dict:
+    """
+    Hash SHA-256 del contenido de ``path`` junto con su tamaño y fecha.
 
-    variantes: Set[str] = set()
+    Si el tamaño y la fecha coinciden con ``previous`` se reutiliza su
+    hash sin volver a leer el archivo; si no, se calcula.  Un archivo
+    tocado pero sin cambios conserva así el mismo hash y no se regenera.
+    """
+    stat = path.stat()
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        return previous
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return {"sha256": h.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def huella_internas() -> dict:
+    """Hash de las bases internas (keywords y contraseñas comunes)."""
+    data = "\n".join(sorted(INTERNAL_BASES)).encode("utf-8")
+    return {"sha256": hashlib.sha256(data).hexdigest()}
+
+
+def huella_salida(path: Path) -> Optional[dict]:
+    """Tamaño y fecha de un archivo generado, o ``None`` si no existe."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def binario_al_dia(path: Path) -> bool:
+    """Indica si el binario de ancho fijo de ``path`` existe y le corresponde."""
+    binary = open_binary_dictionary(path)
+    if binary is None:
+        return False
+    binary.close()
+    return True
+
+
+def escribir_binario(path: Path) -> None:
+    """Genera el binario de ancho fijo que usan los ataques de diccionario."""
+    count = build_binary_dictionary(path)
+    if count is not None:
+        print(f"[OK] Diccionario binario: {count} registros de 10 bytes")
 
-    for idx, base in enumerate(bases, start=1):
-        # Al menos 5 variaciones por base viable.
-        # Más variaciones para bases internas (palabras clave del contexto Ibero).
-        if base in bases_internas:
-            max_var = 2000
-        else:
-            max_var = 10
 
-        nuevas = generar_variantes_desde_base(base, max_variantes=max_var)
-        variantes.update(nuevas)
+def cargar_manifest(path: Path) -> dict:
+    """Manifiesto de la última construcción (vacío si no hay o no es válido)."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
 
-        # Progreso en "tiempo real" (cada cierto número de bases)
-        if idx % 500 == 0 or idx == total_bases:
-            print(
-                f"[INFO] Procesadas {idx}/{total_bases} bases; "
-                f"contraseñas acumuladas (variantes): {len(variantes)}"
-            )
 
-    print(f"[INFO] Variantes totales generadas: {len(variantes)}")
+def guardar_manifest(path: Path, manifest: dict) -> None:
+    """Guarda el manifiesto de forma atómica."""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
 
-    # hybrid_bases_all = todas las palabras <10 chars tal cual
-    hybrid_bases_all: Set[str] = set(hybrid_bases_raw)
 
-    print(f"[INFO] Total de bases 'tal cual' para hybrid (internas + externas): {len(hybrid_bases_all)}")
-    return variantes, originales10, hybrid_bases_all
+def rutas_shard(shard_dir: Path, nombre: str) -> Tuple[Path, Path]:
+    """Shards de una fuente: contraseñas de 10 chars y palabras para hybrid."""
+    return shard_dir / f"{nombre}.dictionary", shard_dir / f"{nombre}.hybrid"
 
 
 # ==========================
-# MAIN
+# Pipeline de generación
 # ==========================
 
-def main():
-    random.seed()  # se puede fijar semilla para reproducibilidad si se desea
+def generar_shard(
+    nombre: str,
+    path: Optional[Path],
+    args: argparse.Namespace,
+    executor: Optional[ProcessPoolExecutor],
+    seed: str,
+    shard_dir: Path,
+) -> None:
+    """
+    Genera los shards de una fuente (``path``, o las bases internas si es
+    ``None``) en streaming.
+
+    1) La fuente se lee por bloques en el pool de procesos
+       (`procesar_bloque`); bases, originales de 10 chars y palabras para
+       hybrid se acumulan en tres ordenaciones externas.
+    2) Las bases, ya ordenadas y sin repetir, se reparten por lotes entre
+       los procesos (`generar_bloque_variantes`) y sus variantes se añaden
+       a la ordenación del diccionario.
+    3) Ambos shards se escriben ordenados, en streaming, desde la mezcla
+       de las runs en disco.
+
+    La memoria de ``--memory-mb`` se reparte entre los tres búferes de
+    ordenación; lo demás en memoria son los bloques en vuelo.  Todas las
+    contraseñas del shard tienen 10 caracteres, así que su búfer va
+    empaquetado (`PackedPasswords`, 10 bytes por contraseña).
+    """
+    workers = max(1, args.workers)
+    memory = max(1, args.memory_mb) << 20
+    dictionary_shard, hybrid_shard = rutas_shard(shard_dir, nombre)
+
+    with tempfile.TemporaryDirectory(prefix="dictionary-", dir=args.tmp_dir) as tmp_dir, \
+            ExternalSorter(tmp_dir, memory // 3, "bases") as bases, \
+            ExternalSorter(tmp_dir, memory // 3, "hybrid") as hybrid, \
+            ExternalSorter(tmp_dir, memory // 3, "dictionary", packed=True) as dictionary:
+        if path is None:
+            print("[INFO] Cargando bases internas (keywords y contraseñas comunes)")
+            bases.extend(INTERNAL_BASES)
+            # También queremos incluir las internas como posibles bases "tal cual"
+            # para hybrid, siempre que cumplan la longitud y filtro de hybrid.
+            hybrid.extend(w for w in INTERNAL_BASES if raw_viable_for_hybrid(w))
+        else:
+            print(f"[INFO] Cargando wordlist externo: {path.name}")
+            count_lines = 0
+            originales10 = 0
+            last_report = time.perf_counter()
+            tasks = ((path, offset, size) for offset, size in iter_bloques(path, max(1, args.chunk_size)))
+            for chunk_bases, chunk_originales, chunk_hybrid, lines in mapear_acotado(executor, procesar_bloque, tasks, workers):
+                bases.extend(chunk_bases)
+                dictionary.extend(chunk_originales)
+                hybrid.extend(chunk_hybrid)
+                originales10 += len(chunk_originales)
+                count_lines += lines
+                now = time.perf_counter()
+                if now - last_report >= 1.0:
+                    last_report = now
+                    print(f"[INFO] Leídas {count_lines} líneas de {path.name}...")
 
-    print("[INFO] Iniciando generación de diccionario...")
-    variantes, originales10, hybrid_bases = generar_contraseñas_desde_bases()
+            print(f"[INFO] Total de líneas leídas de {path.name}: {count_lines}")
+            print(f"[INFO] Palabras de 10 caracteres válidas tal cual en {path.name}: {originales10}")
+
+        hybrid_count = escribir_ordenado(hybrid_shard, hybrid)
+        hybrid.close()
+
+        def lotes() -> Iterator[tuple]:
+            lote: List[str] = []
+            for base in bases:
+                lote.append(base)
+                if len(lote) >= BASES_POR_LOTE:
+                    yield lote, seed
+                    lote = []
+            if lote:
+                yield lote, seed
+
+        total_bases = 0
+        last_report = time.perf_counter()
+        for variantes, procesadas in mapear_acotado(executor, generar_bloque_variantes, lotes(), workers):
+            dictionary.extend(variantes)
+            total_bases += procesadas
+            now = time.perf_counter()
+            if now - last_report >= 1.0:
+                last_report = now
+                print(
+                    f"[INFO] Procesadas {total_bases} bases de {nombre}; "
+                    f"contraseñas acumuladas (antes de deduplicar): {dictionary.added}"
+                )
+
+        # Shard = originales válidos de 10 chars + todas las variantes generadas
+        total = escribir_ordenado(dictionary_shard, dictionary)
+
+    print(
+        f"[OK] Shard {nombre}: {total_bases} bases limpias, {total} contraseñas, "
+        f"{hybrid_count} palabras para hybrid"
+    )
+
+
+def generar_diccionario(args: argparse.Namespace) -> None:
+    """
+    Genera ``dictionary.txt`` e ``hybrid_bases.txt`` de forma incremental.
+
+    Cada fuente (y las bases internas) tiene sus propios shards ordenados
+    en ``--cache-dir``.  El manifiesto guarda el hash de contenido de cada
+    fuente y los parámetros de generación (versión y semilla): solo se
+    regeneran los shards de las fuentes que cambiaron y, si alguno cambió,
+    los archivos finales se vuelven a mezclar desde todos los shards.  Si
+    cambian los parámetros, o con ``--full``, se regenera todo.
+    """
+    workers = max(1, args.workers)
+    shard_dir = Path(args.cache_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = shard_dir / MANIFEST_NAME
+
+    manifest = {} if args.full else cargar_manifest(manifest_path)
+    seed = args.seed if args.seed is not None else manifest.get("params", {}).get("seed")
+    if seed is None:
+        # Sin semilla se elige una y se guarda: las siguientes ejecuciones
+        # incrementales deben generar con la misma
+        seed = random.randrange(1 << 32)
+    params = {"generator": GENERATOR_VERSION, "seed": seed}
+    if manifest.get("params") != params:
+        if manifest:
+            print("[INFO] Cambiaron los parámetros de generación: se regeneran todos los shards")
+        manifest = {"version": MANIFEST_VERSION, "params": params, "sources": {}, "outputs": {}}
+    sources = manifest["sources"]
+
+    entradas = [(INTERNAL_SOURCE, None)] + [(path.name, path) for path in fuentes_externas()]
+    changed = False
+
+    def invalidar_salidas() -> None:
+        # Los archivos finales ya no corresponden a los shards: si la
+        # ejecución se interrumpe antes de mezclar, la siguiente ejecución
+        # vuelve a mezclar
+        nonlocal changed
+        changed = True
+        manifest["outputs"] = {}
+
+    # Fuentes que ya no forman parte de la construcción
+    for nombre in [n for n in sources if n not in dict(entradas)]:
+        del sources[nombre]
+        for shard in rutas_shard(shard_dir, nombre):
+            shard.unlink(missing_ok=True)
+        invalidar_salidas()
+
+    executor = None
+    try:
+        for nombre, path in entradas:
+            if path is not None and not path.exists():
+                print(f"[WARN] Wordlist externo no encontrado: {path}")
+                if sources.pop(nombre, None) is not None:
+                    for shard in rutas_shard(shard_dir, nombre):
+                        shard.unlink(missing_ok=True)
+                    invalidar_salidas()
+                continue
+
+            previous = sources.get(nombre)
+            huella = huella_internas() if path is None else huella_archivo(path, previous)
+            shards_ok = all(shard.exists() for shard in rutas_shard(shard_dir, nombre))
+            if previous and previous.get("sha256") == huella["sha256"] and shards_ok:
+                sources[nombre] = huella
+                print(f"[INFO] Sin cambios: {nombre}")
+                continue
+
+            if executor is None and workers > 1:
+                # "spawn" para no heredar estado, igual que el resto de pools del simulador
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            generar_shard(nombre, path, args, executor, str(seed), shard_dir)
+            sources[nombre] = huella
+            invalidar_salidas()
+            # Tras cada shard, para no repetirlo si la ejecución se interrumpe
+            guardar_manifest(manifest_path, manifest)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    outputs = manifest["outputs"]
+    al_dia = all(
+        outputs.get(path.name) is not None and outputs.get(path.name) == huella_salida(path)
+        for path in (OUTPUT_FILE, HYBRID_BASES_FILE)
+    )
+    if not changed and al_dia:
+        guardar_manifest(manifest_path, manifest)
+        print(f"[OK] {OUTPUT_FILE.name} e {HYBRID_BASES_FILE.name} ya están al día")
+        if not binario_al_dia(OUTPUT_FILE):
+            escribir_binario(OUTPUT_FILE)
+        return
+
+    shards = [rutas_shard(shard_dir, nombre) for nombre in sources]
+    print(f"[INFO] Mezclando {len(shards)} shards...")
+
+    # Diccionario final = mezcla ordenada y sin repetidos de todos los shards
+    total = escribir_ordenado(OUTPUT_FILE, unique_merge(*(read_run(d) for d, _ in shards)))
+    print(f"[OK] Diccionario (10 chars) generado en: {OUTPUT_FILE.resolve()}")
+    print(f"[OK] Total de contraseñas escritas: {total}")
 
-    # Diccionario final = originales válidos de 10 chars + todas las variantes generadas
-    dict_final: Set[str] = set(originales10)
-    dict_final.update(variantes)
+    # Índice con el total y los desplazamientos para el ataque de diccionario
+    index = build_index(OUTPUT_FILE)
+    if index is not None:
+        print(f"[OK] Índice del diccionario: {index.count} entradas válidas")
+    # Registros de ancho fijo que los ataques recorren con mmap
+    escribir_binario(OUTPUT_FILE)
 
-    print(f"[INFO] Total de contraseñas antes de deduplicar: {len(originales10) + len(variantes)}")
-    print(f"[INFO] Total de contraseñas únicas en el diccionario final: {len(dict_final)}")
+    # Guardar bases para ataque híbrido (palabras <10 chars tal cual)
+    hybrid_count = escribir_ordenado(HYBRID_BASES_FILE, unique_merge(*(read_run(h) for _, h in shards)))
+    print(f"[OK] Bases para ataque híbrido generadas en: {HYBRID_BASES_FILE.resolve()}")
+    print(f"[OK] Total de palabras base para hybrid: {hybrid_count}")
 
-    # Guardar contraseñas finales (10 chars, cumpliendo reglas)
-    with OUTPUT_FILE.open("w", encoding="utf-8") as f:
-        for pwd in sorted(dict_final):
-            f.write(pwd + "\n")
+    for path in (OUTPUT_FILE, HYBRID_BASES_FILE):
+        outputs[path.name] = huella_salida(path)
+    guardar_manifest(manifest_path, manifest)
 
-    print(f"[OK] Diccionario (10 chars) generado en: {OUTPUT_FILE.resolve()}")
-    print(f"[OK] Total de contraseñas escritas: {len(dict_final)}")
 
-    # Guardar bases para ataque híbrido (palabras <10 chars tal cual)
-    with HYBRID_BASES_FILE.open("w", encoding="utf-8") as f:
-        for w in sorted(hybrid_bases):
-            f.write(w + "\n")
+# ==========================
+# MAIN
+# ==========================
 
-    print(f"[OK] Bases para ataque híbrido generadas en: {HYBRID_BASES_FILE.resolve()}")
-    print(f"[OK] Total de palabras base para hybrid: {len(hybrid_bases)}")
+def main():
+    parser = argparse.ArgumentParser(description="Genera dictionary.txt e hybrid_bases.txt en streaming.")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="procesos de generación")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_MB,
+                        help="memoria máxima (MB) de los búferes de ordenación; el resto va a disco")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="bytes de cada fuente por bloque de lectura")
+    parser.add_argument("--tmp-dir", default=None, help="directorio de los archivos temporales de ordenación")
+    parser.add_argument("--cache-dir", default=str(SHARDS_DIR),
+                        help="directorio de los shards por fuente y del manifiesto")
+    parser.add_argument("--full", action="store_true",
+                        help="ignora el manifiesto y regenera todos los shards")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semilla de las variantes (por defecto, la de la construcción anterior)")
+    args = parser.parse_args()
+
+    print("[INFO] Iniciando generación de diccionario...")
+    generar_diccionario(args)
 
 
 if __name__ == "__main__":
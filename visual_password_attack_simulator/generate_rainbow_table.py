@@ -9,14 +9,61 @@ la pareja hash:contraseña en un archivo de salida.
 Formato de salida (texto plano):
     <hash_hex>:<password>
 
+La lectura es por bloques, el hashing se reparte entre varios procesos y
+tras cada bloque escrito se guarda ``rainbow_table.checkpoint``; si la
+generación se interrumpe, la siguiente ejecución continúa desde ese punto
+(``--restart`` empieza de cero).  Se informa del rendimiento en líneas/s y
+MB/s.
+
+Además se genera ``rainbow_table.bin``, la misma tabla en formato binario
+(hashes ordenados, offsets de ancho fijo y bloque de contraseñas; ver
+``utils/rainbow_format.py``) con solo las contraseñas que cumplen la
+política.  Se ordena por hash con una ordenación externa en disco, así
+que la memoria no crece con el tamaño de la tabla.  `RainbowTableAttack`
+la abre con mmap y la consulta sin cargarla entera.
+
+Con ``--chains`` se generan en su lugar tablas arcoíris reales (cadenas de
+Hellman/Oechslin, ver ``utils/rainbow_chains.py``) sobre el espacio de la
+política o de una máscara, en paralelo entre varios procesos, y se
+informa de la cobertura y del tiempo medio de consulta:
+
+    python generate_rainbow_table.py --chains --mask "Abcdef?l?d?d?s" \
+        --chain-length 100 --tables 3 --chains-per-table 800 --verify 200
+
 Uso educativo para el proyecto en IberoCDMX:
 - No está pensado para ataques reales a sistemas de terceros.
 - Solo se recomienda usarlo con contraseñas de prueba (de laboratorio).
 """
 
+import argparse
 import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+if __package__:
+    from .utils.keyspace import Keyspace, parse_mask
+    from .utils.parallel_search import default_workers
+    from .utils.password_requirements import ALLOWED_CHARACTERS, PASSWORD_LENGTH, meets_password_requirements
+    from .utils import rainbow_chains
+    from .utils.rainbow_format import write_rainbow_table
+else:  # Ejecutado como script: python generate_rainbow_table.py
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from visual_password_attack_simulator.utils.keyspace import Keyspace, parse_mask
+    from visual_password_attack_simulator.utils.parallel_search import default_workers
+    from visual_password_attack_simulator.utils.password_requirements import (
+        ALLOWED_CHARACTERS,
+        PASSWORD_LENGTH,
+        meets_password_requirements,
+    )
+    from visual_password_attack_simulator.utils import rainbow_chains
+    from visual_password_attack_simulator.utils.rainbow_format import write_rainbow_table
+
 # ==========================
 # Parámetros de configuración
 # ==========================
@@ -24,6 +71,12 @@ from pathlib import Path
 HERE = Path(__file__).resolve().parent
 INPUT_DICTIONARY = HERE / "dictionary.txt"      # debe existir
 OUTPUT_RAINBOW = HERE / "rainbow_table.txt"     # se creará / sobrescribirá
+OUTPUT_RAINBOW_BIN = HERE / "rainbow_table.bin" # versión binaria (mmap)
+OUTPUT_CHAINS = HERE / "rainbow_chains.bin"     # tablas de cadenas (--chains)
+CHECKPOINT = HERE / "rainbow_table.checkpoint"  # progreso para reanudar
+
+CHUNK_SIZE = 4 << 20          # bytes del diccionario por bloque de hashing
+WRITE_BUFFER = 1 << 20        # búfer de escritura de la tabla en texto
 
 
 def sha256_hex(text: str) -> str:
@@ -35,30 +88,242 @@ def sha256_hex(text: str) -> str:
     return h.hexdigest()
 
 
-def main():
-    if not INPUT_DICTIONARY.exists():
-        print(f"[ERROR] No se encontró el diccionario: {INPUT_DICTIONARY}")
+def hash_chunk(path, offset, size):
+    """
+    Hashea el bloque ``[offset, offset + size)`` del diccionario.
+
+    Cada proceso del pool lee su bloque directamente del archivo, de modo
+    que solo viaja entre procesos el resultado.  Devuelve el texto ya
+    formateado ``<hash_hex>:<password>``, las líneas leídas y las entradas
+    escritas.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        lines = f.read(size).splitlines()
+    out = []
+    for raw in lines:
+        pwd = raw.decode("utf-8", errors="ignore").strip()
+        if not pwd:
+            continue
+        out.append(f"{sha256_hex(pwd)}:{pwd}\n")
+    return "".join(out).encode("utf-8"), len(lines), len(out)
+
+
+def iter_chunks(fin, offset, chunk_bytes):
+    """
+    Divide el diccionario en bloques de unos ``chunk_bytes`` que terminan
+    en fin de línea.  Genera ``(desplazamiento, tamaño)``.
+    """
+    total = os.fstat(fin.fileno()).st_size
+    while offset < total:
+        fin.seek(min(offset + chunk_bytes, total))
+        fin.readline()
+        end = min(fin.tell(), total)
+        yield offset, end - offset
+        offset = end
+
+
+def load_checkpoint(source):
+    """
+    Devuelve el checkpoint guardado si corresponde al mismo diccionario
+    (ruta, tamaño y fecha de modificación) y a la salida actual.
+    """
+    try:
+        state = json.loads(CHECKPOINT.read_text(encoding="utf-8"))
+        stat = source.stat()
+        if (state["input"] == str(source.resolve()) and state["input_size"] == stat.st_size
+                and state["input_mtime"] == stat.st_mtime
+                and OUTPUT_RAINBOW.stat().st_size >= state["output_size"]):
+            return state
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def save_checkpoint(state):
+    """Guarda el checkpoint de forma atómica (temporal + renombrado)."""
+    tmp_path = CHECKPOINT.with_name(CHECKPOINT.name + ".tmp")
+    tmp_path.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp_path, CHECKPOINT)
+
+
+def build_text_table(args):
+    """
+    Escribe ``rainbow_table.txt`` en streaming: lectura por bloques, hashing
+    en un pool de procesos, escritura ordenada con búfer y checkpoint tras
+    cada bloque para reanudar una generación interrumpida.
+
+    Devuelve el número total de entradas o ``None`` si no hay diccionario.
+    """
+    source = INPUT_DICTIONARY
+    if not source.exists():
+        print(f"[ERROR] No se encontró el diccionario: {source}")
         print("        Ejecuta primero generate_dictionary.py o ajusta la ruta.")
+        return None
+
+    print(f"[INFO] Leyendo diccionario desde: {source.resolve()}")
+    stat = source.stat()
+    state = None if args.restart else load_checkpoint(source)
+    if state is None:
+        state = {
+            "input": str(source.resolve()),
+            "input_size": stat.st_size,
+            "input_mtime": stat.st_mtime,
+            "offset": 0,
+            "output_size": 0,
+            "lines": 0,
+            "entries": 0,
+        }
+    else:
+        print(f"[INFO] Reanudando desde la línea {state['lines']} ({state['offset']:,} bytes leídos)")
+
+    start = time.perf_counter()
+    resumed_offset = state["offset"]
+    resumed_lines = state["lines"]
+    last_report = 0.0
+    mode = "r+b" if state["output_size"] else "wb"
+    with source.open("rb") as fin, OUTPUT_RAINBOW.open(mode, buffering=WRITE_BUFFER) as fout:
+        # Se descarta lo escrito después del último checkpoint
+        fout.truncate(state["output_size"])
+        fout.seek(state["output_size"])
+        chunks = iter_chunks(fin, state["offset"], max(1, args.chunk_size))
+        executor = None
+        if args.workers > 1:
+            # "spawn" para no heredar estado, igual que el resto de pools del simulador
+            executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            # Resultados en vuelo, en el orden de lectura, para escribir ordenado
+            pending = deque()
+            while True:
+                while len(pending) < max(1, args.workers) * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    if executor is None:
+                        pending.append((hash_chunk(source, *chunk), chunk[1]))
+                    else:
+                        pending.append((executor.submit(hash_chunk, source, *chunk), chunk[1]))
+                if not pending:
+                    break
+                result, size = pending.popleft()
+                data, line_count, entries = result if executor is None else result.result()
+                fout.write(data)
+                fout.flush()
+                state["offset"] += size
+                state["lines"] += line_count
+                state["entries"] += entries
+                state["output_size"] += len(data)
+                save_checkpoint(state)
+                now = time.perf_counter()
+                if now - last_report >= 1.0 or not pending:
+                    last_report = now
+                    elapsed = max(now - start, 1e-9)
+                    lines_rate = (state["lines"] - resumed_lines) / elapsed
+                    mb_rate = (state["offset"] - resumed_offset) / elapsed / 1e6
+                    print(f"[INFO] Procesadas {state['lines']} líneas: {lines_rate:,.0f} líneas/s, {mb_rate:.2f} MB/s")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    CHECKPOINT.unlink(missing_ok=True)
+    print(f"[OK] Rainbow table generada en: {OUTPUT_RAINBOW.resolve()}")
+    print(f"[OK] Total de entradas: {state['entries']}")
+    return state["entries"]
+
+
+def generate_lookup_table(args):
+    if build_text_table(args) is None:
         return
+    # La tabla binaria se construye desde el texto ya completo, de modo que
+    # una generación reanudada también incluye los bloques anteriores
+    def entries():
+        with OUTPUT_RAINBOW.open("r", encoding="utf-8") as f:
+            for line in f:
+                h, sep, pwd = line.rstrip("\n").partition(":")
+                if sep and meets_password_requirements(pwd):
+                    yield bytes.fromhex(h), pwd
 
-    print(f"[INFO] Leyendo diccionario desde: {INPUT_DICTIONARY.resolve()}")
+    written = write_rainbow_table(OUTPUT_RAINBOW_BIN, entries())
+    print(f"[OK] Tabla binaria generada en: {OUTPUT_RAINBOW_BIN.resolve()} ({written} entradas)")
 
-    count = 0
-    with INPUT_DICTIONARY.open("r", encoding="utf-8") as fin, \
-            OUTPUT_RAINBOW.open("w", encoding="utf-8") as fout:
 
-        for line in fin:
-            pwd = line.strip()
-            if not pwd:
-                continue
-            h = sha256_hex(pwd)
-            fout.write(f"{h}:{pwd}\n")
-            count += 1
-            if count % 500 == 0:
-                print(f"[INFO] Procesadas {count} contraseñas...")
+def generate_chain_table(args):
+    """
+    Genera tablas arcoíris de cadenas e informa de memoria, cobertura y
+    tiempo de consulta.
+    """
+    if args.mask:
+        keyspace = Keyspace(parse_mask(args.mask))
+    else:
+        keyspace = Keyspace.brute_force(ALLOWED_CHARACTERS, PASSWORD_LENGTH)
+    try:
+        space = rainbow_chains.ChainSpace(keyspace)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return
+    print(f"[INFO] Candidatos válidos en el espacio: {space.total:,}")
+    print(f"[INFO] {args.tables} tablas x {args.chains_per_table} cadenas de longitud {args.chain_length}"
+          f" con {args.workers} procesos")
 
-    print(f"[OK] Rainbow table generada en: {OUTPUT_RAINBOW.resolve()}")
-    print(f"[OK] Total de entradas: {count}")
+    def report(done, expected):
+        if done == expected or done % 2000 == 0:
+            print(f"[INFO] Cadenas calculadas: {done}/{expected}")
+
+    start = time.perf_counter()
+    tables = rainbow_chains.generate_tables(
+        keyspace,
+        chain_length=args.chain_length,
+        table_count=args.tables,
+        chains_per_table=args.chains_per_table,
+        workers=args.workers,
+        seed=args.seed,
+        on_progress=report,
+    )
+    elapsed = time.perf_counter() - start
+    rainbow_chains.write_chain_tables(args.output, keyspace, args.chain_length, tables)
+    steps = args.tables * args.chains_per_table * args.chain_length
+    print(f"[OK] Tablas de cadenas generadas en: {Path(args.output).resolve()}")
+    print(f"[OK] Tiempo: {elapsed:.1f}s ({steps / elapsed:,.0f} hashes/s)")
+
+    with rainbow_chains.RainbowChainTable(args.output) as table:
+        coverage = table.coverage()
+        size = Path(args.output).stat().st_size
+        # Una tabla de consulta directa guarda hash (32 bytes) + contraseña por entrada
+        lookup_size = int(coverage * space.total) * (32 + PASSWORD_LENGTH)
+        print(f"[OK] Cadenas distintas: {table.chain_count} ({size:,} bytes)")
+        print(f"[OK] Cobertura teórica: {coverage:.2%}"
+              f" (una tabla de consulta directa equivalente ocuparía ~{lookup_size:,} bytes)")
+        if args.verify:
+            found, seconds = table.measure(args.verify, seed=args.seed + 1)
+            print(f"[OK] Cobertura medida con {args.verify} contraseñas: {found:.2%}"
+                  f"; consulta media: {seconds * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera la tabla arcoíris del simulador.")
+    parser.add_argument("--chains", action="store_true",
+                        help="genera tablas de cadenas en lugar de la tabla de consulta directa")
+    parser.add_argument("--mask", help="máscara del espacio de las cadenas (por defecto, la política completa)")
+    parser.add_argument("--chain-length", type=int, default=rainbow_chains.CHAIN_LENGTH,
+                        help="longitud de cada cadena")
+    parser.add_argument("--tables", type=int, default=rainbow_chains.TABLE_COUNT,
+                        help="número de tablas (funciones de reducción distintas)")
+    parser.add_argument("--chains-per-table", type=int, default=rainbow_chains.CHAINS_PER_TABLE,
+                        help="cadenas iniciales por tabla")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="procesos de generación")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="bytes del diccionario por bloque de hashing")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignora el checkpoint y genera la tabla desde el principio")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de los inicios de cadena")
+    parser.add_argument("--verify", type=int, default=0,
+                        help="contraseñas al azar con las que medir la cobertura real")
+    parser.add_argument("--output", default=str(OUTPUT_CHAINS), help="archivo de salida de las cadenas")
+    args = parser.parse_args()
+    if args.chains:
+        generate_chain_table(args)
+    else:
+        generate_lookup_table(args)
 
 
 if __name__ == "__main__":
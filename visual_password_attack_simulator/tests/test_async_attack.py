@@ -0,0 +1,129 @@
+"""Ataques desde asyncio (`attacks.async_attack`)."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from visual_password_attack_simulator.attacks.async_attack import (
+    AsyncAttack,
+    FoundEvent,
+    ProgressEvent,
+)
+from visual_password_attack_simulator.attacks.mask_attack import MaskAttack
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+# 36400 candidatos, todos válidos (ver test_keyspace_attacks.py)
+MASK = "Abcdef?l?d?s?d"
+PASSWORDS = ["Abcdefb1#2", "Abcdefy7%5"]
+# Espacio enorme para que el ataque siga en marcha hasta cancelarlo
+LONG_MASK = "?u?l?l?l?l?l?d?d?d?s"
+MISSING = sha256_hash("no-esta-en-el-espacio")
+# Límite de cada prueba, para que un ataque que no se detiene la haga fallar
+TIMEOUT = 30
+
+
+def _run_sync(attack):
+    found, progress = [], []
+    attack.found.connect(lambda password, attempts, elapsed: found.append((password, attempts)))
+    attack.progress.connect(lambda attempts, total, elapsed: progress.append(attempts))
+    attack.run()
+    return found, progress[-1]
+
+
+async def _first_progress(run):
+    async for event in run:
+        if isinstance(event, ProgressEvent):
+            return event
+    raise AssertionError("el ataque terminó sin publicar progreso")
+
+
+def test_events_end_with_the_result():
+    """Los eventos llegan en orden, la iteración termina y el resultado
+    recoge lo mismo que anunciaron."""
+
+    async def main():
+        run = AsyncAttack(MaskAttack, [sha256_hash(p) for p in PASSWORDS], mask=MASK)
+        events = [event async for event in run]
+        return events, await run
+
+    events, result = asyncio.run(asyncio.wait_for(main(), TIMEOUT))
+    progress = [event for event in events if isinstance(event, ProgressEvent)]
+    assert progress and progress[-1].attempts == result.attempts
+    assert [e.attempts for e in progress] == sorted(e.attempts for e in progress)
+    assert [event for event in events if isinstance(event, FoundEvent)] == result.found
+    assert not result.cancelled
+
+
+def test_result_matches_run():
+    """El resultado esperado coincide con ``run()`` en el mismo hilo."""
+    targets = [sha256_hash(p) for p in PASSWORDS]
+    found, attempts = _run_sync(MaskAttack(targets, mask=MASK))
+
+    async def main():
+        return await AsyncAttack(MaskAttack, targets, mask=MASK)
+
+    result = asyncio.run(asyncio.wait_for(main(), TIMEOUT))
+    assert [(event.password, event.attempts) for event in result.found] == found
+    assert result.attempts == attempts
+    assert not result.cancelled
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_cancel_stops_the_worker(executor_cls):
+    """`cancel` detiene el ataque y deja libre el trabajador del ejecutor."""
+
+    async def main(executor):
+        run = AsyncAttack(MaskAttack, MISSING, mask=LONG_MASK, executor=executor)
+        await _first_progress(run)
+        run.cancel()
+        result = await run
+        # Con un único trabajador, solo responde si el ataque lo soltó
+        assert await asyncio.wrap_future(executor.submit(sum, [1, 2])) == 3
+        return result
+
+    with executor_cls(max_workers=1) as executor:
+        result = asyncio.run(asyncio.wait_for(main(executor), TIMEOUT))
+    assert result.cancelled and result.found == []
+    assert 0 < result.attempts < 10 ** 9
+
+
+def test_cancelling_the_awaiting_task_stops_the_attack():
+    """Cancelar la tarea que espera el resultado también detiene el ataque."""
+
+    async def main(executor):
+        run = AsyncAttack(MaskAttack, MISSING, mask=LONG_MASK, executor=executor)
+        await _first_progress(run)
+        task = asyncio.ensure_future(run.result())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await run
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = asyncio.run(asyncio.wait_for(main(executor), TIMEOUT))
+    assert result.cancelled
+
+
+def test_attacks_run_concurrently():
+    """Varios ataques avanzan a la vez desde el mismo bucle."""
+
+    async def main(executor):
+        long_runs = [AsyncAttack(MaskAttack, MISSING, mask=LONG_MASK, executor=executor) for _ in range(2)]
+        # Ambos publican progreso antes de que ninguno termine
+        await asyncio.gather(*map(_first_progress, long_runs))
+        assert not any(run.done() for run in long_runs)
+        short_runs = [
+            AsyncAttack(MaskAttack, sha256_hash(password), mask=MASK, executor=executor)
+            for password in PASSWORDS
+        ]
+        short = await asyncio.gather(*short_runs)
+        for run in long_runs:
+            run.cancel()
+        return short, await asyncio.gather(*long_runs)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        short, long = asyncio.run(asyncio.wait_for(main(executor), TIMEOUT))
+    assert [[event.password for event in result.found] for result in short] == [[p] for p in PASSWORDS]
+    assert all(result.cancelled for result in long)
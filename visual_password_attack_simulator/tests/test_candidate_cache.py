@@ -0,0 +1,60 @@
+"""Caché de candidatos compartida (``utils/candidate_cache.py``)."""
+
+import threading
+import time
+
+from visual_password_attack_simulator.utils import candidate_cache
+from visual_password_attack_simulator.utils.candidate_cache import CandidateCache
+
+PASSWORDS = ["Abcdefgh1#", "Zyxwvuts9$", "Qwertyui2*"]
+
+
+def _contador(monkeypatch, name):
+    """Envuelve un cargador del módulo para contar sus lecturas."""
+    calls = []
+    loader = getattr(candidate_cache, name)
+
+    def counted(path, limit):
+        calls.append(path)
+        time.sleep(0.05)  # Ventana para que otros hilos pidan lo mismo
+        return loader(path, limit)
+
+    monkeypatch.setattr(candidate_cache, name, counted)
+    return calls
+
+
+def test_entradas_validas(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    path.write_text("\n".join(PASSWORDS + ["corta"]) + "\n", encoding="utf-8")
+    cache = CandidateCache()
+    assert cache.valid_candidates(path) == [p.encode() for p in PASSWORDS]
+    assert cache.base_words(path) == PASSWORDS + ["corta"]
+
+
+def test_archivo_demasiado_grande_se_lee_una_vez(tmp_path, monkeypatch):
+    path = tmp_path / "dictionary.txt"
+    path.write_text("\n".join(PASSWORDS) + "\n", encoding="utf-8")
+    calls = _contador(monkeypatch, "_load_valid")
+    cache = CandidateCache(max_bytes=10)
+    assert cache.valid_candidates(path) is None
+    assert cache.valid_candidates(path) is None
+    assert len(calls) == 1
+    # Otro límite u otra versión del archivo sí se vuelven a leer
+    cache.max_bytes = 1 << 20
+    assert cache.valid_candidates(path) is not None
+    assert len(calls) == 2
+
+
+def test_lecturas_concurrentes_comparten_la_carga(tmp_path, monkeypatch):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(PASSWORDS) + "\n", encoding="utf-8")
+    calls = _contador(monkeypatch, "_load_words")
+    cache = CandidateCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.base_words(path))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [PASSWORDS] * 8
@@ -0,0 +1,77 @@
+"""Puntos de control: cancelar un ataque y reanudarlo donde se detuvo."""
+
+from visual_password_attack_simulator.attacks import dictionary_attack
+from visual_password_attack_simulator.attacks.dictionary_attack import DictionaryAttack
+from visual_password_attack_simulator.attacks.mask_attack import MaskAttack
+from visual_password_attack_simulator.utils.checkpoint import Checkpoint, discard_checkpoint
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+# 36400 candidatos, todos válidos: mayúscula, minúsculas, dígito y especial
+MASK = "Abcdef?l?d?s?d"
+PASSWORDS = ["Abcdefb1#2", "Abcdefy7%5"]
+
+
+def _run(attack):
+    found = []
+    attack.found.connect(lambda password, attempts, elapsed: found.append((password, attempts)))
+    attack.run()
+    return found
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Se guarda y se lee igual; uno dañado o de otra versión se ignora."""
+    path = tmp_path / "MaskAttack.json"
+    checkpoint = Checkpoint("MaskAttack", {"mask": MASK, "workers": 1}, ["a", "b"], ["b"], 120, 80, 1.5)
+    checkpoint.save(path)
+    loaded = Checkpoint.load(path)
+    assert loaded == checkpoint
+    assert loaded.matches("MaskAttack", {"mask": MASK, "workers": 1}, ["a", "b"])
+    assert not loaded.matches("MaskAttack", {"mask": MASK, "workers": 2}, ["a", "b"])
+    assert not loaded.matches("BruteForceAttack", {"mask": MASK, "workers": 1}, ["a", "b"])
+    assert not loaded.matches("MaskAttack", {"mask": MASK, "workers": 1}, ["b", "a"])
+
+    path.write_text(path.read_text().replace('"version": 1', '"version": 99'))
+    assert Checkpoint.load(path) is None
+    path.write_text("{")
+    assert Checkpoint.load(path) is None
+    discard_checkpoint(path)
+    assert not path.exists() and Checkpoint.load(path) is None
+
+
+def test_cancelar_y_reanudar_desde_el_punto_de_control(tmp_path):
+    targets = [sha256_hash(p) for p in PASSWORDS]
+    first = MaskAttack(targets, mask=MASK)
+    first.checkpoint_path = tmp_path / "MaskAttack.json"
+    first.found.connect(lambda *args: first.stop())
+    assert [p for p, _ in _run(first)] == PASSWORDS[:1]
+    checkpoint = Checkpoint.load(first.checkpoint_path)
+    assert checkpoint is not None and checkpoint.pending_hashes == targets[1:]
+
+    resumed = MaskAttack(targets, mask=MASK, start_index=checkpoint.position)
+    resumed.resume_from(checkpoint)
+    resumed.checkpoint_path = first.checkpoint_path
+    reference = _run(MaskAttack(targets, mask=MASK))
+    assert _run(resumed) == reference[1:]
+    # Al terminar se borra
+    assert not first.checkpoint_path.exists()
+
+
+def test_dictionary_attack_resumes_from_its_entry(tmp_path, monkeypatch):
+    """El diccionario continúa desde la entrada válida guardada."""
+    # La cancelación se atiende entre lotes
+    monkeypatch.setattr(dictionary_attack, "HASH_BATCH_SIZE", 2)
+    words = [f"Abcdefg{i}#{i}" for i in range(10)]
+    dictionary = tmp_path / "dictionary.txt"
+    dictionary.write_text("\n".join(words[:4] + ["no vale"] + words[4:]) + "\n", encoding="utf-8")
+    targets = [sha256_hash(words[3]), sha256_hash(words[8])]
+    first = DictionaryAttack(targets, str(dictionary))
+    first.checkpoint_path = tmp_path / "DictionaryAttack.json"
+    first.found.connect(lambda *args: first.stop())
+    assert _run(first) == [(words[3], 4)]
+    checkpoint = Checkpoint.load(first.checkpoint_path)
+    assert checkpoint.position == 4 and checkpoint.attempts == 4
+    assert checkpoint.matches("DictionaryAttack", first.checkpoint_params(), targets)
+
+    resumed = DictionaryAttack(targets, str(dictionary), start_entry=checkpoint.position)
+    resumed.resume_from(checkpoint)
+    assert _run(resumed) == [(words[8], 9)]
@@ -0,0 +1,87 @@
+"""Diccionarios personalizados a partir de palabras clave (`utils.custom_generators`)."""
+
+import pytest
+
+from visual_password_attack_simulator.utils import custom_generators
+from visual_password_attack_simulator.utils.custom_generators import (
+    generate_custom_dictionary,
+    generate_custom_files,
+)
+from visual_password_attack_simulator.utils.dictionary_format import open_binary_dictionary
+from visual_password_attack_simulator.utils.dictionary_index import DictionaryIndex
+from visual_password_attack_simulator.utils.hybrid_space import HybridSpace
+from visual_password_attack_simulator.utils.password_requirements import meets_password_requirements
+
+KEYWORDS = ["barcelona", "messi", "Futbol!", "rock", "ab"]
+
+
+@pytest.fixture
+def custom_paths(tmp_path, monkeypatch):
+    dictionary = tmp_path / "custom_dictionary.txt"
+    bases = tmp_path / "custom_hybrid_bases.txt"
+    monkeypatch.setattr(custom_generators, "CUSTOM_DICTIONARY_PATH", dictionary)
+    monkeypatch.setattr(custom_generators, "CUSTOM_HYBRID_BASES_PATH", bases)
+    return dictionary, bases
+
+
+@pytest.mark.parametrize("target_size", [1, 100, 5000])
+def test_dictionary_is_valid_distinct_and_sized(target_size):
+    """Todas las contraseñas cumplen la política, salen de los espacios de
+    las palabras y se alcanza ``target_size`` sin pasarse de la cuota."""
+    progress = []
+    passwords = generate_custom_dictionary(
+        KEYWORDS, target_size, on_progress=lambda *args: progress.append(args)
+    )
+    available = set().union(*(HybridSpace(word) for word in ["barcelona", "messi", "futbol", "rock"]))
+    assert passwords <= available
+    assert all(map(meets_password_requirements, passwords))
+    assert target_size <= len(passwords) < target_size + len(KEYWORDS)
+    assert progress[-1] == (target_size, target_size)
+    assert generate_custom_dictionary(KEYWORDS, target_size) == passwords
+    seeded = generate_custom_dictionary(KEYWORDS, target_size, seed=3)
+    assert seeded == generate_custom_dictionary(KEYWORDS, target_size, seed=3)
+
+
+def test_small_words_give_their_share_to_the_rest():
+    """Una palabra con pocas variantes cede su cuota a las demás."""
+    few = HybridSpace("rock").count
+    passwords = generate_custom_dictionary(["rock", "barcelona"], 2 * few + 100)
+    assert len(passwords) >= 2 * few + 100
+    assert set(HybridSpace("rock")) <= passwords
+
+
+def test_dictionary_rejects_empty_keywords():
+    with pytest.raises(ValueError):
+        generate_custom_dictionary(["", "  "])
+    with pytest.raises(ValueError):
+        generate_custom_files(["", "!!"])
+
+
+def test_files_are_written_with_index_and_binary(custom_paths):
+    """Se escriben el diccionario ordenado, las bases, el índice y el binario."""
+    dictionary, bases = custom_paths
+    assert generate_custom_files(KEYWORDS, 300) == (dictionary, bases)
+    words = dictionary.read_text(encoding="utf-8").splitlines()
+    assert words == sorted(set(words)) and len(words) >= 300
+    assert bases.read_text(encoding="utf-8").splitlines() == ["ab", "barcelon", "futbol", "messi", "rock"]
+    assert DictionaryIndex.load(dictionary).count == len(words)
+    with open_binary_dictionary(dictionary) as binary:
+        assert list(binary.words()) == words
+
+
+@pytest.mark.parametrize("stop_after", [0, 2])
+def test_cancelled_generation_keeps_previous_files(custom_paths, stop_after):
+    """Si ``should_stop`` devuelve ``True`` no se escribe nada."""
+    dictionary, bases = custom_paths
+    dictionary.write_text("anterior\n", encoding="utf-8")
+    bases.write_text("anterior\n", encoding="utf-8")
+    calls = []
+
+    def should_stop():
+        calls.append(None)
+        return len(calls) > stop_after
+
+    assert generate_custom_files(KEYWORDS, 300, should_stop=should_stop) is None
+    assert dictionary.read_text(encoding="utf-8") == "anterior\n"
+    assert bases.read_text(encoding="utf-8") == "anterior\n"
+    assert sorted(path.name for path in dictionary.parent.iterdir()) == sorted([bases.name, dictionary.name])
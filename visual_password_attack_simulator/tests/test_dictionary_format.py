@@ -0,0 +1,85 @@
+"""Diccionario binario de ancho fijo (`utils.dictionary_format`)."""
+
+import os
+
+import pytest
+
+from visual_password_attack_simulator.attacks import dictionary_attack
+from visual_password_attack_simulator.attacks.dictionary_attack import DictionaryAttack
+from visual_password_attack_simulator.utils.candidate_cache import CandidateCache
+from visual_password_attack_simulator.utils.dictionary_format import (
+    BinaryDictionary,
+    binary_path,
+    build_binary_dictionary,
+    open_binary_dictionary,
+)
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+WORDS = ["Abcdefgh1#", "Bcdefghi2$", "Cdefghij3%", "Defghijk4&", "Efghijkl5*"]
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    path.write_text("\n".join(WORDS[:2] + ["no vale", ""] + WORDS[2:]) + "\n", encoding="utf-8")
+    return path
+
+
+def test_binary_keeps_valid_entries_in_order(dictionary):
+    """El binario guarda las entradas válidas y cuenta las omitidas."""
+    assert build_binary_dictionary(dictionary) == len(WORDS)
+    with open_binary_dictionary(dictionary) as binary:
+        assert len(binary) == len(WORDS) and binary.skipped == 1
+        assert list(binary.words()) == WORDS and list(binary.words(3)) == WORDS[3:]
+        assert binary[1:3] == [word.encode() for word in WORDS[1:3]]
+        assert binary.password(-1) == WORDS[-1]
+        with pytest.raises(IndexError):
+            binary[len(WORDS)]
+
+
+def test_binary_is_ignored_when_the_text_changes(dictionary):
+    """Si cambia el tamaño o la fecha del texto, el binario deja de usarse;
+    abierto directamente como ``.bin`` no se comprueba."""
+    build_binary_dictionary(dictionary)
+    stat = dictionary.stat()
+    os.utime(dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert open_binary_dictionary(dictionary) is None
+    with open_binary_dictionary(binary_path(dictionary)) as binary:
+        assert list(binary.words()) == WORDS
+
+    build_binary_dictionary(dictionary)
+    assert open_binary_dictionary(dictionary) is not None
+    with dictionary.open("a", encoding="utf-8") as f:
+        f.write("Fghijklm6@\n")
+    os.utime(dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert open_binary_dictionary(dictionary) is None
+
+    dictionary.unlink()
+    assert open_binary_dictionary(dictionary) is None
+
+
+def test_damaged_binaries_are_rejected(dictionary):
+    """Un binario truncado o de otro formato no se abre."""
+    build_binary_dictionary(dictionary)
+    path = binary_path(dictionary)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert open_binary_dictionary(dictionary) is None
+    with pytest.raises(ValueError):
+        BinaryDictionary(path)
+    path.write_bytes(b"XXXX" + data[4:])
+    assert open_binary_dictionary(dictionary) is None
+
+
+def test_attack_falls_back_to_the_text_when_binary_is_stale(dictionary, monkeypatch):
+    """Con el binario desfasado el ataque lee el texto y encuentra las
+    contraseñas añadidas después de generarlo."""
+    monkeypatch.setattr(dictionary_attack, "CANDIDATE_CACHE", CandidateCache(max_bytes=1))
+    build_binary_dictionary(dictionary)
+    with dictionary.open("a", encoding="utf-8") as f:
+        f.write("Fghijklm6@\n")
+    found = []
+    attack = DictionaryAttack(sha256_hash("Fghijklm6@"), str(dictionary))
+    attack.found.connect(lambda password, attempts, _: found.append((password, attempts)))
+    attack.run()
+    assert found == [("Fghijklm6@", len(WORDS) + 1)]
@@ -0,0 +1,94 @@
+"""Índice persistente de los diccionarios y lectura en una sola pasada."""
+
+import os
+
+import pytest
+
+from visual_password_attack_simulator.attacks import dictionary_attack
+from visual_password_attack_simulator.attacks.dictionary_attack import DictionaryAttack
+from visual_password_attack_simulator.utils.candidate_cache import CandidateCache
+from visual_password_attack_simulator.utils.dictionary_index import (
+    DictionaryIndex,
+    IndexBuilder,
+    build_index,
+    index_path,
+    parse_entry,
+)
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+LINES = [
+    "Abcdefgh1#", "corta", "", "Bcdefghi2$", "sin-digitos", "Cdefghij3%", "Ñandúes12#",
+    "Defghijk4&", "Efghijkl5*", "  Fghijklm6@  ", "Ghijklmn7!", "no vale", "Hijklmno8#",
+]
+VALID = [line.strip() for line in LINES if parse_entry(line.encode()) is not None]
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    path.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    return path
+
+
+def test_locate_points_at_the_block_of_each_entry(dictionary):
+    """Leyendo desde ``locate(e)`` y contando válidas se llega a la entrada ``e``."""
+    index = build_index(dictionary, interval=3)
+    assert index.count == len(VALID) == 7
+    assert len(index.offsets) == 3
+    data = dictionary.read_bytes()
+    for entry in range(index.count + 2):
+        offset, first = index.locate(entry)
+        assert first <= entry and first % 3 == 0
+        words = [parse_entry(raw) for raw in data[offset:].splitlines(keepends=True)]
+        words = [word for word in words if word is not None]
+        assert words[entry - first:] == VALID[entry:]
+    assert index.locate(-5) == (0, 0)
+
+
+def test_stale_indexes_are_rejected(dictionary):
+    """El índice deja de valer si cambia el tamaño o la fecha; con ``verify``
+    se acepta una copia con el mismo contenido."""
+    build_index(dictionary)
+    assert DictionaryIndex.load(dictionary) is not None
+    stat = dictionary.stat()
+    os.utime(dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert DictionaryIndex.load(dictionary) is None
+    refreshed = DictionaryIndex.load(dictionary, verify=True)
+    assert refreshed is not None and refreshed.mtime_ns == dictionary.stat().st_mtime_ns
+    assert DictionaryIndex.load(dictionary) is not None
+    # Mismo tamaño, otro contenido: ni siquiera ``verify`` lo acepta
+    dictionary.write_bytes(dictionary.read_bytes().replace(b"Abcdefgh1#", b"Abcdefgh9#"))
+    os.utime(dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert DictionaryIndex.load(dictionary, verify=True) is None
+    index_path(dictionary).write_text("{no es json", encoding="utf-8")
+    assert DictionaryIndex.load(dictionary) is None
+
+
+def test_builder_discards_an_index_of_a_changing_file(dictionary):
+    """Si el archivo cambia durante la lectura no se guarda índice."""
+    stat = dictionary.stat()
+    builder = IndexBuilder()
+    for raw in dictionary.read_bytes().splitlines(keepends=True):
+        builder.add(raw, parse_entry(raw) is not None)
+    with dictionary.open("ab") as f:
+        f.write(b"Ijklmnop9#\n")
+    assert builder.finish(dictionary, stat) is None
+    assert not index_path(dictionary).exists()
+
+
+def test_streaming_run_builds_the_index_and_resumes_from_it(dictionary, monkeypatch):
+    """Sin caché, la primera ejecución construye el índice en su única
+    lectura y una reanudación salta directamente a su entrada."""
+    monkeypatch.setattr(dictionary_attack, "CANDIDATE_CACHE", CandidateCache(max_bytes=1))
+    attack = DictionaryAttack(sha256_hash("no-esta"), str(dictionary))
+    assert attack.candidate_count() is None
+    attack.run()
+    index = DictionaryIndex.load(dictionary)
+    assert index is not None and index.count == len(VALID)
+
+    found = []
+    resumed = DictionaryAttack(sha256_hash(VALID[5]), str(dictionary), start_entry=3)
+    assert resumed.total_candidates == len(VALID) - 3
+    resumed.found.connect(lambda password, attempts, _: found.append((password, attempts)))
+    resumed.run()
+    assert found == [(VALID[5], 3)]
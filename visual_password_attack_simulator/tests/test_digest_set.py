@@ -0,0 +1,68 @@
+"""Conjunto compacto de resúmenes (`DigestSet`) frente a ``set``."""
+
+import hashlib
+import random
+
+import pytest
+
+from visual_password_attack_simulator.utils.hash_utils import DigestSet, digest_set, find_digest_matches
+
+
+def random_digests(rng, count):
+    return [rng.randbytes(32) for _ in range(count)]
+
+
+@pytest.fixture
+def digests():
+    rng = random.Random(5)
+    members = random_digests(rng, 5000)
+    # Repetidos y resúmenes que comparten cubo o los 8 primeros bytes
+    members += members[:100]
+    members += [members[0][:2] + rng.randbytes(30), members[1][:8] + rng.randbytes(24)]
+    return members
+
+
+def test_membership_matches_set(digests):
+    """``in``, ``len`` e iteración coinciden con un ``set``."""
+    rng = random.Random(6)
+    reference = set(digests)
+    compact = DigestSet(digests)
+    assert len(compact) == len(reference)
+    assert list(compact) == sorted(reference)
+    outsiders = random_digests(rng, 5000) + [d[:8] + bytes(24) for d in digests[:200]]
+    for digest in digests + outsiders:
+        assert (digest in compact) == (digest in reference)
+    assert bytearray(digests[0]) in compact and memoryview(digests[0]) in compact
+    for other in (digests[0][:31], digests[0] + b"\0", "texto", 42, None):
+        assert other not in compact
+
+
+def test_discard_and_intersection_match_set(digests):
+    """``discard``, ``&=`` y ``copy`` se comportan como en un ``set``."""
+    rng = random.Random(7)
+    reference = set(digests)
+    compact = DigestSet(digests)
+    for digest in rng.sample(digests, 500) + random_digests(rng, 10):
+        reference.discard(digest)
+        compact.discard(digest)
+    assert len(compact) == len(reference) and set(compact) == reference
+    clone = compact.copy()
+    keep = set(rng.sample(sorted(reference), 1000))
+    reference &= keep
+    compact &= keep
+    assert set(compact) == reference and len(compact) == 1000
+    assert len(clone) > len(compact)
+    for digest in digests:
+        assert (digest in compact) == (digest in reference)
+
+
+def test_digest_set_and_matches():
+    """``digest_set`` elige el tipo por tamaño y ambos sirven como objetivos."""
+    words = [f"clave{i}".encode() for i in range(300)]
+    targets = [hashlib.sha256(word).digest() for word in words[::7]]
+    assert isinstance(digest_set(targets), set)
+    compact = digest_set(targets, threshold=1)
+    assert isinstance(compact, DigestSet)
+    assert find_digest_matches(words, compact) == find_digest_matches(words, set(targets)) == list(range(0, 300, 7))
+    with pytest.raises(ValueError):
+        DigestSet([b"corto"])
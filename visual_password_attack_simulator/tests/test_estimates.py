@@ -0,0 +1,99 @@
+"""Estimaciones de los ataques solo con metadatos (`BaseAttack.estimate`)."""
+
+import pytest
+
+from visual_password_attack_simulator.attacks.brute_force import BruteForceAttack
+from visual_password_attack_simulator.attacks.dictionary_attack import DictionaryAttack
+from visual_password_attack_simulator.attacks.hybrid_attack import HybridAttack
+from visual_password_attack_simulator.attacks.mask_attack import MaskAttack
+from visual_password_attack_simulator.attacks.rainbow_table import RainbowTableAttack
+from visual_password_attack_simulator.attacks.rule_based_attack import RuleBasedAttack
+from visual_password_attack_simulator.bench.suite import synthetic_targets, write_data
+from visual_password_attack_simulator.utils import candidate_cache
+from visual_password_attack_simulator.utils.dictionary_format import binary_path, build_binary_dictionary
+from visual_password_attack_simulator.utils.dictionary_index import build_index
+from visual_password_attack_simulator.utils.hash_rate import HashRates
+from visual_password_attack_simulator.utils.rainbow_chains import RainbowChainTable
+
+RATES = HashRates(batched=1000.0, prefix=4000.0, measured_at=0.0)
+TARGET = synthetic_targets(1)[0]
+
+
+@pytest.fixture(scope="module")
+def data(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("datos")
+    write_data(directory, 300)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def no_scans(monkeypatch):
+    """Falla si una estimación intenta leer candidatos."""
+    def scan(path, *args, **kwargs):
+        raise AssertionError(f"la estimación leyó {path}")
+
+    monkeypatch.setattr(candidate_cache, "_load_valid", scan)
+    monkeypatch.setattr(candidate_cache, "_load_words", scan)
+    candidate_cache.CANDIDATE_CACHE.clear()
+
+
+def test_keyspace_estimates_use_prefix_rate_and_workers():
+    """Fuerza bruta y máscara cuentan con el `Keyspace` y la ruta por prefijos."""
+    count, seconds = MaskAttack.estimate(RATES, TARGET, mask="Abcdef?l?d?s?d", workers=2)
+    assert count == 36400
+    assert seconds == pytest.approx(36400 / (4000.0 * 2))
+    # Al reanudar solo quedan los candidatos desde ``start_index``
+    keyspace = MaskAttack(TARGET, mask="Abcdef?l?d?s?d").keyspace
+    remaining, _ = MaskAttack.estimate(RATES, TARGET, mask="Abcdef?l?d?s?d", start_index=1000)
+    assert remaining == 36400 - keyspace.count_valid_below(1000)
+    assert BruteForceAttack.estimate(RATES, TARGET, alphabet="aB1")[0] == 0
+
+
+def test_dictionary_estimate_reads_only_index_or_header(tmp_path):
+    """Sin índice ni binario el total es desconocido; con ellos, exacto."""
+    path = tmp_path / "dictionary.txt"
+    path.write_text("Abcdefgh1#\ncorta\nZyxwvuts2$\nQwertyui3%\n", encoding="utf-8")
+    assert DictionaryAttack.estimate(RATES, TARGET, dictionary_path=str(path)) == (None, None)
+    build_binary_dictionary(path)
+    count, seconds = DictionaryAttack.estimate(RATES, TARGET, dictionary_path=str(path), start_entry=1)
+    assert (count, seconds) == (2, pytest.approx(2 / 1000.0))
+    binary_path(path).unlink()
+    build_index(path)
+    assert DictionaryAttack.estimate(RATES, TARGET, str(path))[0] == 3
+
+
+def test_rule_estimate_needs_complete_binary(data):
+    """Las reglas solo se estiman con un binario que tenga todas las palabras."""
+    words = data / "words.txt"
+    assert RuleBasedAttack.estimate(RATES, TARGET, dictionary_path=str(words)) == (None, None)
+    dictionary = data / "dictionary.txt"
+    count, _ = RuleBasedAttack.estimate(RATES, TARGET, dictionary_path=str(dictionary))
+    assert count == RuleBasedAttack(TARGET, dictionary_path=str(dictionary)).candidate_count()
+
+
+def test_hybrid_estimate_is_unknown(data):
+    """El total del híbrido exige recorrer las bases: no se estima."""
+    assert HybridAttack.estimate(RATES, TARGET, dictionary_path=str(data / "bases.txt")) == (None, None)
+
+
+def test_rainbow_estimate_reads_chain_header(data):
+    """La tabla arcoíris cuenta consultas sin cargar la tabla directa."""
+    targets = synthetic_targets(3)
+    chains = data / "rainbow_chains.bin"
+    with RainbowChainTable(chains) as table:
+        length = table.chain_length
+        expected = 3 + 3 * table.table_count * length * (length - 1) // 2
+    missing = str(data / "no-existe.txt")
+    assert RainbowTableAttack.estimate(RATES, targets, missing, str(chains))[0] == expected
+    assert RainbowTableAttack.estimate(RATES, targets, missing, missing)[0] == 3
+
+
+def test_rainbow_attack_opens_tables_only_while_running(data):
+    """Construir el ataque no abre archivos; `run` los cierra al terminar."""
+    attack = RainbowTableAttack(synthetic_targets(2), str(data / "rainbow_table.bin"), str(data / "rainbow_chains.bin"))
+    assert attack.binary_table is None and attack.chain_table is None
+    messages = []
+    attack.log.connect(messages.append)
+    attack.run()
+    assert attack.binary_table is None and attack.chain_table is None
+    assert any("cadenas" in message for message in messages)
@@ -0,0 +1,66 @@
+"""Ordenación externa (`ExternalSorter`) frente a ``sorted(set(...))``."""
+
+import random
+
+import pytest
+
+from visual_password_attack_simulator.utils import external_sort
+from visual_password_attack_simulator.utils.external_sort import ExternalSorter, read_run, unique_merge, write_run
+from visual_password_attack_simulator.utils.packed_passwords import ALPHABET
+
+TEXT_CHARS = "abcXYZ019 @ñé€"
+
+
+def random_items(rng, count, chars=TEXT_CHARS, lengths=(0, 12)):
+    pool = ["".join(rng.choice(chars) for _ in range(rng.randint(*lengths))) for _ in range(count // 2)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+@pytest.mark.parametrize("memory_bytes", [1, 500, 1 << 20])
+def test_sorter_matches_sorted_set(tmp_path, memory_bytes):
+    """El resultado es ``sorted(set(...))`` con y sin runs, y se puede
+    recorrer varias veces."""
+    items = random_items(random.Random(memory_bytes), 3000)
+    with ExternalSorter(tmp_path, memory_bytes, name="prueba") as sorter:
+        sorter.extend(items)
+        assert sorter.added == len(items)
+        expected = sorted(set(items))
+        assert list(sorter) == expected
+        assert list(sorter) == expected
+        spilled = bool(sorter.runs)
+    assert spilled == (memory_bytes < 1 << 20)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sorter_collapses_many_runs(tmp_path, monkeypatch):
+    """Con más runs que `MERGE_FAN_IN` se mezclan por grupos."""
+    monkeypatch.setattr(external_sort, "MERGE_FAN_IN", 4)
+    items = random_items(random.Random(1), 2000)
+    with ExternalSorter(tmp_path, 100) as sorter:
+        sorter.extend(items)
+        assert len(sorter.runs) < 8
+        assert list(sorter) == sorted(set(items))
+        assert len(sorter.runs) <= 4
+        assert len(list(tmp_path.iterdir())) == len(sorter.runs)
+
+
+def test_packed_sorter_matches_sorted_set(tmp_path):
+    """El búfer empaquetado da el mismo orden que el de texto."""
+    rng = random.Random(2)
+    alphabet = ALPHABET.decode("ascii")
+    items = random_items(rng, 5000, alphabet, (10, 10))
+    for memory_bytes in (200, 1 << 20):
+        with ExternalSorter(tmp_path, memory_bytes, packed=True) as sorter:
+            sorter.extend(items)
+            assert list(sorter) == sorted(set(items))
+
+
+def test_runs_round_trip_and_merge(tmp_path):
+    """``write_run``/``read_run`` conservan las cadenas y ``unique_merge``
+    mezcla sin repetidos."""
+    rng = random.Random(3)
+    first, second = (sorted(set(random_items(rng, 300))) for _ in range(2))
+    path = tmp_path / "a.run"
+    assert write_run(path, first) == len(first)
+    assert list(read_run(path)) == first
+    assert list(unique_merge(read_run(path), iter(second))) == sorted(set(first) | set(second))
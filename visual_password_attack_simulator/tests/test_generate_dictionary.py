@@ -0,0 +1,66 @@
+"""Construcción incremental de ``generate_dictionary.py``."""
+
+import argparse
+
+import pytest
+
+from visual_password_attack_simulator import generate_dictionary as gd
+
+
+@pytest.fixture
+def entorno(tmp_path, monkeypatch):
+    """Fuente y salidas en un directorio temporal, con pocas bases internas."""
+    source = tmp_path / "words.txt"
+    source.write_text("perro\ngato\nAbcdefgh1#\n", encoding="utf-8")
+    monkeypatch.setattr(gd, "OUTPUT_FILE", tmp_path / "dictionary.txt")
+    monkeypatch.setattr(gd, "HYBRID_BASES_FILE", tmp_path / "hybrid_bases.txt")
+    monkeypatch.setattr(gd, "INTERNAL_BASES", frozenset({"ibero", "futbol"}))
+    monkeypatch.setattr(gd, "fuentes_externas", lambda: [source])
+    args = argparse.Namespace(
+        workers=1,
+        memory_mb=1,
+        chunk_size=gd.CHUNK_SIZE,
+        tmp_dir=str(tmp_path),
+        cache_dir=str(tmp_path / "cache"),
+        full=False,
+        seed=1,
+    )
+    return source, args
+
+
+def _leer(path):
+    return path.read_text(encoding="utf-8").split()
+
+
+def test_incremental_igual_a_completa(entorno):
+    source, args = entorno
+    gd.generar_diccionario(args)
+    with source.open("a", encoding="utf-8") as f:
+        f.write("Zyxwvuts9$\ncaballo\n")
+    gd.generar_diccionario(args)
+    incremental = _leer(gd.OUTPUT_FILE), _leer(gd.HYBRID_BASES_FILE)
+    assert "Zyxwvuts9$" in incremental[0]
+    assert "caballo" in incremental[1]
+
+    args.full = True
+    gd.generar_diccionario(args)
+    assert (_leer(gd.OUTPUT_FILE), _leer(gd.HYBRID_BASES_FILE)) == incremental
+
+
+def test_mezcla_interrumpida_se_repite(entorno, monkeypatch):
+    source, args = entorno
+    gd.generar_diccionario(args)
+    source.write_text("perro\nAbcdefgh1#\nZyxwvuts9$\n", encoding="utf-8")
+
+    def interrumpir(*sources):
+        raise KeyboardInterrupt
+
+    # El shard nuevo queda en el manifiesto, pero la mezcla no llega a hacerse
+    with monkeypatch.context() as m:
+        m.setattr(gd, "unique_merge", interrumpir)
+        with pytest.raises(KeyboardInterrupt):
+            gd.generar_diccionario(args)
+    assert "Zyxwvuts9$" not in _leer(gd.OUTPUT_FILE)
+
+    gd.generar_diccionario(args)
+    assert "Zyxwvuts9$" in _leer(gd.OUTPUT_FILE)
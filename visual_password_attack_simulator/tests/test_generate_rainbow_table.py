@@ -0,0 +1,109 @@
+"""Reanudación de la tabla en texto de ``generate_rainbow_table.py``."""
+
+import argparse
+import hashlib
+
+import pytest
+
+from visual_password_attack_simulator import generate_rainbow_table as gr
+
+WORDS = [f"Clave{i:04d}#x" for i in range(200)] + ["", "  con espacios  ", "Contraseña1"]
+
+
+class Interrupcion(Exception):
+    """Simula que la generación se corta tras unos cuantos bloques."""
+
+
+@pytest.fixture
+def entorno(tmp_path, monkeypatch):
+    """Diccionario, salida y checkpoint en un directorio temporal."""
+    source = tmp_path / "dictionary.txt"
+    source.write_text("\n".join(WORDS) + "\n", encoding="utf-8")
+    monkeypatch.setattr(gr, "INPUT_DICTIONARY", source)
+    monkeypatch.setattr(gr, "OUTPUT_RAINBOW", tmp_path / "rainbow_table.txt")
+    monkeypatch.setattr(gr, "CHECKPOINT", tmp_path / "rainbow_table.checkpoint")
+    args = argparse.Namespace(workers=1, chunk_size=300, restart=False)
+    return source, args
+
+
+def _esperado(lines=WORDS):
+    words = [line.strip() for line in lines if line.strip()]
+    return "".join(f"{hashlib.sha256(w.encode()).hexdigest()}:{w}\n" for w in words)
+
+
+def _interrumpir(monkeypatch, bloques):
+    save = gr.save_checkpoint
+    calls = []
+
+    def save_and_stop(state):
+        save(state)
+        calls.append(state["offset"])
+        if len(calls) == bloques:
+            raise Interrupcion
+
+    monkeypatch.setattr(gr, "save_checkpoint", save_and_stop)
+
+
+def _registrar_bloques(monkeypatch):
+    """Devuelve la lista en la que se anota el inicio de cada bloque hasheado."""
+    hash_chunk = gr.hash_chunk
+    offsets = []
+
+    def record(path, offset, size):
+        offsets.append(offset)
+        return hash_chunk(path, offset, size)
+
+    monkeypatch.setattr(gr, "hash_chunk", record)
+    return offsets
+
+
+def test_tabla_completa(entorno):
+    source, args = entorno
+    assert gr.build_text_table(args) == len(WORDS) - 1
+    assert gr.OUTPUT_RAINBOW.read_text(encoding="utf-8") == _esperado()
+    assert not gr.CHECKPOINT.exists()
+
+
+def test_reanuda_tras_una_interrupcion(entorno, monkeypatch):
+    source, args = entorno
+    with monkeypatch.context() as m:
+        _interrumpir(m, 3)
+        with pytest.raises(Interrupcion):
+            gr.build_text_table(args)
+    state = gr.load_checkpoint(source)
+    assert state is not None and 0 < state["offset"] < source.stat().st_size
+    # Lo escrito después del último checkpoint se descarta al reanudar
+    with gr.OUTPUT_RAINBOW.open("ab") as f:
+        f.write(b"basura a medio escribir")
+    hashed = _registrar_bloques(monkeypatch)
+    assert gr.build_text_table(args) == len(WORDS) - 1
+    assert gr.OUTPUT_RAINBOW.read_text(encoding="utf-8") == _esperado()
+    # Solo se vuelve a hashear desde el punto guardado
+    assert hashed[0] == state["offset"]
+    assert not gr.CHECKPOINT.exists()
+
+
+def test_checkpoint_de_otro_diccionario_se_ignora(entorno, monkeypatch):
+    source, args = entorno
+    with monkeypatch.context() as m:
+        _interrumpir(m, 2)
+        with pytest.raises(Interrupcion):
+            gr.build_text_table(args)
+    with source.open("a", encoding="utf-8") as f:
+        f.write("Nueva1234#\n")
+    assert gr.load_checkpoint(source) is None
+    assert gr.build_text_table(args) == len(WORDS)
+    assert gr.OUTPUT_RAINBOW.read_text(encoding="utf-8") == _esperado(WORDS + ["Nueva1234#"])
+
+
+def test_restart_ignora_el_checkpoint(entorno, monkeypatch):
+    source, args = entorno
+    with monkeypatch.context() as m:
+        _interrumpir(m, 2)
+        with pytest.raises(Interrupcion):
+            gr.build_text_table(args)
+    args.restart = True
+    hashed = _registrar_bloques(monkeypatch)
+    assert gr.build_text_table(args) == len(WORDS) - 1
+    assert hashed[0] == 0
+    assert gr.OUTPUT_RAINBOW.read_text(encoding="utf-8") == _esperado()
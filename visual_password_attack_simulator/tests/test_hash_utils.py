@@ -0,0 +1,55 @@
+"""Hashing de candidatos en ``utils.hash_utils``."""
+
+import hashlib
+
+from visual_password_attack_simulator.utils.hash_utils import (
+    find_digest_match,
+    find_digest_matches,
+    sha256_hash,
+    sha256_state,
+)
+from visual_password_attack_simulator.utils.keyspace import Keyspace, parse_mask
+
+PREFIXES = [b"", b"A", b"Abcdef", "Contraseña".encode(), b"x" * 200]
+SUFFIXES = [b"", b"1", b"b1#2", "ñ€".encode(), b"y" * 100]
+
+
+def test_prefix_state_copies_match_full_hash():
+    """Copiar el estado de un prefijo y añadir el resto da el mismo hash que
+    hashear la cadena completa, y las copias no se afectan entre sí."""
+    for prefix in PREFIXES:
+        state = sha256_state(prefix)
+        copies = []
+        for suffix in SUFFIXES:
+            h = state.copy()
+            h.update(suffix)
+            copies.append(h)
+            assert h.hexdigest() == sha256_hash((prefix + suffix).decode("utf-8"))
+        # El estado original sigue siendo el del prefijo
+        assert state.digest() == hashlib.sha256(prefix).digest()
+        assert [h.digest() for h in copies] == [hashlib.sha256(prefix + s).digest() for s in SUFFIXES]
+
+
+def test_prefix_and_plain_search_agree():
+    """Con y sin ``prefix`` se encuentran los mismos candidatos."""
+    prefix = b"Abcdef"
+    suffixes = [f"{c}{d}#{d}".encode() for c in "abc" for d in range(10)]
+    targets = {hashlib.sha256(prefix + s).digest() for s in suffixes[3::7]}
+    expected = list(range(3, len(suffixes), 7))
+    assert find_digest_matches(suffixes, targets, prefix) == expected
+    assert find_digest_matches([prefix + s for s in suffixes], targets) == expected
+    target = hashlib.sha256(prefix + suffixes[12]).digest()
+    assert find_digest_match(suffixes, target, prefix) == 12
+    assert find_digest_match([prefix + s for s in suffixes], target) == 12
+    assert find_digest_match(suffixes, hashlib.sha256(suffixes[12]).digest(), prefix) == -1
+
+
+def test_keyspace_search_hashes_like_sha256_hash():
+    """La búsqueda del espacio, que reutiliza los estados de los prefijos,
+    encuentra exactamente los candidatos cuyo hash es un objetivo."""
+    keyspace = Keyspace(parse_mask("Ab?l?l?d?s"))
+    valid = [candidate for _, candidate in keyspace.iter_valid()]
+    passwords = valid[::997] + valid[-1:]
+    targets = {bytes.fromhex(sha256_hash(p)) for p in passwords}
+    hits = [candidate for _, _, candidate, found in keyspace.search_valid(targets) if found]
+    assert hits == passwords
@@ -0,0 +1,114 @@
+"""Espacio enumerable del ataque híbrido (`utils.hybrid_space`)."""
+
+import itertools
+import random
+
+import pytest
+
+from visual_password_attack_simulator.attacks import hybrid_attack
+from visual_password_attack_simulator.attacks.hybrid_attack import HybridAttack
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+from visual_password_attack_simulator.utils.hybrid_space import (
+    FIELD_VALUES,
+    HYBRID_PATTERNS,
+    HybridSpace,
+    case_variants,
+    leet_variants,
+    sanitize_base,
+    selected_count,
+)
+from visual_password_attack_simulator.utils.password_requirements import meets_password_requirements
+
+# Bases con dígitos tras la raíz, donde los patrones se solapan
+WORDS = ["futbol", "barcelona", "messi", "ab", "Contraseña!", "passwor12", "rock2000star", "abcd2000", "sessions1"]
+
+
+def random_bases(count=6, seed=0):
+    rng = random.Random(seed)
+    chars = "aeiosbcdrt0123456789"
+    return ["".join(rng.choice(chars) for _ in range(rng.randint(4, 12))) for _ in range(count)]
+
+
+def naive_candidates(base_word):
+    """Candidatos válidos de cada patrón, generados sin eliminar solapamientos."""
+    per_pattern = []
+    for pattern in HYBRID_PATTERNS:
+        found = set()
+        for variant in case_variants(sanitize_base(base_word)):
+            if len(variant) < pattern.root_length:
+                continue
+            for root in leet_variants(variant[:pattern.root_length]):
+                root = root[0].upper() + root[1:]
+                for fields in itertools.product(*(FIELD_VALUES[field] for field in pattern.fields)):
+                    candidate = root + "".join(fields)
+                    if meets_password_requirements(candidate):
+                        found.add(candidate)
+        per_pattern.append(found)
+    return per_pattern
+
+
+@pytest.mark.parametrize("base_word", WORDS + random_bases())
+def test_space_is_the_union_of_patterns_without_repeats(base_word):
+    """El espacio contiene exactamente los candidatos válidos de todos los
+    patrones, cada uno una vez y en el primer patrón que lo genera."""
+    per_pattern = naive_candidates(base_word)
+    space = HybridSpace(base_word)
+    candidates = list(space)
+    assert len(candidates) == len(set(candidates)) == space.count
+    assert set(candidates) == set().union(*per_pattern)
+    first_pattern = [next(i for i, found in enumerate(per_pattern) if c in found) for c in candidates]
+    assert first_pattern == sorted(first_pattern)
+    assert selected_count(base_word) == space.count
+
+
+@pytest.mark.parametrize("base_word", ["barcelona", "passwor12", "sessions1"])
+def test_unrank_and_select_follow_iteration(base_word):
+    """``unrank`` coincide con el recorrido y ``select`` no repite candidatos."""
+    space = HybridSpace(base_word)
+    candidates = list(space)
+    rng = random.Random(1)
+    for index in rng.sample(range(space.count), 200):
+        assert space.unrank(index) == candidates[index]
+    with pytest.raises(IndexError):
+        space.unrank(space.count)
+    assert list(space.select()) == candidates
+    spread = list(space.select(50))
+    assert len(set(spread)) == 50 and spread[0] == candidates[0]
+    seeded = list(space.select(50, seed=7))
+    assert len(set(seeded)) == 50 and set(seeded) <= set(candidates)
+    assert list(HybridSpace(base_word).select(50, seed=7)) == seeded
+    assert selected_count(base_word, 50) == 50
+
+
+def test_words_without_roots_are_empty():
+    """Una base demasiado corta no produce candidatos."""
+    assert HybridSpace("ab").count == 0
+    assert list(HybridSpace("")) == []
+
+
+def test_attack_counts_bases_while_hashing(tmp_path, monkeypatch):
+    """El ataque no cuenta todas las bases antes de empezar a hashear y al
+    agotarlas su total es el exacto de `candidate_count`."""
+    bases = tmp_path / "bases.txt"
+    bases.write_text("\n".join(WORDS + random_bases(40)) + "\n", encoding="utf-8")
+    built = []
+
+    class CountingSpace(HybridSpace):
+        def __init__(self, base_word, *args, **kwargs):
+            built.append(base_word)
+            super().__init__(base_word, *args, **kwargs)
+
+    def counting_selected(base_word, *args, **kwargs):
+        built.append(base_word)
+        return selected_count(base_word, *args, **kwargs)
+
+    first = next(iter(HybridSpace(WORDS[0])))
+    attack = HybridAttack([sha256_hash(first), sha256_hash("no-esta")], str(bases), max_suffix=50)
+    expected = attack.candidate_count()
+    monkeypatch.setattr(hybrid_attack, "HybridSpace", CountingSpace)
+    monkeypatch.setattr(hybrid_attack, "selected_count", counting_selected)
+    built_when_found = []
+    attack.found.connect(lambda *args: built_when_found.append(len(built)))
+    attack.run()
+    assert built_when_found and built_when_found[0] < len(WORDS) + 40
+    assert attack.total_candidates == expected
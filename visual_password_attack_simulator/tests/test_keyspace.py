@@ -0,0 +1,140 @@
+"""`Keyspace` frente a ``itertools.product`` sobre espacios pequeños."""
+
+import hashlib
+import itertools
+import random
+
+import pytest
+
+from visual_password_attack_simulator.utils.keyspace import Keyspace, parse_mask
+from visual_password_attack_simulator.utils.password_requirements import (
+    ALLOWED_CHARACTERS,
+    REQUIRED_CLASSES_MASK,
+    character_class_mask,
+)
+
+SEEDS = range(8)
+
+
+def random_alphabets(rng, positions=10):
+    """Alfabetos de 1 a 3 símbolos por posición; uno de ellos con fragmentos
+    de dos caracteres."""
+    alphabets = [rng.sample(ALLOWED_CHARACTERS, rng.randint(1, 3)) for _ in range(positions)]
+    alphabets[rng.randrange(positions)] = ["19", "20", "a1"][:rng.randint(1, 3)]
+    return alphabets
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rank_unrank_match_product(seed):
+    """``unrank``/``rank``/``iter_from`` siguen el orden de ``itertools.product``."""
+    rng = random.Random(seed)
+    alphabets = random_alphabets(rng)
+    keyspace = Keyspace(alphabets)
+    expected = [''.join(combo) for combo in itertools.product(*alphabets)]
+    assert keyspace.size == len(expected)
+    assert list(keyspace) == expected
+    for index in rng.sample(range(len(expected)), min(50, len(expected))):
+        assert keyspace.unrank(index) == expected[index]
+        assert keyspace.rank(expected[index]) == index
+        assert list(keyspace.iter_from(index)) == expected[index:]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_slices_keep_absolute_indices(seed):
+    """Las porciones y ``split`` conservan la numeración del producto completo."""
+    rng = random.Random(seed)
+    alphabets = random_alphabets(rng)
+    keyspace = Keyspace(alphabets)
+    expected = list(keyspace)
+    a, b = sorted(rng.sample(range(len(expected) + 1), 2))
+    view = keyspace[a:b]
+    assert view.start == a and list(view) == expected[a:b]
+    assert all(candidate in view for candidate in expected[a:b])
+    assert not any(candidate in view for candidate in expected[:a] + expected[b:])
+    assert list(keyspace[a:b:3]) == expected[a:b:3]
+    chunks = list(keyspace.split(rng.randint(1, 100)))
+    assert [candidate for chunk in chunks for candidate in chunk] == expected
+    sample = keyspace.sample(20, random.Random(seed))
+    assert len(set(sample)) == len(sample) == min(20, len(expected))
+    assert set(sample) <= set(expected)
+
+
+def test_rank_rejects_foreign_candidates():
+    """``rank`` falla con candidatos fuera del espacio."""
+    keyspace = Keyspace(parse_mask("?u?d"))
+    assert keyspace.rank("B7") == 17
+    for candidate in ("b7", "B", "B77"):
+        assert candidate not in keyspace
+        with pytest.raises(ValueError):
+            keyspace.rank(candidate)
+    with pytest.raises(IndexError):
+        keyspace.unrank(keyspace.size)
+
+
+def is_valid(candidate):
+    return character_class_mask(candidate) == REQUIRED_CLASSES_MASK
+
+
+def policy_alphabets(rng, positions=10):
+    """Alfabetos aleatorios que mezclan las clases obligatorias y algún
+    carácter no permitido."""
+    pool = ALLOWED_CHARACTERS + "ñ "
+    return [rng.sample(pool, rng.randint(1, 3)) for _ in range(positions)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_policy_counts_match_brute_force(seed):
+    """``valid_count``, ``count_valid_below``, ``iter_valid`` y ``unrank_valid``
+    coinciden con filtrar el producto completo."""
+    rng = random.Random(seed)
+    keyspace = Keyspace(policy_alphabets(rng))
+    valid = [(index, candidate) for index, candidate in enumerate(keyspace) if is_valid(candidate)]
+    assert keyspace.valid_count() == len(valid)
+    assert list(keyspace.iter_valid()) == valid
+    for k, (index, _) in enumerate(valid):
+        assert keyspace.unrank_valid(k) == index
+        assert keyspace.count_valid_below(index) == k
+    with pytest.raises(IndexError):
+        keyspace.unrank_valid(len(valid))
+    start = rng.randrange(keyspace.size)
+    assert list(keyspace.iter_valid(start)) == [item for item in valid if item[0] >= start]
+    a, b = sorted(rng.sample(range(keyspace.size + 1), 2))
+    view = keyspace[a:b]
+    assert view.valid_count() == sum(1 for index, _ in valid if a <= index < b)
+    stepped = keyspace[a:b:2]
+    assert stepped.valid_count() == sum(1 for index, _ in valid if index in stepped.indices)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_split_valid_partitions_valid_candidates(seed):
+    """``split_valid`` reparte los válidos en porciones contiguas de igual número."""
+    rng = random.Random(seed)
+    keyspace = Keyspace(policy_alphabets(rng))
+    view = keyspace[rng.randrange(keyspace.size // 2):]
+    expected = list(view.iter_valid())
+    chunk = rng.randint(1, 40)
+    parts = list(view.split_valid(chunk))
+    assert [item for part in parts for item in part.iter_valid()] == expected
+    assert all(part.valid_count() == chunk for part in parts[:-1])
+    assert (not expected and not parts) or 0 < parts[-1].valid_count() <= chunk
+    assert parts == [] or (parts[0].start, parts[-1].indices.stop) == (view.start, view.indices.stop)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_search_valid_finds_targets_and_counts_every_candidate(seed):
+    """``search_valid`` prueba todos los válidos desde ``start`` y señala los objetivos."""
+    rng = random.Random(seed)
+    keyspace = Keyspace(policy_alphabets(rng))
+    valid = list(keyspace.iter_valid())
+    if not valid:
+        pytest.skip("espacio sin candidatos válidos")
+    targets = rng.sample(valid, min(3, len(valid)))
+    digests = {hashlib.sha256(candidate.encode()).digest() for _, candidate in targets}
+    found = []
+    checked = 0
+    for tried, position, candidate, hit in keyspace.search_valid(digests, report_every=7):
+        checked += tried
+        if hit:
+            found.append((position, candidate))
+    assert checked == len(valid)
+    assert found == sorted(targets)
@@ -0,0 +1,37 @@
+"""Fuerza bruta y máscara sobre `KeyspaceAttack` (``attacks/base_attack.py``)."""
+
+import pytest
+
+from visual_password_attack_simulator.attacks.brute_force import BruteForceAttack
+from visual_password_attack_simulator.attacks.mask_attack import MaskAttack
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+# 36400 candidatos, todos válidos: mayúscula, minúsculas, dígito y especial
+MASK = "Abcdef?l?d?s?d"
+PASSWORDS = ["Abcdefb1#2", "Abcdefy7%5"]
+
+
+def _run(attack):
+    found = []
+    attack.found.connect(lambda password, attempts, elapsed: found.append((password, attempts)))
+    attack.run()
+    return found
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mascara_descubre_todos_los_objetivos(workers):
+    attack = MaskAttack([sha256_hash(p) for p in PASSWORDS], mask=MASK, workers=workers)
+    assert attack.candidate_count() == 36400
+    found = _run(attack)
+    assert sorted(password for password, _ in found) == PASSWORDS
+    if workers == 1:
+        # Intentos exactos: posición en el orden del espacio
+        order = [candidate for _, candidate in attack.keyspace.iter_valid()]
+        assert found == [(p, order.index(p) + 1) for p in PASSWORDS]
+
+
+def test_fuerza_bruta_sin_candidatos_validos():
+    # Sin carácter especial en el alfabeto ningún candidato cumple la política
+    attack = BruteForceAttack(sha256_hash(PASSWORDS[0]), alphabet="aB1", password_length=10)
+    assert attack.candidate_count() == 0
+    assert _run(attack) == []
@@ -0,0 +1,61 @@
+"""Contraseñas empaquetadas de ancho fijo (`PackedPasswords`)."""
+
+import random
+
+import pytest
+
+from visual_password_attack_simulator.utils import packed_passwords
+from visual_password_attack_simulator.utils.packed_passwords import ALPHABET, RECORD_SIZE, PackedPasswords
+
+
+def random_passwords(seed, count=4000):
+    rng = random.Random(seed)
+    alphabet = ALPHABET.decode("ascii")
+    pool = ["".join(rng.choice(alphabet) for _ in range(RECORD_SIZE)) for _ in range(count // 2)]
+    # Extremos del alfabeto para comprobar el orden en los bordes
+    pool += [alphabet[0] * RECORD_SIZE, alphabet[-1] * RECORD_SIZE]
+    return [rng.choice(pool) for _ in range(count)] + pool[-2:]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Ejecuta cada prueba con NumPy (si está instalado) y sin él."""
+    if request.param == "numpy":
+        if packed_passwords.np is None:
+            pytest.skip("NumPy no está instalado")
+    else:
+        monkeypatch.setattr(packed_passwords, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sorted_unique_matches_sorted_set(backend, seed):
+    """``sorted_unique`` da ``sorted(set(...))`` con y sin NumPy."""
+    passwords = random_passwords(seed)
+    packed = PackedPasswords()
+    packed.extend(passwords)
+    assert len(packed) == len(passwords) and packed.nbytes == len(passwords) * RECORD_SIZE
+    assert list(packed) == passwords
+    assert list(packed.sorted_unique()) == sorted(set(passwords))
+    assert list(PackedPasswords().sorted_unique()) == []
+
+
+def test_records_round_trip():
+    """Los registros empaquetados se reconstruyen desde sus bytes."""
+    passwords = random_passwords(4, 100)
+    packed = PackedPasswords()
+    packed.extend(passwords)
+    assert list(PackedPasswords(packed.tobytes())) == passwords
+    packed.clear()
+    assert len(packed) == 0
+    with pytest.raises(ValueError):
+        PackedPasswords(b"x" * (RECORD_SIZE + 1))
+
+
+@pytest.mark.parametrize("password", ["corta", "demasiadolarga", "Contraseñ1", "Abcdefgh1\n", "Abcd efg1#"])
+def test_append_rejects_passwords_outside_the_format(password):
+    """Solo se admiten contraseñas de `RECORD_SIZE` caracteres del alfabeto."""
+    packed = PackedPasswords()
+    with pytest.raises(ValueError):
+        packed.append(password)
+    assert len(packed) == 0
@@ -0,0 +1,104 @@
+"""Búsqueda en varios procesos (`ParallelKeyspaceSearch`): posiciones de
+reanudación al cancelar y reparto con el planificador."""
+
+import hashlib
+
+import pytest
+
+from visual_password_attack_simulator.utils.keyspace import Keyspace, parse_mask
+from visual_password_attack_simulator.utils.parallel_search import ParallelKeyspaceSearch
+
+# 36400 candidatos válidos
+MASK = "Abcdef?l?d?s?d"
+PASSWORDS = ["Abcdefa0*0", "Abcdefh3#7", "Abcdefo5%1", "Abcdefu8&4", "Abcdefz9@9"]
+CHUNK = 3000
+
+
+def digests(passwords):
+    return {hashlib.sha256(p.encode()).digest() for p in passwords}
+
+
+def search(keyspace, passwords, workers=2, stop_after=None, lane=None):
+    """Ejecuta la búsqueda; con ``stop_after`` se cancela tras ese número de
+    avisos de progreso.  Devuelve el buscador, los aciertos y las posiciones."""
+    runner = ParallelKeyspaceSearch(keyspace, digests(passwords), workers=workers, chunk_size=CHUNK, lane=lane)
+    found, positions = [], []
+    remaining = set(passwords)
+
+    def on_found(password, attempts):
+        found.append((password, attempts))
+        remaining.discard(password)
+        return not remaining
+
+    runner.run(
+        lambda: stop_after is not None and len(positions) >= stop_after,
+        lambda attempts, position: positions.append(position),
+        on_found,
+    )
+    return runner, found, positions
+
+
+def test_sequential_worker_reports_exact_attempts():
+    """Con un trabajador las tareas terminan en orden y los intentos de cada
+    acierto son su posición entre los candidatos válidos."""
+    keyspace = Keyspace(parse_mask(MASK))
+    runner, found, positions = search(keyspace, PASSWORDS, workers=1)
+    assert found == [(p, keyspace.count_valid_below(keyspace.rank(p)) + 1) for p in PASSWORDS]
+    assert positions == sorted(positions) and positions[-1] <= keyspace.indices.stop
+
+
+def test_cancel_and_resume_from_position():
+    """Todo lo que queda por debajo de `position` está recorrido; reanudando
+    desde ahí se descubren los objetivos restantes."""
+    keyspace = Keyspace(parse_mask(MASK))
+    first, found, positions = search(keyspace, PASSWORDS, stop_after=2)
+    position = first.position
+    assert positions == sorted(positions) and position == positions[-1]
+    assert keyspace.indices.start < position < keyspace.indices.stop
+    # `position` es el inicio de una porción
+    assert position in {chunk.start for chunk in keyspace.split_valid(CHUNK)}
+    assert first.attempts >= keyspace.count_valid_below(position)
+    found_first = {password for password, _ in found}
+    assert {p for p in PASSWORDS if keyspace.rank(p) < position} <= found_first
+
+    pending = [p for p in PASSWORDS if p not in found_first]
+    assert pending
+    resumed = Keyspace(keyspace.alphabets, range(position, keyspace.indices.stop))
+    second, found_again, _ = search(resumed, pending)
+    assert sorted(p for p, _ in found_again) == sorted(pending)
+    assert second.attempts <= resumed.valid_count()
+
+
+class CountingLane:
+    """Carril de prueba que concede como mucho ``limit`` trabajadores."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.held = 0
+        self.max_held = 0
+        self.grants = 0
+
+    def try_acquire(self):
+        if self.held >= self.limit:
+            return False
+        self.held += 1
+        self.grants += 1
+        self.max_held = max(self.max_held, self.held)
+        return True
+
+    def release(self):
+        self.held -= 1
+
+
+@pytest.mark.parametrize("stop_after", [None, 1])
+def test_lane_limits_tasks_and_gets_workers_back(stop_after):
+    """Solo se envían tareas concedidas por el carril y todas se devuelven,
+    también al cancelar."""
+    keyspace = Keyspace(parse_mask(MASK))
+    lane = CountingLane(1)
+    targets = PASSWORDS[-1:] if stop_after is None else PASSWORDS
+    _, found, _ = search(keyspace, targets, workers=2, stop_after=stop_after, lane=lane)
+    assert lane.max_held == 1 and lane.held == 0
+    if stop_after is None:
+        assert [p for p, _ in found] == targets
+        assert lane.grants == len(list(keyspace.split_valid(CHUNK)))
@@ -0,0 +1,63 @@
+"""Limitación de la frecuencia del progreso (`ProgressThrottle`)."""
+
+import pytest
+
+from visual_password_attack_simulator.attacks import base_attack
+from visual_password_attack_simulator.attacks.base_attack import BaseAttack, ProgressThrottle
+from visual_password_attack_simulator.attacks.mask_attack import MaskAttack
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_throttle_emits_at_most_once_per_interval():
+    """Tras una emisión se rechaza todo hasta que pasa el intervalo."""
+    throttle = ProgressThrottle(4)
+    assert throttle.interval == 0.25
+    assert throttle.ready(10.0)
+    assert not throttle.ready(10.0) and not throttle.ready(10.2)
+    assert throttle.ready(10.25)
+    assert not throttle.ready(10.3)
+    throttle.reset()
+    assert throttle.ready(10.3)
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_throttle_disabled(rate):
+    """Una tasa no positiva deja pasar todas las consultas."""
+    throttle = ProgressThrottle(rate)
+    assert all(throttle.ready(5.0) for _ in range(10))
+
+
+def test_report_progress_is_throttled_but_final_count_is_exact(monkeypatch):
+    """`report_progress` respeta la tasa y `finish_progress` emite siempre."""
+    clock = FakeClock()
+    monkeypatch.setattr(base_attack, "time", type("FakeTime", (), {"time": staticmethod(clock)}))
+    attack = BaseAttack(sha256_hash("x"), progress_rate=4)
+    events = []
+    attack.progress.connect(lambda attempts, total, elapsed: events.append((attempts, elapsed)))
+    attack.begin_progress()
+    # Pasos exactos en binario para que el reloj no acumule redondeos
+    for attempts in range(1, 65):
+        clock.now += 0.0625
+        attack.report_progress(attempts)
+    # 4 segundos a 4 emisiones por segundo
+    assert [attempts for attempts, _ in events] == list(range(1, 65, 4))
+    attack.finish_progress(64)
+    assert events[-1] == (64, 4.0)
+
+
+def test_run_ends_with_the_exact_attempt_count():
+    """Un ataque completo termina su progreso con el conteo exacto."""
+    attack = MaskAttack(sha256_hash("no-esta"), mask="Abcdef?l?d?s?d")
+    events = []
+    attack.progress.connect(lambda attempts, total, elapsed: events.append((attempts, total)))
+    attack.run()
+    assert events and len(events) < 1000
+    assert events[-1] == (36400, 36400)
@@ -0,0 +1,98 @@
+"""Tablas de cadenas arcoíris (`utils.rainbow_chains`)."""
+
+import hashlib
+
+import pytest
+
+from visual_password_attack_simulator.utils.keyspace import Keyspace, parse_mask
+from visual_password_attack_simulator.utils.password_requirements import meets_password_requirements
+from visual_password_attack_simulator.utils.rainbow_chains import (
+    ChainSpace,
+    RainbowChainTable,
+    generate_tables,
+    write_chain_tables,
+)
+
+KEYSPACE = Keyspace(parse_mask("Abcdefg?d?d?s"))
+CHAIN_LENGTH = 20
+TABLES = 2
+CHAINS = 30
+
+
+def sha256(password):
+    return hashlib.sha256(password.encode("utf-8")).digest()
+
+
+def chain_passwords(space, start, table):
+    """Contraseñas de cada columna de la cadena que empieza en ``start``."""
+    rank = start
+    passwords = []
+    for column in range(CHAIN_LENGTH):
+        password = space.candidate(rank)
+        passwords.append(password)
+        rank = space.reduce(sha256(password), table, column)
+    return passwords, rank
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate_tables(KEYSPACE, CHAIN_LENGTH, TABLES, CHAINS, seed=3)
+
+
+@pytest.fixture
+def chain_file(tmp_path, tables):
+    path = tmp_path / "rainbow_chains.bin"
+    write_chain_tables(path, KEYSPACE, CHAIN_LENGTH, tables)
+    return path
+
+
+def test_reductions_stay_in_the_valid_space():
+    """Cada reducción da un rango válido, distinto según la tabla."""
+    space = ChainSpace(KEYSPACE)
+    assert space.total == KEYSPACE.valid_count()
+    ranks = {table: space.reduce(sha256("x"), table, 5) for table in range(4)}
+    assert len(set(ranks.values())) > 1
+    for rank in ranks.values():
+        assert 0 <= rank < space.total
+        assert meets_password_requirements(space.candidate(rank))
+    with pytest.raises(ValueError):
+        ChainSpace(Keyspace(parse_mask("abcdefghij")))
+
+
+def test_tables_keep_walked_endpoints(tables):
+    """Cada final guardado es el de recorrer la cadena desde su inicio."""
+    space = ChainSpace(KEYSPACE)
+    assert len(tables) == TABLES
+    for table, chains in enumerate(tables):
+        assert 0 < len(chains) <= CHAINS
+        for endpoint, start in chains.items():
+            assert space.walk(start, table, 0, CHAIN_LENGTH) == endpoint
+    assert generate_tables(KEYSPACE, CHAIN_LENGTH, TABLES, CHAINS, workers=2, seed=3) == tables
+
+
+def test_lookup_finds_every_password_on_a_chain(chain_file, tables):
+    """Todas las contraseñas de una cadena guardada se recuperan de su hash."""
+    space = ChainSpace(KEYSPACE)
+    with RainbowChainTable(chain_file) as table_file:
+        assert (table_file.table_count, table_file.chain_length) == (TABLES, CHAIN_LENGTH)
+        assert table_file.chain_count == sum(len(chains) for chains in tables)
+        for table, chains in enumerate(tables):
+            start = next(iter(chains.values()))
+            passwords, _ = chain_passwords(space, start, table)
+            for password in passwords:
+                assert table_file.lookup(sha256(password)) == password
+        assert table_file.hashes > 0
+        assert table_file.lookup(sha256("no está en el espacio")) is None
+        assert table_file.lookup(sha256(passwords[0]), should_stop=lambda: True) is None
+
+
+def test_damaged_files_are_rejected(chain_file, tmp_path):
+    """Un archivo truncado o de otro formato no se abre."""
+    data = chain_file.read_bytes()
+    truncated = tmp_path / "truncada.bin"
+    truncated.write_bytes(data[:-1])
+    foreign = tmp_path / "ajena.bin"
+    foreign.write_bytes(b"XXXX" + data[4:])
+    for path in (truncated, foreign):
+        with pytest.raises(ValueError):
+            RainbowChainTable(path)
@@ -0,0 +1,47 @@
+"""Tabla arcoíris binaria (``utils/rainbow_format.py``)."""
+
+import hashlib
+import random
+
+import pytest
+
+from visual_password_attack_simulator.utils.rainbow_format import RainbowTableFile, write_rainbow_table
+
+
+def _entries(passwords):
+    return [(hashlib.sha256(p.encode("utf-8")).digest(), p) for p in passwords]
+
+
+def test_consulta_con_ordenacion_en_disco(tmp_path):
+    rng = random.Random(0)
+    passwords = sorted({
+        "".join(rng.choice("abcXYZ019#é") for _ in range(rng.randint(1, 12))) for _ in range(5000)
+    })
+    entries = _entries(passwords)
+    rng.shuffle(entries)
+    path = tmp_path / "rainbow_table.bin"
+    # Un búfer diminuto obliga a volcar y mezclar muchas runs
+    written = write_rainbow_table(path, entries + entries[:100], memory_bytes=4096, directory=tmp_path)
+    assert written == len(passwords)
+    assert not list(tmp_path.glob("rainbow-*"))
+    with RainbowTableFile(path) as table:
+        assert len(table) == len(passwords)
+        for digest, password in entries:
+            assert table.lookup(digest) == password
+        assert table.lookup(b"\0" * 32) is None
+
+
+def test_tabla_vacia(tmp_path):
+    path = tmp_path / "rainbow_table.bin"
+    assert write_rainbow_table(path, []) == 0
+    with RainbowTableFile(path) as table:
+        assert len(table) == 0
+        assert table.lookup(b"\1" * 32) is None
+
+
+def test_archivo_truncado(tmp_path):
+    path = tmp_path / "rainbow_table.bin"
+    write_rainbow_table(path, _entries(["Abcdefgh1#"]))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        RainbowTableFile(path)
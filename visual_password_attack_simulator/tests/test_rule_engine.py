@@ -0,0 +1,125 @@
+"""Reglas de mangling compiladas (`utils.rule_engine`)."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from visual_password_attack_simulator.bench.rules import _legacy_apply_rules
+from visual_password_attack_simulator.utils.password_requirements import meets_password_requirements
+from visual_password_attack_simulator.utils.rule_engine import (
+    DEFAULT_RULES_PATH,
+    CompiledRule,
+    RuleProgram,
+    RuleSyntaxError,
+)
+
+WORD_CHARS = "abcdeAB12@$"
+# Funciones sin argumentos y con argumentos (N posición, X carácter)
+SIMPLE_OPS = ":lucCtrdfq{}[]kK"
+ARG_OPS = ["TN", "UN", "DN", "'N", "xNN", "iNX", "oNX", "sXX", "@X", "zN", "ZN", "$X", "^X"]
+
+
+def random_rule(rng):
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.4:
+            parts.append(rng.choice(SIMPLE_OPS))
+            continue
+        template = rng.choice(ARG_OPS)
+        parts.append(template[0] + "".join(
+            str(rng.randint(0, 9)) if slot == "N" else rng.choice(WORD_CHARS) for slot in template[1:]
+        ))
+    return " ".join(parts)
+
+
+def random_words(rng, count=60):
+    return ["".join(rng.choice(WORD_CHARS) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("rule, word, expected", [
+    (":", "p@ssW0rd", "p@ssW0rd"),
+    ("l", "p@ssW0rd", "p@ssw0rd"),
+    ("u", "p@ssW0rd", "P@SSW0RD"),
+    ("c", "p@ssW0rd", "P@ssw0rd"),
+    ("C", "p@ssW0rd", "p@SSW0RD"),
+    ("t", "p@ssW0rd", "P@SSw0RD"),
+    ("T3", "p@ssW0rd", "p@sSW0rd"),
+    ("T4", "p@ssW0rd", "p@ssw0rd"),
+    ("U0", "p@ssW0rd", "P@ssW0rd"),
+    ("U4", "p@ssW0rd", "p@ssW0rd"),
+    ("U9", "p@ssW0rd", "p@ssW0rd"),
+    ("r", "p@ssW0rd", "dr0Wss@p"),
+    ("d", "p@ssW0rd", "p@ssW0rdp@ssW0rd"),
+    ("f", "p@ssW0rd", "p@ssW0rddr0Wss@p"),
+    ("q", "abc", "aabbcc"),
+    ("{", "p@ssW0rd", "@ssW0rdp"),
+    ("}", "p@ssW0rd", "dp@ssW0r"),
+    ("$1 $2", "p@ssW0rd", "p@ssW0rd12"),
+    ("^1 ^2", "p@ssW0rd", "21p@ssW0rd"),
+    ("[", "p@ssW0rd", "@ssW0rd"),
+    ("]", "p@ssW0rd", "p@ssW0r"),
+    ("D3", "p@ssW0rd", "p@sW0rd"),
+    ("'6", "p@ssW0rd", "p@ssW0"),
+    ("x04", "p@ssW0rd", "p@ss"),
+    ("i4!", "p@ssW0rd", "p@ss!W0rd"),
+    ("o3$", "p@ssW0rd", "p@s$W0rd"),
+    ("ss$", "p@ssW0rd", "p@$$W0rd"),
+    ("@s", "p@ssW0rd", "p@W0rd"),
+    ("z2", "p@ssW0rd", "ppp@ssW0rd"),
+    ("Z2", "p@ssW0rd", "p@ssW0rddd"),
+    ("k", "p@ssW0rd", "@pssW0rd"),
+    ("K", "p@ssW0rd", "p@ssW0dr"),
+])
+def test_functions_follow_hashcat_examples(rule, word, expected):
+    """Cada función da el resultado de los ejemplos de hashcat (``U`` es
+    propia: no invierte una mayúscula)."""
+    assert CompiledRule(rule).apply(word) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_batches_and_lengths_match_per_word_apply(seed):
+    """``apply_all`` y ``output_length`` coinciden con aplicar palabra a palabra."""
+    rng = random.Random(seed)
+    words = random_words(rng)
+    for _ in range(30):
+        rule = CompiledRule(random_rule(rng))
+        expected = [rule.apply(word) for word in words]
+        assert rule.apply_all(list(words)) == expected, rule.source
+        for word, result in zip(words, expected):
+            length = rule.output_length(len(word))
+            assert length is None or length == len(result), (rule.source, word)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_program_batch_matches_per_word_rules(seed):
+    """``apply_batch`` da los válidos de aplicar cada regla a cada palabra,
+    sin repetidos, y ``estimate`` es una cota superior."""
+    rng = random.Random(seed)
+    rules = [random_rule(rng) for _ in range(40)] + ["$1 $2", "c $1 $!"]
+    program = RuleProgram(rules)
+    words = random_words(rng) + ["abcdeab", "Abcd@ab1"]
+    batch = program.apply_batch(words)
+    expected = {rule.apply(word) for rule in program.rules for word in words}
+    assert batch and len(batch) == len(set(batch))
+    assert set(batch) == set(filter(meets_password_requirements, expected))
+    assert program.estimate(Counter(map(len, words))) >= len(batch)
+    assert set(program.apply(words[0])) == {rule.apply(words[0]) for rule in program.rules}
+
+
+def test_program_skips_comments_blank_and_duplicate_rules():
+    """Los comentarios, las líneas vacías y las reglas repetidas no cuentan."""
+    program = RuleProgram(["# comentario", "", "   ", "c", "c", "$1\n", "$1"])
+    assert [rule.source for rule in program.rules] == ["c", "$1"]
+    assert len(RuleProgram.from_file(DEFAULT_RULES_PATH)) > 0
+    for rule in ("Ñ", "$", "T", "xA", "s1"):
+        with pytest.raises(RuleSyntaxError):
+            CompiledRule(rule)
+
+
+@pytest.mark.parametrize("word", ["password", "Password", "passworD", "PASSWORD", "Salsa1", "a", ""])
+def test_default_rules_match_original_variants(word):
+    """Las reglas por defecto generan las mismas variantes que las reglas
+    fijas del ataque original."""
+    program = RuleProgram.from_file(DEFAULT_RULES_PATH)
+    assert set(program.apply(word)) == set(_legacy_apply_rules(word))
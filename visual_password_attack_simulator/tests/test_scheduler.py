@@ -0,0 +1,165 @@
+"""Planificador de ataques simultáneos (`attacks.scheduler`)."""
+
+import threading
+import time
+
+import pytest
+
+from visual_password_attack_simulator.attacks import scheduler as scheduler_module
+from visual_password_attack_simulator.attacks.base_attack import BaseAttack
+from visual_password_attack_simulator.attacks.scheduler import AttackScheduler
+from visual_password_attack_simulator.utils.hash_utils import sha256_hash
+
+
+class StubAttack(BaseAttack):
+    """Ataque de prueba: publica progreso ``steps`` veces o, con ``pooled``,
+    reparte porciones a través de su `WorkerLane`."""
+
+    def __init__(self, total=0, steps=40, pooled=False):
+        super().__init__(sha256_hash("stub"), progress_rate=0)
+        self.total_candidates = total
+        self.steps = steps
+        self.pooled = pooled
+
+    def run(self):
+        self.begin_progress()
+        lane = self.scheduler.lane(self) if self.pooled and self.scheduler is not None else None
+        done = 0
+        while done < self.steps and self.running:
+            if lane is None:
+                time.sleep(0.001)
+                done += 1
+                self.report_progress(done * 100)
+            elif lane.try_acquire():
+                time.sleep(0.002)
+                lane.release()
+                done += 1
+            else:
+                time.sleep(0.001)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", fake)
+    return fake
+
+
+def checked_scheduler(**kwargs):
+    """Planificador que anota si algún reparto supera el presupuesto."""
+    scheduler = AttackScheduler(**kwargs)
+    violations = []
+    take = scheduler._take
+
+    def take_checked(job, count, now):
+        take(job, count, now)
+        held = sum(other.held for other in scheduler._jobs.values())
+        if held > scheduler.workers or scheduler._free_workers < 0 or scheduler._free_threads < 0:
+            violations.append((held, scheduler._free_workers, scheduler._free_threads))
+
+    scheduler._take = take_checked
+    return scheduler, violations
+
+
+def test_concurrent_attacks_stay_within_budget():
+    """Con ataques secuenciales y en paralelo a la vez nunca se usan más
+    trabajadores de los disponibles y las fracciones suman como mucho 1."""
+    scheduler, violations = checked_scheduler(workers=2, slice_seconds=0.005)
+    attacks = [StubAttack(total=10 ** i) for i in (3, 6, 9)] + [StubAttack(pooled=True) for _ in range(2)]
+    threads = [threading.Thread(target=scheduler.run, args=(attack,)) for attack in attacks]
+    for thread in threads:
+        thread.start()
+    sums = []
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(0.01)
+        shares = scheduler.shares()
+        assert all(0.0 <= share <= 1.0 for share in shares.values())
+        sums.append(sum(shares.values()))
+    for thread in threads:
+        thread.join()
+    assert violations == []
+    assert sums and max(sums) <= 1.0 + 1e-9
+    assert scheduler._free_workers == 2 and scheduler._free_threads == 1
+    assert scheduler.active() == [] and all(attack.scheduler is None for attack in attacks)
+
+
+def _contend(clock, first_total, second_total):
+    """Ambos ataques usan un segundo de trabajador y, con ``first``
+    esperando, ``second`` libera el único trabajador: ¿a quién le toca?"""
+    scheduler = AttackScheduler(workers=1)
+    first, second = StubAttack(total=first_total), StubAttack(total=second_total)
+    scheduler._register(first)
+    scheduler._register(second)
+    first_lane, second_lane = scheduler.lane(first), scheduler.lane(second)
+    assert first_lane.try_acquire()
+    clock.now += 1
+    first_lane.release()
+    assert second_lane.try_acquire()
+    clock.now += 1
+    assert not first_lane.try_acquire()  # Queda esperando
+    second_lane.release()
+    return first_lane, second_lane
+
+
+def test_lower_expected_time_is_granted_first(clock):
+    """El ataque que antes terminaría acumula menos tiempo virtual y gana el
+    turno aunque llegara después y el otro ya estuviera esperando."""
+    slow_lane, fast_lane = _contend(clock, 10 ** 12, 1000)
+    assert fast_lane.try_acquire()
+    assert not slow_lane.try_acquire()
+
+
+def test_equal_attacks_tie_break_by_arrival_order(clock):
+    """Con el mismo peso y el mismo tiempo usado, gana el que llegó antes."""
+    first_lane, second_lane = _contend(clock, 1000, 1000)
+    assert not second_lane.try_acquire()
+    assert first_lane.try_acquire()
+
+
+def test_stopped_attack_stops_waiting_for_a_turn():
+    """Un ataque detenido mientras espera turno sale de `tick` sin turno."""
+    scheduler = AttackScheduler(workers=1, slice_seconds=60)
+    holder, waiter = StubAttack(), StubAttack()
+    scheduler._register(holder)
+    scheduler._register(waiter)
+    scheduler.tick(holder, 1)
+    assert scheduler._jobs[holder].thread_slot
+
+    thread = threading.Thread(target=scheduler.tick, args=(waiter, 1), daemon=True)
+    thread.start()
+    time.sleep(0.05)
+    assert thread.is_alive() and scheduler._jobs[waiter].waiting
+    waiter.stop()
+    thread.join(2 * scheduler_module.WAIT_INTERVAL + 1)
+    assert not thread.is_alive()
+    job = scheduler._jobs[waiter]
+    assert not job.thread_slot and not job.waiting and job.held == 0
+
+
+def test_unregister_returns_held_workers(clock):
+    """Al terminar un ataque se devuelven sus trabajadores y su plaza de hilo."""
+    scheduler = AttackScheduler(workers=3)
+    pooled, sequential = StubAttack(), StubAttack()
+    scheduler._register(pooled)
+    scheduler._register(sequential)
+    lane = scheduler.lane(pooled)
+    assert lane.try_acquire() and lane.try_acquire()
+    scheduler.tick(sequential, 1)
+    assert scheduler._free_workers == 0 and scheduler._free_threads == 0
+    clock.now += 1
+    scheduler._unregister(pooled)
+    assert scheduler._free_workers == 2
+    # Un `release` tardío del ataque ya retirado no cuenta dos veces
+    lane.release()
+    assert scheduler._free_workers == 2 and not lane.try_acquire()
+    scheduler._unregister(sequential)
+    assert scheduler._free_workers == 3 and scheduler._free_threads == 1
+    assert pooled.scheduler is None and sequential.scheduler is None
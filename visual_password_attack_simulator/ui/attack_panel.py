@@ -3,9 +3,16 @@ Componente gráfico reutilizable para representar un ataque individual en la
 interfaz.  Cada panel muestra controles para iniciar y detener el ataque,
 una barra de progreso, estadísticas de intentos y tiempo, un área de log
 tipo terminal y un gráfico simple de velocidad de intentos por segundo.
+
+Los ataques que admiten reanudación guardan puntos de control mientras se
+ejecutan; el botón "Reanudar" continúa desde el último guardado para el
+mismo ataque y objetivo.
+
+Si la ventana comparte un ``AttackScheduler`` entre los paneles, cada uno
+muestra la parte de la CPU que usa su ataque (`show_share`).
 """
 
-from typing import Type, Optional
+from typing import Type, Optional, Tuple
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -14,19 +21,28 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSlot
 import pyqtgraph as pg
 
-from ..attacks.base_attack import AttackThread
+from .attack_thread import AttackThread
+from ..attacks.base_attack import BaseAttack
+from ..attacks.scheduler import AttackScheduler
+from ..utils.checkpoint import Checkpoint, checkpoint_path
+from ..utils.hash_rate import HashRates
 
 
 class AttackPanel(QWidget):
     """Panel que gestiona la ejecución y visualización de un ataque."""
 
-    def __init__(self, attack_cls: Type[AttackThread], attack_args: list, attack_kwargs: dict, nombre: str, parent: Optional[QWidget] = None) -> None:
+    def __init__(self, attack_cls: Type[BaseAttack], attack_args: list, attack_kwargs: dict, nombre: str, parent: Optional[QWidget] = None, scheduler: Optional[AttackScheduler] = None) -> None:
         super().__init__(parent)
+        self.scheduler = scheduler
         self.attack_cls = attack_cls
         self.attack_args = attack_args
         self.attack_kwargs = attack_kwargs
         self.attack_thread: Optional[AttackThread] = None
         self.nombre = nombre
+        self.checkpoint_file = checkpoint_path(attack_cls.__name__)
+        # Si el ataque publica su posición en el espacio de claves, la barra
+        # de progreso la usa en lugar del conteo de intentos filtrados
+        self._keyspace_driven = False
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -41,8 +57,11 @@ class AttackPanel(QWidget):
         self.stop_btn = QPushButton("Detener")
         self.stop_btn.setEnabled(False)
         self.stop_btn.clicked.connect(self.stop_attack)
+        self.resume_btn = QPushButton("Reanudar")
+        self.resume_btn.clicked.connect(self.resume_attack)
         btn_layout.addWidget(self.start_btn)
         btn_layout.addWidget(self.stop_btn)
+        btn_layout.addWidget(self.resume_btn)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
         # Barra de progreso
@@ -54,9 +73,12 @@ class AttackPanel(QWidget):
         self.attempts_label = QLabel("Intentos: 0")
         self.time_label = QLabel("Tiempo: 0.0s")
         self.rate_label = QLabel("Velocidad: 0/s")
+        self.share_label = QLabel("CPU: -")
         stats_layout.addWidget(self.attempts_label)
         stats_layout.addWidget(self.time_label)
         stats_layout.addWidget(self.rate_label)
+        stats_layout.addWidget(self.share_label)
+        self.share_label.setVisible(self.scheduler is not None)
         stats_layout.addStretch()
         layout.addLayout(stats_layout)
         # Área de log tipo terminal
@@ -79,24 +101,70 @@ class AttackPanel(QWidget):
         self.times: list = []
         self.rates: list = []
         layout.addWidget(self.plot_widget)
+        self._update_resume_button()
+
+    def _saved_checkpoint(self) -> Optional[Checkpoint]:
+        """Punto de control guardado para este ataque y objetivo, si existe."""
+        if self.attack_cls.resume_param is None:
+            return None
+        checkpoint = Checkpoint.load(self.checkpoint_file)
+        if checkpoint is None or checkpoint.attack != self.attack_cls.__name__:
+            return None
+        target = self.attack_args[0] if self.attack_args else None
+        targets = [target] if isinstance(target, str) else list(target or [])
+        if checkpoint.target_hashes != [h.strip() for h in targets]:
+            return None
+        return checkpoint
+
+    def _update_resume_button(self) -> None:
+        running = bool(self.attack_thread and self.attack_thread.isRunning())
+        self.resume_btn.setEnabled(not running and self._saved_checkpoint() is not None)
 
     @pyqtSlot()
     def start_attack(self) -> None:
-        """Instancia y lanza el hilo del ataque."""
+        """Instancia y lanza el hilo del ataque desde el principio."""
+        self._launch()
+
+    @pyqtSlot()
+    def resume_attack(self) -> None:
+        """Continúa el ataque desde el último punto de control."""
+        checkpoint = self._saved_checkpoint()
+        if checkpoint is not None:
+            self._launch(checkpoint)
+        self._update_resume_button()
+
+    def _launch(self, checkpoint: Optional[Checkpoint] = None) -> None:
         if self.attack_thread and self.attack_thread.isRunning():
             return
         # Reset UI
         self.log_area.clear()
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.attempts_label.setText("Intentos: 0")
         self.time_label.setText("Tiempo: 0.0s")
         self.rate_label.setText("Velocidad: 0/s")
         self.times = []
         self.rates = []
         self.curve.setData([], [])
-        # Crear hilo
-        self.attack_thread = self.attack_cls(*self.attack_args, **self.attack_kwargs)
+        self._keyspace_driven = False
+        # Crear el ataque y su hilo
+        kwargs = dict(self.attack_kwargs)
+        if checkpoint is not None:
+            kwargs[self.attack_cls.resume_param] = checkpoint.position
+        attack = self.attack_cls(*self.attack_args, **kwargs)
+        if checkpoint is not None:
+            if not checkpoint.matches(self.attack_cls.__name__, attack.checkpoint_params(), attack.target_hashes):
+                self.log_area.appendPlainText("El punto de control guardado corresponde a otra configuración del ataque.")
+                return
+            attack.resume_from(checkpoint)
+            self.log_area.appendPlainText(
+                f"Reanudando desde la posición {checkpoint.position:,} ({checkpoint.attempts:,} intentos previos)."
+            )
+        if self.attack_cls.resume_param is not None:
+            attack.checkpoint_path = self.checkpoint_file
+        self.attack_thread = AttackThread(attack, self.scheduler)
         self.attack_thread.progress.connect(self.on_progress)
+        self.attack_thread.keyspace_progress.connect(self.on_keyspace_progress)
         self.attack_thread.found.connect(self.on_found)
         self.attack_thread.log.connect(self.on_log)
         self.attack_thread.finished.connect(self.on_finished)
@@ -104,6 +172,7 @@ class AttackPanel(QWidget):
         # Actualizar botones
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
+        self.resume_btn.setEnabled(False)
 
     @pyqtSlot()
     def stop_attack(self) -> None:
@@ -112,7 +181,7 @@ class AttackPanel(QWidget):
             self.attack_thread.stop()
         self.stop_btn.setEnabled(False)
 
-    @pyqtSlot(int, int, float)
+    @pyqtSlot(object, object, float)
     def on_progress(self, attempts: int, total: int, elapsed: float) -> None:
         """Actualiza la interfaz con el progreso del ataque."""
         self.attempts_label.setText(f"Intentos: {attempts}")
@@ -120,7 +189,7 @@ class AttackPanel(QWidget):
         rate = attempts / elapsed if elapsed > 0 else 0.0
         self.rate_label.setText(f"Velocidad: {rate:.1f}/s")
         # Actualizar barra de progreso si se conoce el total
-        if total > 0:
+        if total > 0 and not self._keyspace_driven:
             value = int(min(100, attempts / total * 100))
             self.progress_bar.setValue(value)
         # Añadir datos a la gráfica cada cierto número de muestras
@@ -129,7 +198,16 @@ class AttackPanel(QWidget):
             self.rates.append(rate)
             self.curve.setData(self.times, self.rates)
 
-    @pyqtSlot(str, int, float)
+    @pyqtSlot(object, object)
+    def on_keyspace_progress(self, position: int, size: int) -> None:
+        """Muestra la posición exacta dentro del espacio de claves."""
+        if size <= 0:
+            return
+        self._keyspace_driven = True
+        self.progress_bar.setValue(int(min(100, position / size * 100)))
+        self.progress_bar.setFormat(f"%p% (posición {position:,} de {size:,})")
+
+    @pyqtSlot(str, object, float)
     def on_found(self, password: str, attempts: int, elapsed: float) -> None:
         """Muestra el resultado cuando se encuentra la contraseña."""
         self.log_area.appendPlainText(f"\n>>> Contraseña encontrada: {password} (intentos: {attempts}, tiempo: {elapsed:.2f}s)")
@@ -143,8 +221,29 @@ class AttackPanel(QWidget):
         # Desplazarse al final
         self.log_area.verticalScrollBar().setValue(self.log_area.verticalScrollBar().maximum())
 
+    def estimate(self, rates: HashRates) -> Tuple[Optional[int], Optional[float]]:
+        """Candidatos y segundos para agotar el ataque, sin construirlo.
+
+        Solo lee metadatos (ver `BaseAttack.estimate`), así que puede
+        llamarse desde el hilo de la interfaz.
+        """
+        return self.attack_cls.estimate(rates, *self.attack_args, **self.attack_kwargs)
+
+    @property
+    def attack(self) -> Optional[BaseAttack]:
+        """Ataque en ejecución, si lo hay."""
+        if self.attack_thread and self.attack_thread.isRunning():
+            return self.attack_thread.attack
+        return None
+
+    def show_share(self, share: Optional[float]) -> None:
+        """Muestra la fracción de la CPU del planificador que usa el ataque."""
+        self.share_label.setText("CPU: -" if share is None else f"CPU: {share:.0%}")
+
     @pyqtSlot()
     def on_finished(self) -> None:
         """Se ejecuta cuando el hilo finaliza (con éxito o no)."""
+        self.show_share(None)
         self.start_btn.setEnabled(True)
-        self.stop_btn.setEnabled(False)
\ No newline at end of file
+        self.stop_btn.setEnabled(False)
+        self._update_resume_button()
\ No newline at end of file
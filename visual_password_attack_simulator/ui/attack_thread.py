@@ -0,0 +1,53 @@
+"""
+Ejecución de un ataque en un hilo de Qt.
+
+Los ataques (``attacks``) no dependen de Qt; `AttackThread` ejecuta uno en
+un QThread y reenvía sus señales a señales de Qt, que la interfaz recibe
+en su propio hilo.  `finished` es la señal propia de QThread y se emite
+una sola vez, cuando `run` termina.  Con un ``AttackScheduler`` el ataque
+comparte la CPU con los de las demás pestañas.
+"""
+
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from ..attacks.base_attack import BaseAttack
+from ..attacks.scheduler import AttackScheduler
+
+
+class AttackThread(QThread):
+    """Hilo que ejecuta un `BaseAttack`.
+
+    Señales: las mismas que `BaseAttack` (ver su documentación).
+    """
+    # Qt limita los int de las señales a 32 bits; intentos, totales y
+    # posiciones pueden superar ese rango (la fuerza bruta ronda 1e18)
+    progress = pyqtSignal(object, object, float)
+    keyspace_progress = pyqtSignal(object, object)
+    found = pyqtSignal(str, object, float)
+    log = pyqtSignal(str)
+
+    def __init__(
+        self,
+        attack: BaseAttack,
+        scheduler: Optional[AttackScheduler] = None,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.attack = attack
+        self.scheduler = scheduler
+        attack.progress.connect(self.progress.emit)
+        attack.keyspace_progress.connect(self.keyspace_progress.emit)
+        attack.found.connect(self.found.emit)
+        attack.log.connect(self.log.emit)
+
+    def stop(self) -> None:
+        """Solicita la detención del ataque."""
+        self.attack.stop()
+
+    def run(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.run(self.attack)
+        else:
+            self.attack.run()
@@ -0,0 +1,56 @@
+"""
+Generación de los diccionarios personalizados en un hilo de Qt.
+
+`CustomDictionaryThread` ejecuta `generate_custom_files` fuera del hilo de
+la interfaz, de modo que la ventana sigue respondiendo.  Informa del
+progreso con `progress`, se cancela con `stop` y, si termina, emite
+`generated` con las rutas de los archivos ya completos; si las palabras
+clave no son válidas emite `failed`.  `finished` es la señal propia de
+QThread y se emite siempre al terminar.
+"""
+
+import threading
+from typing import List, Optional
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from ..utils.custom_generators import TARGET_SIZE_DEFAULT, generate_custom_files
+
+
+class CustomDictionaryThread(QThread):
+    """Hilo que genera ``custom_dictionary.txt`` y ``custom_hybrid_bases.txt``."""
+    progress = pyqtSignal(int, int)
+    generated = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        keywords: List[str],
+        target_size: int = TARGET_SIZE_DEFAULT,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.keywords = keywords
+        self.target_size = target_size
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Solicita la cancelación; los archivos anteriores no se tocan."""
+        self._stop_event.set()
+
+    def cancelled(self) -> bool:
+        return self._stop_event.is_set()
+
+    def run(self) -> None:
+        try:
+            paths = generate_custom_files(
+                self.keywords,
+                self.target_size,
+                on_progress=self.progress.emit,
+                should_stop=self._stop_event.is_set,
+            )
+        except (ValueError, OSError) as exc:
+            self.failed.emit(str(exc))
+            return
+        if paths is not None:
+            self.generated.emit(*paths)
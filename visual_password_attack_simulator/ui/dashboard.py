@@ -6,6 +6,18 @@ tema oscuro.  Permite al usuario introducir una contraseña, evaluar su
 fortaleza y visualizar varias técnicas de ataque funcionando en tiempo
 real.  Cada tipo de ataque se presenta en una pestaña propia con
 indicadores de progreso, gráficos y registros de actividad.
+
+Los ataques de todas las pestañas comparten un ``AttackScheduler``: aunque
+se lancen todos a la vez no usan más núcleos que el presupuesto (todos
+menos uno) y cada pestaña muestra la parte de la CPU que recibe.
+
+Al arrancar se obtiene la velocidad de hashing de la máquina (medida una
+vez y guardada, ver ``utils.hash_rate``); el resumen del análisis muestra
+con ella cuánto tardaría cada ataque en agotar sus candidatos.
+
+Los diccionarios personalizados se generan en un hilo aparte
+(`CustomDictionaryThread`) con barra de progreso y cancelación; la
+casilla para usarlos solo se habilita cuando los archivos están completos.
 """
 
 import re
@@ -14,18 +26,22 @@ from typing import Optional, Tuple
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
-    QVBoxLayout, QHBoxLayout, QTabWidget, QMessageBox, QGroupBox, QPlainTextEdit, QCheckBox
+    QVBoxLayout, QHBoxLayout, QTabWidget, QMessageBox, QGroupBox, QPlainTextEdit, QCheckBox,
+    QProgressBar
 )
 from PyQt5.QtGui import QRegExpValidator
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QRegExp, QTimer
 
+from ..utils.hash_rate import format_duration, load_hash_rates
 from ..utils.hash_utils import analyze_password, sha256_hash
+from ..utils.parallel_search import default_workers
 from ..utils.custom_generators import (
     CUSTOM_DICTIONARY_PATH,
     CUSTOM_HYBRID_BASES_PATH,
-    generate_custom_files,
 )
 from .attack_panel import AttackPanel
+from .custom_dictionary_thread import CustomDictionaryThread
+from ..attacks.scheduler import AttackScheduler
 from ..attacks.brute_force import BruteForceAttack
 from ..attacks.dictionary_attack import DictionaryAttack
 from ..attacks.hybrid_attack import HybridAttack
@@ -43,6 +59,9 @@ REQUIREMENT_DEFINITIONS = [
     ("accents", "C. No debe contener Ñ, ñ ni vocales acentuadas."),
     ("case", "D. Debe incluir al menos una letra mayúscula y una minúscula."),
 ]
+# Milisegundos entre actualizaciones del reparto de CPU en las pestañas
+SHARE_REFRESH_MS = 1000
+GENERATE_BUTTON_TEXT = "Generar archivos personalizados"
 
 
 class DashboardWindow(QMainWindow):
@@ -52,7 +71,13 @@ class DashboardWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Simulador de Ataques de Contraseñas")
         self.resize(1000, 800)
+        self.hash_rates = load_hash_rates()
+        self.scheduler = AttackScheduler(default_rate=self.hash_rates.batched)
+        self.custom_thread: Optional[CustomDictionaryThread] = None
         self._build_ui()
+        self.share_timer = QTimer(self)
+        self.share_timer.timeout.connect(self.refresh_shares)
+        self.share_timer.start(SHARE_REFRESH_MS)
 
     def _build_ui(self) -> None:
         central = QWidget()
@@ -114,13 +139,17 @@ class DashboardWindow(QMainWindow):
         info_label.setWordWrap(True)
         self.keywords_edit = QPlainTextEdit()
         self.keywords_edit.setPlaceholderText('"ibero", "seguridad", "robotica"')
-        generate_button = QPushButton("Generar archivos personalizados")
-        generate_button.clicked.connect(self.generate_custom_dictionaries)
+        self.generate_button = QPushButton(GENERATE_BUTTON_TEXT)
+        self.generate_button.clicked.connect(self.generate_custom_dictionaries)
+        self.custom_progress = QProgressBar()
+        self.custom_progress.setVisible(False)
         self.use_custom_checkbox = QCheckBox("Usar diccionarios personalizados (si existen)")
+        self.use_custom_checkbox.setEnabled(self._custom_files_available())
         self.use_custom_checkbox.stateChanged.connect(self.on_custom_checkbox_changed)
         custom_layout.addWidget(info_label)
         custom_layout.addWidget(self.keywords_edit)
-        custom_layout.addWidget(generate_button)
+        custom_layout.addWidget(self.generate_button)
+        custom_layout.addWidget(self.custom_progress)
         custom_layout.addWidget(self.use_custom_checkbox)
         self.custom_group.setLayout(custom_layout)
         parent_layout.addWidget(self.custom_group)
@@ -138,7 +167,12 @@ class DashboardWindow(QMainWindow):
         return words
 
     def generate_custom_dictionaries(self) -> None:
-        """Genera los archivos personalizados desde las palabras clave."""
+        """Genera los archivos personalizados en segundo plano, o cancela la
+        generación en curso."""
+        if self.custom_thread is not None and self.custom_thread.isRunning():
+            self.custom_thread.stop()
+            self.generate_button.setEnabled(False)
+            return
         keywords = self._parse_keywords_input()
         if not keywords:
             QMessageBox.warning(
@@ -147,11 +181,42 @@ class DashboardWindow(QMainWindow):
                 "Introduce al menos una palabra clave en el formato indicado.",
             )
             return
-        try:
-            dict_path, hybrid_path = generate_custom_files(keywords)
-        except ValueError as exc:
-            QMessageBox.warning(self, "Error al generar", str(exc))
-            return
+        self.custom_thread = CustomDictionaryThread(keywords)
+        self.custom_thread.progress.connect(self.on_custom_progress)
+        self.custom_thread.generated.connect(self.on_custom_generated)
+        self.custom_thread.failed.connect(self.on_custom_failed)
+        self.custom_thread.finished.connect(self.on_custom_finished)
+        # Mientras se generan, los archivos no se pueden activar
+        self.use_custom_checkbox.setEnabled(False)
+        self.custom_progress.setValue(0)
+        self.custom_progress.setFormat("%p%")
+        self.custom_progress.setVisible(True)
+        self.generate_button.setText("Cancelar generación")
+        self.custom_thread.start()
+
+    def on_custom_progress(self, done: int, total: int) -> None:
+        """Actualiza la barra de progreso de la generación."""
+        self.custom_progress.setMaximum(max(1, total))
+        self.custom_progress.setValue(done)
+        self.custom_progress.setFormat(f"%p% ({done:,} de {total:,} contraseñas)")
+
+    def on_custom_failed(self, message: str) -> None:
+        """Muestra el error de una generación que no pudo completarse."""
+        QMessageBox.warning(self, "Error al generar", message)
+
+    def on_custom_finished(self) -> None:
+        """Restaura los controles cuando el hilo de generación termina."""
+        self.custom_progress.setVisible(False)
+        self.generate_button.setText(GENERATE_BUTTON_TEXT)
+        self.generate_button.setEnabled(True)
+        self.use_custom_checkbox.setEnabled(self._custom_files_available())
+
+    def on_custom_generated(self, dict_path, hybrid_path) -> None:
+        """Activa los archivos recién generados (ya completos).
+
+        Los controles los restaura `on_custom_finished` cuando el hilo
+        termina de verdad.
+        """
         QMessageBox.information(
             self,
             "Diccionarios generados",
@@ -198,6 +263,13 @@ class DashboardWindow(QMainWindow):
         if self.password_edit.text():
             self.analyze()
 
+    def closeEvent(self, event) -> None:
+        """Cancela la generación en curso antes de cerrar la ventana."""
+        if self.custom_thread is not None and self.custom_thread.isRunning():
+            self.custom_thread.stop()
+            self.custom_thread.wait()
+        super().closeEvent(event)
+
     def apply_dark_theme(self) -> None:
         """Aplica un estilo oscuro al entorno (colores básicos)."""
         dark_style = """
@@ -271,20 +343,20 @@ class DashboardWindow(QMainWindow):
         ]
         if analysis.suggestions:
             summary_lines.append("Sugerencias: " + "; ".join(analysis.suggestions))
-        self.summary_label.setText("\n".join(summary_lines))
         h = sha256_hash(pwd)
         # Limpiar pestañas anteriores
         self.tabs.clear()
         self.attack_panels.clear()
         # Fuerza Bruta
-        bf_panel = AttackPanel(BruteForceAttack, [h], {'alphabet': None, 'max_length': 4}, "Fuerza Bruta")
+        bf_kwargs = {'alphabet': None, 'max_length': 4, 'workers': default_workers()}
+        bf_panel = AttackPanel(BruteForceAttack, [h], bf_kwargs, "Fuerza Bruta", scheduler=self.scheduler)
         self.tabs.addTab(bf_panel, "Fuerza Bruta")
         self.attack_panels['brute'] = bf_panel
         # Diccionario
         dict_kwargs = {}
         if custom_dict_path:
             dict_kwargs['dictionary_path'] = custom_dict_path
-        dict_panel = AttackPanel(DictionaryAttack, [h], dict_kwargs, "Diccionario")
+        dict_panel = AttackPanel(DictionaryAttack, [h], dict_kwargs, "Diccionario", scheduler=self.scheduler)
         self.tabs.addTab(dict_panel, "Diccionario")
         self.attack_panels['dictionary'] = dict_panel
         # Híbrido
@@ -292,28 +364,54 @@ class DashboardWindow(QMainWindow):
         if custom_hybrid_path:
             hybrid_kwargs['dictionary_path'] = custom_hybrid_path
             hybrid_kwargs['max_suffix'] = 50000
-        hybrid_panel = AttackPanel(HybridAttack, [h], hybrid_kwargs, "Híbrido")
+        hybrid_panel = AttackPanel(HybridAttack, [h], hybrid_kwargs, "Híbrido", scheduler=self.scheduler)
         self.tabs.addTab(hybrid_panel, "Híbrido")
         self.attack_panels['hybrid'] = hybrid_panel
         # Máscara
         mask_args = [h]
-        mask_kwargs = {}
+        mask_kwargs = {'workers': default_workers()}
         if custom_hybrid_path:
             mask_kwargs['mask_source'] = custom_hybrid_path
-        mask_panel = AttackPanel(MaskAttack, mask_args, mask_kwargs, "Máscara")
+        mask_panel = AttackPanel(MaskAttack, mask_args, mask_kwargs, "Máscara", scheduler=self.scheduler)
         self.tabs.addTab(mask_panel, "Máscara")
         self.attack_panels['mask'] = mask_panel
         # Reglas
         rule_kwargs = {}
         if custom_dict_path:
             rule_kwargs['dictionary_path'] = custom_dict_path
-        rule_panel = AttackPanel(RuleBasedAttack, [h], rule_kwargs, "Reglas")
+        rule_panel = AttackPanel(RuleBasedAttack, [h], rule_kwargs, "Reglas", scheduler=self.scheduler)
         self.tabs.addTab(rule_panel, "Reglas")
         self.attack_panels['rule'] = rule_panel
         # Tabla arcoíris
-        rainbow_panel = AttackPanel(RainbowTableAttack, [h], {}, "Tabla Arcoíris")
+        rainbow_panel = AttackPanel(RainbowTableAttack, [h], {}, "Tabla Arcoíris", scheduler=self.scheduler)
         self.tabs.addTab(rainbow_panel, "Arcoíris")
         self.attack_panels['rainbow'] = rainbow_panel
+        summary_lines.extend(self._estimate_lines())
+        self.summary_label.setText("\n".join(summary_lines))
+
+    def _estimate_lines(self) -> list[str]:
+        """Tiempo para agotar cada ataque con la velocidad medida en esta máquina."""
+        rates = self.hash_rates
+        lines = [
+            f"Tiempo para agotar cada ataque ({rates.batched:,.0f} hashes/s por lotes, "
+            f"{rates.prefix:,.0f}/s por proceso en fuerza bruta y máscara):"
+        ]
+        for panel in self.attack_panels.values():
+            count, seconds = panel.estimate(rates)
+            if count is None:
+                # Sin índice ni cabecera que lo diga habría que recorrer los candidatos
+                lines.append(f"  - {panel.nombre}: desconocido")
+                continue
+            lines.append(f"  - {panel.nombre}: {format_duration(seconds)} ({count:,} candidatos)")
+        return lines
+
+    def refresh_shares(self) -> None:
+        """Muestra en cada pestaña la parte de la CPU que usa su ataque."""
+        shares = self.scheduler.shares()
+        for panel in self.attack_panels.values():
+            attack = panel.attack
+            if attack is not None:
+                panel.show_share(shares.get(attack, 0.0))
 
     def on_password_input(self, text: str) -> None:
         """Actualiza el estado de los requisitos mientras se escribe."""
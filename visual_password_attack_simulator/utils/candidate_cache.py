@@ -0,0 +1,181 @@
+"""
+Caché de candidatos compartida por los ataques basados en diccionarios.
+
+Los ataques de diccionario, reglas e híbrido leen las mismas listas de
+palabras.  Sin caché, cada ejecución (y cada pestaña) vuelve a leer el
+archivo, recortar cada línea y validar cada palabra.  `CandidateCache`
+guarda el resultado ya procesado en memoria para todo el proceso:
+
+- ``valid_candidates``: entradas que cumplen la política, ya codificadas
+  en bytes y listas para hashear (ataque de diccionario),
+- ``base_words``: líneas no vacías ya recortadas (palabras base de los
+  ataques por reglas e híbrido).
+
+Las entradas se identifican por ruta, fecha de modificación y tamaño, de
+modo que un archivo modificado se vuelve a leer.  Cuando la memoria
+ocupada supera el límite se descartan las menos usadas recientemente; un
+archivo que por sí solo no cabe no se guarda y el ataque lo recorre en
+streaming.  La caché recuerda que no cabe (para esa versión del archivo)
+y no vuelve a leerlo para descubrirlo.  Es segura entre hilos: si dos
+ataques piden a la vez el mismo archivo, solo uno lo lee.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .dictionary_index import DictionaryIndex, IndexBuilder, parse_entry
+
+# Memoria máxima (aproximada) que ocupan todas las entradas de la caché
+CACHE_MEMORY_LIMIT = 256 * 1024 * 1024
+
+_Key = Tuple[str, int, int, str]
+# Tamaño de un puntero de la lista más la cabecera de cada objeto
+_BYTES_OVERHEAD = sys.getsizeof(b'') + 8
+_STR_OVERHEAD = sys.getsizeof('') + 8
+
+
+def _load_valid(path: Path, limit: int) -> Optional[Tuple[List[bytes], int]]:
+    """Lee las entradas válidas codificadas; construye el índice si falta."""
+    stat = path.stat()
+    builder = IndexBuilder() if DictionaryIndex.load(path) is None else None
+    items: List[bytes] = []
+    size = 0
+    with path.open('rb') as f:
+        for raw in f:
+            word = parse_entry(raw)
+            if builder is not None:
+                builder.add(raw, word is not None)
+            if word is None:
+                continue
+            encoded = word.encode('utf-8')
+            items.append(encoded)
+            size += _BYTES_OVERHEAD + len(encoded)
+            if size > limit:
+                return None
+    if builder is not None:
+        builder.finish(path, stat)
+    return items, size
+
+
+def _load_words(path: Path, limit: int) -> Optional[Tuple[List[str], int]]:
+    """Lee las líneas no vacías ya recortadas."""
+    items: List[str] = []
+    size = 0
+    with path.open('r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip()
+            if not word:
+                continue
+            items.append(word)
+            size += _STR_OVERHEAD + len(word)
+            if size > limit:
+                return None
+    return items, size
+
+
+class CandidateCache:
+    """Caché LRU, limitada en memoria, de listas de candidatos por archivo."""
+
+    def __init__(self, max_bytes: int = CACHE_MEMORY_LIMIT) -> None:
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries: "OrderedDict[_Key, Tuple[list, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[_Key, threading.Lock] = {}
+        # Archivos que no cupieron, con el límite con el que se intentó
+        self._too_large: Dict[_Key, int] = {}
+
+    def valid_candidates(self, path: Union[str, Path]) -> Optional[List[bytes]]:
+        """Entradas del diccionario que cumplen la política, en bytes.
+
+        Returns:
+            La lista compartida (no debe modificarse) o ``None`` si el
+            archivo no cabe en la caché.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+        """
+        return self._get(Path(path), 'valid', _load_valid)
+
+    def base_words(self, path: Union[str, Path]) -> Optional[List[str]]:
+        """Líneas no vacías y recortadas del archivo (o ``None`` si no cabe)."""
+        return self._get(Path(path), 'words', _load_words)
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self._too_large.clear()
+            self.used_bytes = 0
+
+    def _lookup(self, key: _Key) -> Tuple[bool, Optional[list]]:
+        """Resultado ya conocido de ``key``: ``(True, lista o None)`` o ``(False, None)``.
+
+        Debe llamarse con ``_lock`` tomado.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return True, entry[0]
+        if self._too_large.get(key, -1) >= self.max_bytes:
+            return True, None
+        return False, None
+
+    def _get(
+        self,
+        path: Path,
+        kind: str,
+        loader: Callable[[Path, int], Optional[Tuple[list, int]]],
+    ) -> Optional[list]:
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size, kind)
+        with self._lock:
+            known, items = self._lookup(key)
+            if known:
+                return items
+            load_lock = self._loading.setdefault(key, threading.Lock())
+        # Solo un hilo lee cada archivo; los demás esperan su resultado
+        with load_lock:
+            with self._lock:
+                known, items = self._lookup(key)
+                if known:
+                    return items
+            try:
+                limit = self.max_bytes
+                loaded = loader(path, limit)
+                with self._lock:
+                    # Las versiones anteriores del mismo archivo ya no sirven
+                    for old in [k for k in self._entries if k[0] == key[0] and k[3] == kind]:
+                        self.used_bytes -= self._entries.pop(old)[1]
+                    for old in [k for k in self._too_large if k[0] == key[0] and k[3] == kind]:
+                        del self._too_large[old]
+                    if loaded is None:
+                        self._too_large[key] = limit
+                        return None
+                    items, size = loaded
+                    self._entries[key] = (items, size)
+                    self.used_bytes += size
+                    while self.used_bytes > self.max_bytes and len(self._entries) > 1:
+                        _, (_, evicted) = self._entries.popitem(last=False)
+                        self.used_bytes -= evicted
+                return items
+            finally:
+                # Después de guardar el resultado: quien llegue ahora lo encuentra
+                with self._lock:
+                    self._loading.pop(key, None)
+
+
+# Caché compartida por todos los ataques del proceso
+CANDIDATE_CACHE = CandidateCache()
+
+
+__all__ = [
+    "CACHE_MEMORY_LIMIT",
+    "CANDIDATE_CACHE",
+    "CandidateCache",
+]
@@ -0,0 +1,112 @@
+"""
+Puntos de control para reanudar ataques largos.
+
+Un punto de control guarda lo necesario para continuar un ataque
+exactamente donde se detuvo:
+
+- el tipo de ataque y los parámetros con los que se creó,
+- los hashes objetivo y los que aún no se han descubierto,
+- la posición desde la que continuar (índice del espacio de claves o
+  número de entrada válida del diccionario),
+- los intentos y el tiempo acumulados, para que el progreso continúe.
+
+Se escribe como JSON en ``checkpoints/<Ataque>.json``, primero en un
+temporal que después se renombra, de modo que una interrupción nunca deja
+un archivo a medias.  Los ataques lo actualizan como mucho cada
+`CHECKPOINT_INTERVAL` segundos y al cancelarse, y lo borran al terminar.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent / "checkpoints"
+# Segundos mínimos entre dos escrituras periódicas
+CHECKPOINT_INTERVAL = 5.0
+
+
+def checkpoint_path(name: str) -> Path:
+    """Ruta del punto de control de un ataque (por nombre de clase)."""
+    return CHECKPOINT_DIR / f"{name}.json"
+
+
+def _normalize(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """Parámetros tal como quedan tras guardarlos en JSON."""
+    return json.loads(json.dumps(dict(params), default=str))
+
+
+@dataclass
+class Checkpoint:
+    """Estado guardado de un ataque.
+
+    Atributos:
+        attack: Nombre de la clase del ataque.
+        params: Parámetros del constructor (sin el de reanudación).
+        target_hashes: Hashes objetivo en el orden original.
+        pending_hashes: Hashes aún sin descubrir.
+        position: Posición desde la que continuar.
+        attempts: Intentos realizados hasta ``position``.
+        elapsed: Segundos de ataque acumulados.
+    """
+    attack: str
+    params: Dict[str, Any]
+    target_hashes: List[str]
+    pending_hashes: List[str]
+    position: int
+    attempts: int
+    elapsed: float = 0.0
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["Checkpoint"]:
+        """Lee un punto de control; ``None`` si no existe o está dañado."""
+        try:
+            data = json.loads(Path(path).read_text(encoding='utf-8'))
+            if data.pop('version') != CHECKPOINT_VERSION:
+                return None
+            return cls(**data)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Guarda el punto de control (escritura atómica)."""
+        target = Path(path)
+        tmp_path = target.with_name(target.name + '.tmp')
+        data = {'version': CHECKPOINT_VERSION, **asdict(self)}
+        data['params'] = _normalize(self.params)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(tmp_path, target)
+        except OSError:
+            # Un punto de control que no se puede escribir no debe detener el ataque
+            tmp_path.unlink(missing_ok=True)
+
+    def matches(self, attack: str, params: Mapping[str, Any], target_hashes: Sequence[str]) -> bool:
+        """Indica si el punto de control corresponde a ese ataque y objetivos."""
+        return (
+            self.attack == attack
+            and self.params == _normalize(params)
+            and self.target_hashes == list(target_hashes)
+        )
+
+
+def discard_checkpoint(path: Union[str, Path]) -> None:
+    """Elimina un punto de control si existe."""
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+__all__ = [
+    "CHECKPOINT_DIR",
+    "CHECKPOINT_INTERVAL",
+    "Checkpoint",
+    "checkpoint_path",
+    "discard_checkpoint",
+]
@@ -0,0 +1,213 @@
+"""
+Formato binario de ancho fijo de los diccionarios de contraseñas.
+
+Todas las entradas válidas de un diccionario tienen exactamente
+`PASSWORD_LENGTH` caracteres ASCII, así que pueden guardarse como
+registros contiguos de `RECORD_SIZE` bytes sin separadores.  El ataque
+abre el archivo con ``mmap`` y obtiene cada lote con una sola copia del
+bloque de registros, que se parte en ``bytes`` de ancho fijo: no hay
+lectura por líneas, ni validación, ni ``decode``/``strip``/``encode`` por
+candidato, y varios procesos que abran el mismo archivo comparten sus
+páginas en la caché del sistema.  (Pasar ``memoryview`` de cada registro
+a ``hashlib`` evitaría esa copia, pero con mensajes de 10 bytes adquirir
+el búfer cuesta más que copiarlo.)
+
+El binario (``<diccionario>.bin``) es un archivo hermano del diccionario
+en texto y contiene sus entradas válidas en el mismo orden, de modo que
+el número de entrada (para reanudar o repartir) es el mismo en ambos.
+La cabecera guarda el tamaño y la fecha de modificación del texto del
+que se generó: si el texto cambia, el binario deja de usarse.  Guarda
+también cuántas líneas no vacías se omitieron por no cumplir la
+política; el ataque por reglas, cuyas palabras base no tienen por qué
+cumplirla, solo usa el binario si no falta ninguna.
+
+Estructura (enteros little-endian):
+
+    cabecera   magic ``VPDB``, versión (u16), tamaño de registro (u16),
+               número de registros N (u64), líneas omitidas (u64),
+               tamaño (u64) y fecha de modificación en ns (u64) del
+               diccionario en texto
+    registros  N contraseñas de `RECORD_SIZE` bytes
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from .dictionary_index import parse_entry
+from .packed_passwords import RECORD_SIZE
+
+MAGIC = b"VPDB"
+VERSION = 1
+BINARY_SUFFIX = ".bin"
+
+_HEADER = struct.Struct("<4sHHQQQQ")
+# Registros que se decodifican de una vez al recorrer las palabras
+_WORDS_BLOCK = 4096
+
+
+def binary_path(dictionary_path: Union[str, Path]) -> Path:
+    """Ruta del binario hermano de un diccionario en texto."""
+    return Path(dictionary_path).with_suffix(BINARY_SUFFIX)
+
+
+def build_binary_dictionary(dictionary_path: Union[str, Path]) -> Optional[int]:
+    """Genera ``<diccionario>.bin`` con las entradas válidas del texto.
+
+    Igual que `build_index`, valida cada línea con `parse_entry`; las
+    entradas se escriben en un temporal que después se renombra.
+
+    Returns:
+        Número de registros escritos o ``None`` si el texto cambió
+        durante la lectura (el binario anterior, si existe, no se toca).
+    """
+    path = Path(dictionary_path)
+    target = binary_path(path)
+    tmp_path = target.with_name(target.name + ".tmp")
+    stat = path.stat()
+    count = skipped = 0
+    with path.open("rb") as source, tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, 0, 0, 0, 0))
+        for raw in source:
+            word = parse_entry(raw)
+            if word is not None:
+                f.write(word.encode("ascii"))
+                count += 1
+            elif raw.strip():
+                skipped += 1
+        current = path.stat()
+        if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            f.close()
+            tmp_path.unlink()
+            return None
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, skipped, stat.st_size, stat.st_mtime_ns))
+    os.replace(tmp_path, target)
+    return count
+
+
+def open_binary_dictionary(dictionary_path: Union[str, Path]) -> Optional["BinaryDictionary"]:
+    """Abre el binario de un diccionario si existe y está al día.
+
+    ``dictionary_path`` puede ser el diccionario en texto (se busca su
+    binario hermano y se comprueba que corresponda a él) o directamente
+    un archivo ``.bin``.
+
+    Returns:
+        El binario abierto o ``None`` si no existe, está dañado o el
+        texto cambió después de generarlo.
+    """
+    path = Path(dictionary_path)
+    direct = path.suffix == BINARY_SUFFIX
+    try:
+        binary = BinaryDictionary(path if direct else binary_path(path))
+    except (OSError, ValueError):
+        return None
+    if not direct:
+        try:
+            stat = path.stat()
+        except OSError:
+            binary.close()
+            return None
+        if binary.source != (stat.st_size, stat.st_mtime_ns):
+            binary.close()
+            return None
+    return binary
+
+
+class BinaryDictionary:
+    """Diccionario binario abierto con ``mmap`` (solo lectura).
+
+    Se indexa como una secuencia de registros codificados:
+    ``dictionary[i]`` devuelve un registro y ``dictionary[a:b]`` la lista
+    de registros del rango, listos para ``hashlib``.
+
+    Uso:
+        with BinaryDictionary(path) as dictionary:
+            batch = dictionary[0:1000]
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._map = None
+        self._file = self.path.open("rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Diccionario binario truncado: {self.path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        magic, version, record_size, count, skipped, source_size, source_mtime = _HEADER.unpack_from(
+            self._map, 0
+        )
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"No es un diccionario binario compatible: {self.path}")
+        if _HEADER.size + count * RECORD_SIZE != size:
+            self.close()
+            raise ValueError(f"Diccionario binario truncado: {self.path}")
+        self._count = count
+        # Líneas no vacías del texto que no están en el binario
+        self.skipped = skipped
+        # Tamaño y fecha del texto del que se generó
+        self.source = (source_size, source_mtime)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "BinaryDictionary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera la proyección en memoria y el archivo."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _block(self, start: int, stop: int) -> bytes:
+        """Bytes de los registros ``[start, stop)``."""
+        return self._map[_HEADER.size + start * RECORD_SIZE:_HEADER.size + stop * RECORD_SIZE]
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[bytes, List[bytes]]:
+        """Registro ``key`` o lista de registros de un rango."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            block = self._block(start, max(start, stop))
+            return [block[i:i + RECORD_SIZE] for i in range(0, len(block), RECORD_SIZE)]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("registro fuera del diccionario")
+        return self._block(key, key + 1)
+
+    def password(self, index: int) -> str:
+        """Contraseña del registro ``index``."""
+        return self[index].decode("ascii")
+
+    def words(self, start: int = 0) -> Iterator[str]:
+        """Contraseñas desde el registro ``start``, decodificadas por bloques."""
+        for first in range(max(0, start), self._count, _WORDS_BLOCK):
+            text = self._block(first, min(first + _WORDS_BLOCK, self._count)).decode("ascii")
+            for i in range(0, len(text), RECORD_SIZE):
+                yield text[i:i + RECORD_SIZE]
+
+
+__all__ = [
+    "BINARY_SUFFIX",
+    "BinaryDictionary",
+    "binary_path",
+    "build_binary_dictionary",
+    "open_binary_dictionary",
+]
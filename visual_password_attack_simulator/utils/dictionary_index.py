@@ -0,0 +1,207 @@
+"""
+Índice persistente de los diccionarios de contraseñas.
+
+Contar las entradas válidas de un diccionario exige leerlo y validarlo
+entero.  Este módulo guarda ese trabajo en un archivo hermano
+(``<diccionario>.idx``) con:
+
+- el número de entradas que cumplen la política,
+- el desplazamiento en bytes de cada bloque de ``interval`` entradas
+  válidas, para reanudar desde una entrada concreta sin leer lo
+  anterior,
+- el tamaño, la fecha de modificación y el SHA‑256 del contenido, para
+  detectar que el diccionario cambió.
+
+Cargar el índice solo lee el archivo hermano y hace un ``stat`` del
+diccionario, por lo que puede hacerse en el hilo de la interfaz.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .password_requirements import meets_password_requirements
+
+INDEX_VERSION = 1
+# Entradas válidas entre dos desplazamientos guardados
+INDEX_INTERVAL = 1000
+INDEX_SUFFIX = ".idx"
+_READ_SIZE = 1 << 20
+
+
+def parse_entry(raw: bytes) -> Optional[str]:
+    """Convierte una línea del diccionario en contraseña si cumple la política."""
+    word = raw.decode('utf-8', errors='ignore').strip()
+    if word and meets_password_requirements(word):
+        return word
+    return None
+
+
+def index_path(dictionary_path: Union[str, Path]) -> Path:
+    """Ruta del archivo de índice de un diccionario."""
+    path = Path(dictionary_path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _content_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open('rb') as f:
+        for block in iter(lambda: f.read(_READ_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class DictionaryIndex:
+    """Resumen persistente de un diccionario.
+
+    Atributos:
+        size: Tamaño del diccionario en bytes.
+        mtime_ns: Fecha de modificación del diccionario.
+        content_hash: SHA‑256 hexadecimal del contenido.
+        count: Entradas que cumplen la política.
+        interval: Entradas válidas entre dos desplazamientos.
+        offsets: ``offsets[i]`` es el byte donde empieza la línea de la
+            entrada válida número ``i * interval``.
+    """
+    size: int
+    mtime_ns: int
+    content_hash: str
+    count: int
+    interval: int = INDEX_INTERVAL
+    offsets: List[int] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, dictionary_path: Union[str, Path], verify: bool = False) -> Optional["DictionaryIndex"]:
+        """Carga el índice de un diccionario si sigue siendo válido.
+
+        El índice es válido si coinciden el tamaño y la fecha de
+        modificación.  Con ``verify`` se acepta además un diccionario con
+        otra fecha pero el mismo contenido (por ejemplo, una copia),
+        comprobando su SHA‑256 y actualizando el índice; esto lee el
+        archivo completo, así que no debe hacerse en el hilo de la
+        interfaz.
+
+        Returns:
+            El índice o ``None`` si no existe, está dañado o no corresponde.
+        """
+        path = Path(dictionary_path)
+        try:
+            data = json.loads(index_path(path).read_text(encoding='utf-8'))
+            stat = path.stat()
+            if data.pop('version') != INDEX_VERSION:
+                return None
+            index = cls(**data)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if index.size != stat.st_size:
+            return None
+        if index.mtime_ns == stat.st_mtime_ns:
+            return index
+        if verify and _content_hash(path) == index.content_hash:
+            index.mtime_ns = stat.st_mtime_ns
+            index.save(path)
+            return index
+        return None
+
+    def save(self, dictionary_path: Union[str, Path]) -> None:
+        """Guarda el índice junto al diccionario (escritura atómica)."""
+        target = index_path(dictionary_path)
+        tmp_path = target.with_name(target.name + '.tmp')
+        data = {'version': INDEX_VERSION, **asdict(self)}
+        try:
+            tmp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(tmp_path, target)
+        except OSError:
+            # Sin permisos de escritura el índice simplemente no se reutiliza
+            tmp_path.unlink(missing_ok=True)
+
+    def locate(self, entry: int) -> Tuple[int, int]:
+        """Punto de lectura más cercano por debajo de la entrada válida ``entry``.
+
+        Returns:
+            Tupla ``(desplazamiento en bytes, número de la primera entrada
+            válida a partir de ese desplazamiento)``.
+        """
+        if not self.offsets or entry <= 0:
+            return 0, 0
+        block = min(entry // self.interval, len(self.offsets) - 1)
+        return self.offsets[block], block * self.interval
+
+
+class IndexBuilder:
+    """Construye un `DictionaryIndex` durante una lectura secuencial.
+
+    Permite que quien ya recorre el diccionario (por ejemplo, el ataque)
+    obtenga el índice en la misma pasada.
+    """
+
+    def __init__(self, interval: int = INDEX_INTERVAL) -> None:
+        self.interval = max(1, interval)
+        self.offset = 0
+        self.count = 0
+        self.offsets: List[int] = []
+        self._hash = hashlib.sha256()
+
+    def add(self, raw: bytes, valid: bool) -> None:
+        """Registra la siguiente línea del diccionario (con su salto de línea)."""
+        if valid:
+            if self.count % self.interval == 0:
+                self.offsets.append(self.offset)
+            self.count += 1
+        self._hash.update(raw)
+        self.offset += len(raw)
+
+    def finish(self, dictionary_path: Union[str, Path], stat: os.stat_result) -> Optional[DictionaryIndex]:
+        """Guarda y devuelve el índice si la lectura cubrió el archivo sin cambios.
+
+        Args:
+            stat: Resultado de ``os.stat`` tomado antes de empezar a leer.
+        """
+        path = Path(dictionary_path)
+        try:
+            current = path.stat()
+        except OSError:
+            return None
+        if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns) or self.offset != stat.st_size:
+            return None
+        index = DictionaryIndex(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=self._hash.hexdigest(),
+            count=self.count,
+            interval=self.interval,
+            offsets=self.offsets,
+        )
+        index.save(path)
+        return index
+
+
+def build_index(dictionary_path: Union[str, Path], interval: int = INDEX_INTERVAL) -> Optional[DictionaryIndex]:
+    """Lee un diccionario completo y guarda su índice.
+
+    Returns:
+        El índice o ``None`` si el archivo cambió durante la lectura.
+    """
+    path = Path(dictionary_path)
+    stat = path.stat()
+    builder = IndexBuilder(interval)
+    with path.open('rb') as f:
+        for raw in f:
+            builder.add(raw, parse_entry(raw) is not None)
+    return builder.finish(path, stat)
+
+
+__all__ = [
+    "INDEX_INTERVAL",
+    "DictionaryIndex",
+    "IndexBuilder",
+    "build_index",
+    "index_path",
+    "parse_entry",
+]
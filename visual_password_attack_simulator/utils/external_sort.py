@@ -0,0 +1,174 @@
+"""
+Ordenación externa de cadenas con memoria acotada.
+
+`ExternalSorter` acumula cadenas en memoria hasta un límite de bytes;
+al superarlo ordena y deduplica el búfer y lo vuelca a un archivo
+temporal (una *run*).  Al recorrerlo se mezclan todas las runs con
+``heapq.merge`` y se obtienen las cadenas ordenadas y sin repetir, sin
+tener nunca más de un búfer en memoria.  Si hay muchas runs se mezclan
+por grupos de `MERGE_FAN_IN` para no abrir demasiados archivos a la vez.
+
+El orden es el de ``sorted`` sobre ``str``, de modo que el resultado es
+idéntico al de ``sorted(set(cadenas))``.  Las cadenas no pueden contener
+saltos de línea.
+
+Con ``packed=True`` el búfer es un `PackedPasswords` (10 bytes por
+contraseña en lugar de unos 67), de modo que caben muchas más entradas
+por run; solo admite contraseñas de `PASSWORD_LENGTH` caracteres del
+alfabeto permitido.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .packed_passwords import PackedPasswords
+
+# Bytes que ocupa en memoria una cadena corta además de sus caracteres
+# (objeto ``str`` y su puntero en la lista del búfer)
+ITEM_OVERHEAD = 57
+# Runs que se mezclan a la vez como máximo
+MERGE_FAN_IN = 64
+# Búfer de lectura/escritura de cada run
+RUN_BUFFER = 1 << 16
+
+
+def read_run(path: Union[str, Path]) -> Iterator[str]:
+    """Cadenas de una run (o de cualquier archivo ordenado, una por línea)."""
+    with open(path, 'r', encoding='utf-8', newline='\n', buffering=RUN_BUFFER) as f:
+        for line in f:
+            yield line[:-1] if line.endswith('\n') else line
+
+
+def write_run(path: Union[str, Path], items: Iterable[str]) -> int:
+    """Escribe cadenas, una por línea; devuelve cuántas se escribieron."""
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='\n', buffering=RUN_BUFFER) as f:
+        for item in items:
+            f.write(item)
+            f.write('\n')
+            count += 1
+    return count
+
+
+def unique_merge(*sources: Iterable[str]) -> Iterator[str]:
+    """Mezcla iterables ordenados omitiendo los repetidos."""
+    previous: Optional[str] = None
+    for item in heapq.merge(*sources):
+        if item != previous:
+            yield item
+            previous = item
+
+
+class ExternalSorter:
+    """Ordena y deduplica cadenas usando como mucho ``memory_bytes`` de búfer.
+
+    Args:
+        directory: Directorio de las runs temporales (por defecto, el
+            temporal del sistema).
+        memory_bytes: Tamaño aproximado del búfer en memoria.
+        name: Prefijo de los archivos de las runs.
+        packed: Guarda el búfer empaquetado (ver `PackedPasswords`).
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        memory_bytes: int = 64 << 20,
+        name: str = 'run',
+        packed: bool = False,
+    ) -> None:
+        self.directory = Path(directory or tempfile.gettempdir())
+        self.memory_bytes = max(1, memory_bytes)
+        self.name = name
+        self.packed = packed
+        self.runs: List[Path] = []
+        self._buffer = self._new_buffer()
+        self._overhead = 0 if packed else ITEM_OVERHEAD
+        self._buffered = 0
+        self.added = 0
+
+    def _new_buffer(self) -> Union[List[str], PackedPasswords]:
+        return PackedPasswords() if self.packed else []
+
+    def _sorted_buffer(self) -> Iterable[str]:
+        """El búfer ordenado y sin repetidos."""
+        if self.packed:
+            return self._buffer.sorted_unique()
+        return sorted(set(self._buffer))
+
+    def add(self, item: str) -> None:
+        self._buffer.append(item)
+        self._buffered += len(item) + self._overhead
+        self.added += 1
+        if self._buffered >= self.memory_bytes:
+            self.spill()
+
+    def extend(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def spill(self) -> None:
+        """Vuelca el búfer (ordenado y sin repetidos) a una nueva run."""
+        if not self._buffer:
+            return
+        fd, name = tempfile.mkstemp(prefix=f"{self.name}-", suffix='.run', dir=self.directory)
+        os.close(fd)
+        write_run(name, self._sorted_buffer())
+        self.runs.append(Path(name))
+        self._buffer = self._new_buffer()
+        self._buffered = 0
+        if len(self.runs) >= 2 * MERGE_FAN_IN:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Mezcla las primeras `MERGE_FAN_IN` runs en una sola."""
+        group, self.runs = self.runs[:MERGE_FAN_IN], self.runs[MERGE_FAN_IN:]
+        fd, name = tempfile.mkstemp(prefix=f"{self.name}-", suffix='.run', dir=self.directory)
+        os.close(fd)
+        write_run(name, unique_merge(*(read_run(path) for path in group)))
+        for path in group:
+            path.unlink()
+        self.runs.insert(0, Path(name))
+
+    def __iter__(self) -> Iterator[str]:
+        """Todas las cadenas añadidas, ordenadas y sin repetir.
+
+        Si ya hay runs, el búfer se vuelca también para no tenerlo en
+        memoria durante la mezcla; si no, se ordena en memoria.
+        """
+        if not self.runs:
+            return iter(self._sorted_buffer())
+        self.spill()
+        while len(self.runs) > MERGE_FAN_IN:
+            self._collapse()
+        return unique_merge(*(read_run(path) for path in self.runs))
+
+    def close(self) -> None:
+        """Borra las runs y vacía el búfer."""
+        for path in self.runs:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.runs = []
+        self._buffer = self._new_buffer()
+        self._buffered = 0
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = [
+    "ExternalSorter",
+    "read_run",
+    "unique_merge",
+    "write_run",
+]
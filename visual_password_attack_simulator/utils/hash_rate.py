@@ -0,0 +1,198 @@
+"""
+Velocidad de hashing de la máquina local y tiempo estimado de los ataques.
+
+La entropía (``log2(N^L)``) no dice cuánto tardaría cada ataque del
+simulador.  Este módulo mide, en una prueba corta, los candidatos/s de las
+dos rutas de hashing que usan los ataques:
+
+- ``batched``: lotes de candidatos codificados con `find_digest_matches`
+  (diccionario, reglas, híbrido);
+- ``prefix``: recorrido de un `Keyspace` con ``search_valid``, que
+  reutiliza el estado SHA‑256 de cada prefijo (fuerza bruta y máscara, por
+  proceso).
+
+El resultado se guarda en ``cache/hash_rate.json`` bajo una huella de la
+máquina (nombre, arquitectura, núcleos, versión de Python y de OpenSSL),
+de modo que la prueba solo se repite en otra máquina, con otra versión o
+pasado `MAX_AGE`.  Con esas velocidades y el número exacto de candidatos
+de cada ataque, `estimate_seconds` da el tiempo para agotarlo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import platform
+import ssl
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from .hash_utils import find_digest_matches, iter_batches
+from .keyspace import Keyspace
+from .password_requirements import ALLOWED_CHARACTERS, PASSWORD_LENGTH
+
+HASH_RATE_VERSION = 1
+HASH_RATE_PATH = Path(__file__).resolve().parent.parent / "cache" / "hash_rate.json"
+# Segundos que dura la medición de cada ruta
+MEASURE_SECONDS = 0.25
+# Antigüedad máxima (segundos) de una medición guardada
+MAX_AGE = 30 * 24 * 3600.0
+# Resumen que no coincide con ningún candidato: se recorre todo
+_MISSING_DIGEST = hashlib.sha256(b"no-existe").digest()
+
+
+@dataclass
+class HashRates:
+    """Candidatos/s medidos en esta máquina.
+
+    Atributos:
+        batched: Ruta por lotes (`find_digest_matches`).
+        prefix: Ruta de ``Keyspace.search_valid`` en un solo proceso.
+        measured_at: Marca de tiempo de la medición.
+    """
+    batched: float
+    prefix: float
+    measured_at: float
+
+    def rate(self, keyspace: bool = False, workers: int = 1) -> float:
+        """Candidatos/s de un ataque según su ruta y sus procesos.
+
+        Con varios procesos se supone un escalado lineal; es una cota
+        optimista, porque los núcleos comparten caché y frecuencia.
+        """
+        return (self.prefix if keyspace else self.batched) * max(1, workers)
+
+
+def machine_fingerprint() -> str:
+    """Huella de lo que determina la velocidad de hashing en esta máquina."""
+    return "|".join([
+        platform.node(),
+        platform.machine(),
+        platform.processor(),
+        str(os.cpu_count()),
+        platform.python_implementation(),
+        platform.python_version(),
+        ssl.OPENSSL_VERSION,
+    ])
+
+
+def _measure(step, seconds: float) -> float:
+    """Ejecuta ``step`` (que devuelve los candidatos probados) durante
+    ``seconds`` y devuelve candidatos/s."""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        count += step()
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def measure_hash_rates(seconds: float = MEASURE_SECONDS) -> HashRates:
+    """Mide las dos rutas de hashing durante ``seconds`` cada una."""
+    targets = {_MISSING_DIGEST}
+    keyspace = Keyspace.brute_force(ALLOWED_CHARACTERS, PASSWORD_LENGTH)
+    sample = [candidate.encode('utf-8') for _, candidate in itertools.islice(keyspace.iter_valid(), 8192)]
+    batches = list(iter_batches(sample))
+
+    def batched_step() -> int:
+        for batch in batches:
+            find_digest_matches(batch, targets)
+        return len(sample)
+
+    search = keyspace.search_valid(targets)
+
+    def prefix_step() -> int:
+        checked_total = 0
+        for checked, _, _, _ in search:
+            checked_total += checked
+            if checked_total >= len(sample):
+                break
+        return checked_total
+
+    return HashRates(
+        batched=_measure(batched_step, seconds),
+        prefix=_measure(prefix_step, seconds),
+        measured_at=time.time(),
+    )
+
+
+def load_hash_rates(
+    path: Union[str, Path] = HASH_RATE_PATH,
+    refresh: bool = False,
+) -> HashRates:
+    """Velocidades de esta máquina: guardadas si son válidas, si no se miden.
+
+    Args:
+        path: Archivo de la caché; guarda una medición por huella de máquina.
+        refresh: Mide aunque haya una medición válida.
+    """
+    path = Path(path)
+    fingerprint = machine_fingerprint()
+    try:
+        with path.open('r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict) or data.get('version') != HASH_RATE_VERSION:
+        data = {'version': HASH_RATE_VERSION, 'machines': {}}
+    machines = data.setdefault('machines', {})
+    cached = machines.get(fingerprint)
+    if cached and not refresh:
+        try:
+            rates = HashRates(**cached)
+        except TypeError:
+            rates = None
+        if rates is not None and time.time() - rates.measured_at < MAX_AGE:
+            return rates
+    rates = measure_hash_rates()
+    machines[fingerprint] = asdict(rates)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        # Sin caché se vuelve a medir la próxima vez
+        pass
+    return rates
+
+
+def estimate_seconds(candidates: int, rate: float) -> float:
+    """Segundos para probar ``candidates`` a ``rate`` candidatos/s."""
+    return candidates / rate if rate > 0 else float('inf')
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Duración legible: segundos, minutos, horas, días o años."""
+    if seconds is None or seconds != seconds:
+        return "desconocido"
+    if seconds == float('inf'):
+        return "sin límite"
+    if seconds < 1:
+        return "menos de 1 s"
+    units = [("años", 365 * 24 * 3600), ("días", 24 * 3600), ("h", 3600), ("min", 60)]
+    for name, size in units:
+        if seconds >= size:
+            value = seconds / size
+            if value >= 1e6:
+                return f"{value:.1e} {name}"
+            return f"{value:,.1f} {name}"
+    return f"{seconds:.1f} s"
+
+
+__all__ = [
+    "HASH_RATE_PATH",
+    "HashRates",
+    "estimate_seconds",
+    "format_duration",
+    "load_hash_rates",
+    "machine_fingerprint",
+    "measure_hash_rates",
+]
@@ -17,13 +17,59 @@ minúsculas, números y símbolos puede superar los 79 bits【325584728368036†
 Generalmente se considera que una contraseña con más de 60 bits de entropía es
 «muy fuerte»【325584728368036†L420-L427】.  Estas referencias sirven de guía
 educativa, no como garantía de seguridad.
+
+Para los ataques se ofrece también una ruta de hashing por lotes que
+trabaja con bytes: el hash objetivo se decodifica una sola vez a sus 32
+bytes, los prefijos comunes se procesan una vez en un objeto ``hashlib``
+que después se copia para cada candidato, y se comparan los resúmenes
+binarios sin generar la representación hexadecimal de cada candidato.
+Con varios objetivos (`find_digest_matches`) cada resumen se consulta en un
+conjunto, por lo que el coste sigue siendo un hash por candidato.
+
+Para auditorías masivas (un millón de hashes o más) `digest_set` devuelve
+un `DigestSet`: un filtro de Bloom por bloques sobre los propios bits del
+resumen, que ocupa unos pocos bits por objetivo y cabe en la caché del
+procesador, respaldado por un arreglo ordenado de resúmenes que confirma
+los positivos de forma exacta.  Ocupa 32 bytes por objetivo frente a unos
+100 de un ``set`` de ``bytes`` (y cada proceso de la búsqueda paralela
+tiene su copia), pero la consulta se hace en Python y es del orden de dos
+veces más lenta; por debajo del umbral compensa el ``set``.
 """
 
 import math
 import hashlib
+import itertools
 import string
+from array import array
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import Container, Iterable, Iterator, List, Dict, Optional, Sequence, Set, Tuple, TypeVar, Union
+
+# Candidatos que los ataques agrupan antes de llamar a `find_digest_match`
+HASH_BATCH_SIZE = 1024
+
+# Para mensajes de pocos bytes la implementación interna de CPython evita el
+# coste de crear un contexto de OpenSSL por candidato y es bastante más rápida.
+try:  # Python >= 3.12
+    from _sha2 import sha256 as _short_sha256
+except ImportError:
+    try:
+        from _sha256 import sha256 as _short_sha256
+    except ImportError:
+        _short_sha256 = hashlib.sha256
+
+T = TypeVar('T')
+
+DIGEST_SIZE = 32
+# A partir de este número de objetivos `digest_set` usa un `DigestSet`
+DIGEST_SET_THRESHOLD = 1_000_000
+# Bits del filtro de Bloom por objetivo (antes de redondear a potencia de 2)
+BLOOM_BITS_PER_DIGEST = 12
+# Cada objetivo marca 2 bits de una palabra de 64; las máscaras de los
+# 12 bits altos del resumen se precalculan
+_BLOOM_MASK_SHIFT = 64 - 12
+_BLOOM_MASKS = [(1 << (i & 63)) | (1 << (i >> 6)) for i in range(1 << 12)]
+# Cubos del arreglo ordenado según los 16 primeros bits del resumen
+_BUCKET_BITS = 16
 
 
 @dataclass
@@ -49,6 +95,206 @@ def sha256_hash(text: str) -> str:
     return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
 
+def decode_digest(hex_digest: str) -> bytes:
+    """Convierte un hash SHA‑256 hexadecimal en sus 32 bytes.
+
+    Raises:
+        ValueError: Si la cadena no es un hash SHA‑256 hexadecimal.
+    """
+    digest = bytes.fromhex(hex_digest.strip())
+    if len(digest) != hashlib.sha256().digest_size:
+        raise ValueError(f"Hash SHA-256 no válido: {hex_digest!r}")
+    return digest
+
+
+def sha256_state(prefix: bytes = b'') -> "hashlib._Hash":
+    """Devuelve un objeto SHA‑256 ya alimentado con ``prefix``.
+
+    Está pensado para copiarse (``copy()``) por cada candidato que comparte
+    ese prefijo; usa la implementación más rápida para mensajes cortos.
+    """
+    return _short_sha256(prefix)
+
+
+def find_digest_match(candidates: Iterable[bytes], target_digest: bytes, prefix: bytes = b'') -> int:
+    """Busca en un lote el candidato cuyo SHA‑256 coincide con el objetivo.
+
+    Args:
+        candidates: Candidatos ya codificados como bytes.
+        target_digest: Hash objetivo en binario (ver `decode_digest`).
+        prefix: Prefijo común a todos los candidatos; se procesa una sola
+            vez y cada candidato parte de una copia de ese estado.
+
+    Returns:
+        Posición del candidato dentro del lote o -1 si ninguno coincide.
+    """
+    if not prefix:
+        sha256 = _short_sha256
+        for index, candidate in enumerate(candidates):
+            if sha256(candidate).digest() == target_digest:
+                return index
+        return -1
+    copy = hashlib.sha256(prefix).copy
+    for index, candidate in enumerate(candidates):
+        h = copy()
+        h.update(candidate)
+        if h.digest() == target_digest:
+            return index
+    return -1
+
+
+def find_digest_matches(
+    candidates: Iterable[bytes],
+    target_digests: Container[bytes],
+    prefix: bytes = b'',
+) -> List[int]:
+    """Busca en un lote todos los candidatos cuyo SHA‑256 es uno de los objetivos.
+
+    Cada candidato se hashea una sola vez y su resumen se consulta en
+    ``target_digests`` (normalmente un ``set``), de modo que el coste no
+    depende del número de objetivos.
+
+    Args:
+        candidates: Candidatos ya codificados como bytes.
+        target_digests: Hashes objetivo en binario.
+        prefix: Prefijo común a todos los candidatos.
+
+    Returns:
+        Posiciones (en orden) de los candidatos que coinciden.
+    """
+    matches: List[int] = []
+    if not prefix:
+        sha256 = _short_sha256
+        for index, candidate in enumerate(candidates):
+            if sha256(candidate).digest() in target_digests:
+                matches.append(index)
+        return matches
+    copy = hashlib.sha256(prefix).copy
+    for index, candidate in enumerate(candidates):
+        h = copy()
+        h.update(candidate)
+        if h.digest() in target_digests:
+            matches.append(index)
+    return matches
+
+
+class DigestSet:
+    """Conjunto compacto de resúmenes SHA‑256 con prefiltro de Bloom.
+
+    Los resúmenes ya son uniformes, así que el filtro no los vuelve a
+    hashear: los 8 primeros bytes eligen una palabra de 64 bits y dos bits
+    dentro de ella (un solo acceso a memoria por consulta).  Los positivos
+    se confirman con una búsqueda binaria en los resúmenes ordenados,
+    acotada por una tabla de cubos.  Los resúmenes descartados se anotan
+    aparte, de modo que se puede usar como conjunto de objetivos
+    pendientes (``in``, ``len``, iteración, `discard` y ``&=``).
+    """
+
+    def __init__(self, digests: Iterable[bytes]) -> None:
+        ordered = sorted(bytes(digest) for digest in digests)
+        if any(len(digest) != DIGEST_SIZE for digest in ordered):
+            raise ValueError("Todos los resúmenes deben tener 32 bytes")
+        unique = [digest for index, digest in enumerate(ordered) if not index or digest != ordered[index - 1]]
+        del ordered
+        self._count = len(unique)
+        self._blob = b''.join(unique)
+        words = 1
+        while words * 64 < self._count * BLOOM_BITS_PER_DIGEST:
+            words *= 2
+        self._word_mask = words - 1
+        self._words = array('Q', bytes(8 * words))
+        buckets = [0] * ((1 << _BUCKET_BITS) + 1)
+        for digest in unique:
+            h = int.from_bytes(digest[:8], 'little')
+            self._words[h & self._word_mask] |= _BLOOM_MASKS[h >> _BLOOM_MASK_SHIFT]
+            buckets[(digest[0] << 8 | digest[1]) + 1] += 1
+        for index in range(1 << _BUCKET_BITS):
+            buckets[index + 1] += buckets[index]
+        self._buckets = array('I', buckets)
+        self._removed: Set[bytes] = set()
+
+    def __len__(self) -> int:
+        return self._count - len(self._removed)
+
+    def __contains__(self, digest: object) -> bool:
+        try:
+            h = int.from_bytes(digest[:8], 'little')  # type: ignore[index]
+        except TypeError:
+            return False
+        mask = _BLOOM_MASKS[h >> _BLOOM_MASK_SHIFT]
+        if self._words[h & self._word_mask] & mask != mask:
+            return False
+        digest = bytes(digest)  # type: ignore[arg-type]
+        return self._find(digest) and digest not in self._removed
+
+    def _find(self, digest: bytes) -> bool:
+        """Búsqueda binaria exacta dentro del cubo del resumen."""
+        if len(digest) != DIGEST_SIZE:
+            return False
+        bucket = digest[0] << 8 | digest[1]
+        lo, hi = self._buckets[bucket], self._buckets[bucket + 1]
+        blob = self._blob
+        while lo < hi:
+            mid = (lo + hi) // 2
+            item = blob[mid * DIGEST_SIZE:(mid + 1) * DIGEST_SIZE]
+            if item == digest:
+                return True
+            if item < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for offset in range(0, len(self._blob), DIGEST_SIZE):
+            digest = self._blob[offset:offset + DIGEST_SIZE]
+            if digest not in self._removed:
+                yield digest
+
+    def discard(self, digest: bytes) -> None:
+        if digest in self:
+            self._removed.add(bytes(digest))
+
+    def __iand__(self, other: Container[bytes]) -> "DigestSet":
+        for digest in list(self):
+            if digest not in other:
+                self._removed.add(digest)
+        return self
+
+    def copy(self) -> "DigestSet":
+        """Copia independiente; el filtro y los resúmenes se comparten."""
+        clone = object.__new__(DigestSet)
+        clone.__dict__.update(self.__dict__)
+        clone._removed = set(self._removed)
+        return clone
+
+    @property
+    def filter_bytes(self) -> int:
+        """Tamaño del filtro de Bloom en bytes."""
+        return len(self._words) * self._words.itemsize
+
+
+def digest_set(digests: Sequence[bytes], threshold: Optional[int] = None) -> Union[Set[bytes], DigestSet]:
+    """Conjunto de resúmenes adecuado a su tamaño.
+
+    Por debajo de ``threshold`` objetivos (por defecto
+    `DIGEST_SET_THRESHOLD`) un ``set`` es lo más rápido; a partir de ahí se
+    usa un `DigestSet`, que ocupa unas tres veces menos memoria.
+    """
+    limit = DIGEST_SET_THRESHOLD if threshold is None else threshold
+    return set(digests) if len(digests) < limit else DigestSet(digests)
+
+
+def iter_batches(items: Iterable[T], size: int = HASH_BATCH_SIZE) -> Iterator[List[T]]:
+    """Agrupa un iterable en listas de como máximo ``size`` elementos."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 def calculate_entropy_bits(password: str) -> Tuple[float, int]:
     """Calcula la entropía aproximada de una contraseña en bits.
 
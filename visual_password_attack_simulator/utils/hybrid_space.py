@@ -0,0 +1,340 @@
+"""
+Espacio enumerable de contraseñas "human-like" del ataque híbrido.
+
+Para cada palabra base, el ataque híbrido combina una raíz (un prefijo de
+la palabra con alguna variante de mayúsculas y sustituciones leet, y la
+primera letra en mayúscula) con sufijos de años, dígitos y símbolos según
+unos patrones fijos.  En lugar de sortear combinaciones, `HybridSpace`
+construye una vez las raíces distintas de cada patrón y trata el producto
+raíz × campos del sufijo como un espacio con tamaño conocido:
+
+- ``count`` es el número exacto de candidatos válidos de la palabra,
+- ``unrank(i)`` devuelve el candidato ``i`` sin recorrer los anteriores,
+- ``select(limit, seed)`` recorre el espacio entero, una muestra
+  equiespaciada o una muestra aleatoria reproducible, siempre sin
+  repeticiones.
+
+Todos los sufijos aportan un dígito y un símbolo, así que la validez de
+un candidato depende solo de su raíz y se comprueba al construirla.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import itertools
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+from .password_requirements import (
+    ALLOWED_SPECIAL_CHARACTERS,
+    PASSWORD_LENGTH,
+    REQUIRED_CLASSES_MASK,
+    character_class_mask,
+)
+
+MAX_BASE_LENGTH = PASSWORD_LENGTH
+NON_ALNUM_RE = re.compile(r'[^A-Za-z0-9]')
+YEARS = [str(y) for y in range(2000, 2027)]
+LEET_MAP = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "$"}
+DIGITS = "0123456789"
+SPECIALS_PRIORITY: Sequence[str] = tuple(ch for ch in "*.-_@=+#$%&." if ch in ALLOWED_SPECIAL_CHARACTERS)
+
+# Valores de cada campo del sufijo, en orden de preferencia
+FIELD_VALUES: Dict[str, Tuple[str, ...]] = {
+    'year': tuple(YEARS),
+    'digit': tuple(DIGITS),
+    'special': tuple(dict.fromkeys(SPECIALS_PRIORITY)) or (next(iter(ALLOWED_SPECIAL_CHARACTERS)),),
+}
+
+
+@dataclass(frozen=True)
+class HybridPattern:
+    """Patrón: raíz de ``root_length`` caracteres seguida de ``fields``."""
+    name: str
+    root_length: int
+    fields: Tuple[str, ...]
+
+
+# El patrón "tail" del muestreo aleatorio (raíz de 6 a 8 + dígito +
+# símbolo) solo da 10 caracteres con raíces de 8, y entonces coincide con
+# "fernando", por lo que no se repite aquí.
+HYBRID_PATTERNS: Tuple[HybridPattern, ...] = (
+    HybridPattern('vader', 5, ('year', 'special')),
+    HybridPattern('luca', 4, ('digit', 'special', 'year')),
+    HybridPattern('fernando', 8, ('digit', 'special')),
+    HybridPattern('double_digit', 7, ('digit', 'digit', 'special')),
+)
+
+
+def sanitize_base(word: str) -> str:
+    """Elimina caracteres no alfanuméricos y recorta a la longitud permitida."""
+    return NON_ALNUM_RE.sub('', word.strip())[:MAX_BASE_LENGTH]
+
+
+def case_variants(cleaned: str) -> List[str]:
+    """Variantes de mayúsculas de la base (sin repetir).
+
+    La primera letra de la raíz se pasa siempre a mayúscula, así que la
+    variante capitalizada coincide con la minúscula y no se incluye.
+    """
+    if not cleaned:
+        return []
+    lower = cleaned.lower()
+    return list(dict.fromkeys((lower, lower[:-1] + lower[-1].upper(), lower.upper())))
+
+
+def leet_variants(root: str) -> Iterator[str]:
+    """Todas las combinaciones de sustituciones leet, de menos a más cambios."""
+    positions = [i for i, ch in enumerate(root) if ch.lower() in LEET_MAP]
+    chars = list(root)
+    for changes in range(len(positions) + 1):
+        for subset in itertools.combinations(positions, changes):
+            variant = chars[:]
+            for i in subset:
+                variant[i] = LEET_MAP[root[i].lower()]
+            yield ''.join(variant)
+
+
+@functools.lru_cache(maxsize=None)
+def _prefixes(values: Tuple[str, ...]) -> FrozenSet[str]:
+    """Todos los prefijos no vacíos de los valores de un campo."""
+    return frozenset(value[:end] for value in values for end in range(1, len(value) + 1))
+
+
+def _fields_prefix_match(text: str, fields: Sequence[Tuple[str, ...]]) -> bool:
+    """Indica si ``text`` puede ser el principio de un sufijo con ``fields``."""
+    pos = 0
+    for values in fields:
+        if pos >= len(text):
+            return True
+        if text[pos:pos + len(values[0])] not in _prefixes(values):
+            return False
+        pos += len(values[0])
+    return pos >= len(text)
+
+
+# Segmento del espacio: cabezas (mismo largo) × valores de los campos restantes
+_Segment = Tuple[List[str], List[Tuple[str, ...]]]
+
+
+def _segment_size(segment: _Segment) -> int:
+    heads, fields = segment
+    size = len(heads)
+    for values in fields:
+        size *= len(values)
+    return size
+
+
+class _Block:
+    """Candidatos de un patrón que no genera ningún patrón anterior.
+
+    Se guardan como segmentos ``(cabezas, campos restantes)``: las raíces
+    que no pueden coincidir con patrones anteriores forman el primer
+    segmento y las demás se refinan campo a campo, de modo que solo se
+    comprueban uno a uno los candidatos de las ramas que se solapan.
+    """
+
+    def __init__(self, pattern: HybridPattern, roots: List[str]) -> None:
+        self.pattern = pattern
+        self.fields = [FIELD_VALUES[field] for field in pattern.fields]
+        self.field_sets = [frozenset(values) for values in self.fields]
+        self.all_roots = frozenset(roots)
+        self.roots = roots
+        self.segments: List[_Segment] = [(roots, self.fields)]
+        self._prefix_index: Dict[int, Dict[str, List[str]]] = {}
+
+    def __contains__(self, candidate: str) -> bool:
+        k = self.pattern.root_length
+        if candidate[:k] not in self.all_roots:
+            return False
+        pos = k
+        for values, allowed in zip(self.fields, self.field_sets):
+            width = len(values[0])
+            if candidate[pos:pos + width] not in allowed:
+                return False
+            pos += width
+        return pos == len(candidate)
+
+    def covers(self, head: str, fields: Sequence[Tuple[str, ...]]) -> bool:
+        """Si todos los candidatos de ``head`` + ``fields`` están en este bloque."""
+        k = self.pattern.root_length
+        if len(head) < k or head[:k] not in self.all_roots:
+            return False
+        pos, index = k, 0
+        while pos < len(head):
+            if index == len(self.fields):
+                return False
+            width = len(self.fields[index][0])
+            if head[pos:pos + width] not in self.field_sets[index]:
+                return False
+            pos += width
+            index += 1
+        remaining = self.field_sets[index:]
+        return len(remaining) == len(fields) and all(
+            allowed.issuperset(values) for allowed, values in zip(remaining, fields)
+        )
+
+    def may_overlap(self, root: str, fields: Sequence[Tuple[str, ...]]) -> bool:
+        """Si algún candidato de ``root`` + ``fields`` podría estar en este bloque."""
+        k = self.pattern.root_length
+        if len(root) >= k:
+            return root[:k] in self.all_roots and _fields_prefix_match(root[k:], self.fields)
+        tails = self._tails_by_prefix(len(root)).get(root, ())
+        return any(_fields_prefix_match(tail, fields) for tail in tails)
+
+    def _tails_by_prefix(self, length: int) -> Dict[str, List[str]]:
+        """Agrupa las raíces por su prefijo de ``length`` caracteres."""
+        index = self._prefix_index.get(length)
+        if index is None:
+            index = {}
+            for root in self.all_roots:
+                index.setdefault(root[:length], []).append(root[length:])
+            self._prefix_index[length] = index
+        return index
+
+    def remove_overlaps(self, earlier: Sequence["_Block"]) -> None:
+        """Quita los candidatos que ya genera algún bloque anterior."""
+        if not earlier:
+            return
+        # Campos ya fijados en la cabeza -> cabezas sin solapamiento
+        groups: Dict[int, List[str]] = {}
+
+        def refine(head: str, fixed: int) -> None:
+            rest = self.fields[fixed:]
+            if any(block.covers(head, rest) for block in earlier):
+                return
+            if not any(block.may_overlap(head, rest) for block in earlier):
+                groups.setdefault(fixed, []).append(head)
+            elif fixed == len(self.fields):
+                if not any(head in block for block in earlier):
+                    groups.setdefault(fixed, []).append(head)
+            else:
+                for value in self.fields[fixed]:
+                    refine(head + value, fixed + 1)
+
+        for root in self.roots:
+            refine(root, 0)
+        self.segments = [(heads, self.fields[fixed:]) for fixed, heads in sorted(groups.items())]
+
+
+def _build_blocks(base_word: str, patterns: Sequence[HybridPattern]) -> Iterator[_Block]:
+    """Construye, patrón a patrón, los bloques disjuntos de una palabra base."""
+    variants = case_variants(sanitize_base(base_word))
+    blocks: List[_Block] = []
+    for pattern in patterns:
+        suffix_mask = 0
+        for field in pattern.fields:
+            for value in FIELD_VALUES[field]:
+                suffix_mask |= character_class_mask(value) or 0
+        roots: Dict[str, None] = {}
+        for variant in variants:
+            if len(variant) < pattern.root_length:
+                continue
+            for root in leet_variants(variant[:pattern.root_length]):
+                root = root[0].upper() + root[1:]
+                mask = character_class_mask(root)
+                if mask is not None and mask | suffix_mask == REQUIRED_CLASSES_MASK:
+                    roots.setdefault(root)
+        if not roots:
+            continue
+        block = _Block(pattern, list(roots))
+        block.remove_overlaps(blocks)
+        blocks.append(block)
+        yield block
+
+
+class HybridSpace:
+    """Candidatos del ataque híbrido para una palabra base.
+
+    Los candidatos se ordenan por patrón, después por raíz (menos
+    sustituciones leet primero) y por último por los campos del sufijo,
+    con el último campo variando más rápido.  Un candidato que pueden
+    generar varios patrones se cuenta solo en el primero.
+    """
+
+    def __init__(self, base_word: str, patterns: Sequence[HybridPattern] = HYBRID_PATTERNS) -> None:
+        self.base_word = base_word
+        self._segments: List[_Segment] = []
+        self._starts: List[int] = []
+        self.count = 0
+        for block in _build_blocks(base_word, patterns):
+            for segment in block.segments:
+                size = _segment_size(segment)
+                if size:
+                    self._starts.append(self.count)
+                    self._segments.append(segment)
+                    self.count += size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        for heads, fields in self._segments:
+            yield from map(''.join, itertools.product(heads, *fields))
+
+    def unrank(self, index: int) -> str:
+        """Candidato número ``index`` (0 <= index < count)."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        position = bisect.bisect_right(self._starts, index) - 1
+        heads, fields = self._segments[position]
+        index -= self._starts[position]
+        parts = []
+        for values in reversed(fields):
+            index, digit = divmod(index, len(values))
+            parts.append(values[digit])
+        parts.append(heads[index])
+        return ''.join(reversed(parts))
+
+    def select(self, limit: Optional[int] = None, seed: Optional[int] = None) -> Iterator[str]:
+        """Recorre hasta ``limit`` candidatos distintos.
+
+        Sin límite (o si el espacio es menor) se recorre el espacio entero.
+        Con límite y sin semilla se toma una muestra equiespaciada, que
+        reparte los intentos entre todos los patrones; con semilla, una
+        muestra aleatoria sin reemplazo que se repite en cada ejecución.
+        """
+        if not limit or limit >= self.count:
+            return iter(self)
+        if seed is None:
+            indices = (i * self.count // limit for i in range(limit))
+        else:
+            rng = random.Random(f"{seed}:{self.base_word}")
+            indices = iter(rng.sample(range(self.count), limit))
+        return map(self.unrank, indices)
+
+
+def selected_count(
+    base_word: str,
+    limit: Optional[int] = None,
+    patterns: Sequence[HybridPattern] = HYBRID_PATTERNS,
+) -> int:
+    """Número de candidatos que recorre ``HybridSpace(base_word).select(limit)``.
+
+    Construye los patrones de uno en uno y se detiene al alcanzar
+    ``limit``, por lo que con límites pequeños suele bastar el primero.
+    """
+    total = 0
+    for block in _build_blocks(base_word, patterns):
+        total += sum(map(_segment_size, block.segments))
+        if limit and total >= limit:
+            return limit
+    return total
+
+
+__all__ = [
+    "DIGITS",
+    "HYBRID_PATTERNS",
+    "LEET_MAP",
+    "SPECIALS_PRIORITY",
+    "YEARS",
+    "HybridPattern",
+    "HybridSpace",
+    "case_variants",
+    "leet_variants",
+    "sanitize_base",
+    "selected_count",
+]
@@ -0,0 +1,490 @@
+"""
+Espacios de claves indexados para los ataques de fuerza bruta y máscara.
+
+Un espacio de claves es el producto cartesiano de un alfabeto por
+posición, recorrido en el mismo orden que ``itertools.product``.  La
+clase `Keyspace` permite pasar de un índice al candidato y viceversa en
+O(longitud) mediante numeración en base mixta, sin iterar desde 0.  Con
+ello se pueden reanudar ataques, repartir rangos entre procesos y mostrar
+la posición exacta dentro del espacio.
+
+Cada posición puede contener caracteres sueltos o fragmentos de varios
+caracteres (por ejemplo años), siempre que todos los fragmentos de una
+misma posición tengan la misma longitud.
+
+Además, `Keyspace` integra la política de `password_requirements` en la
+enumeración: ``iter_valid`` recorre solo los candidatos válidos y poda los
+subárboles cuyo prefijo ya no puede completar las clases de caracteres
+obligatorias, y ``valid_count`` da el número exacto de candidatos válidos
+sin enumerarlos (programación dinámica sobre las clases que faltan).
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+import sys
+from typing import Container, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .hash_utils import HASH_BATCH_SIZE, sha256_state
+from .password_requirements import (
+    ALLOWED_CHARACTERS,
+    ALLOWED_SPECIAL_CHARACTERS,
+    PASSWORD_LENGTH,
+    REQUIRED_CLASSES_MASK,
+    character_class_mask,
+)
+
+# Conjuntos de caracteres de las máscaras (``?u?l?d?s?a``)
+MASK_SETS = {
+    'u': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'l': 'abcdefghijklmnopqrstuvwxyz',
+    'd': '0123456789',
+    's': ALLOWED_SPECIAL_CHARACTERS,
+    'a': ALLOWED_CHARACTERS,
+}
+
+
+def parse_mask(mask: str) -> List[str]:
+    """Convierte una máscara (``?u?l?l?d`` o literales) en un alfabeto por posición.
+
+    Un código desconocido produce un alfabeto vacío y un ``?`` final se
+    ignora.
+    """
+    alphabets: List[str] = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            i += 1
+            if i >= len(mask):
+                break
+            alphabets.append(MASK_SETS.get(mask[i], ''))
+        else:
+            alphabets.append(mask[i])
+        i += 1
+    return alphabets
+
+
+class Keyspace:
+    """Producto de alfabetos por posición con acceso por índice.
+
+    Los índices son siempre absolutos respecto al producto completo, de
+    modo que una porción (``keyspace[a:b]``) conserva la numeración
+    original.  Esto facilita guardar posiciones de reanudación.
+
+    Atributos:
+        alphabets: Tupla con los símbolos posibles de cada posición.
+        indices: Rango de índices absolutos que cubre esta vista.
+    """
+
+    def __init__(self, alphabets: Sequence[Sequence[str]], indices: Optional[range] = None) -> None:
+        self.alphabets: Tuple[Tuple[str, ...], ...] = tuple(tuple(chars) for chars in alphabets)
+        size = 1
+        for chars in self.alphabets:
+            size *= len(chars)
+        self.full_size = size if self.alphabets else 0
+        self.indices = indices if indices is not None else range(self.full_size)
+        self._lookup: Optional[List[Dict[str, int]]] = None
+        self._policy: Optional[_PolicyTables] = None
+
+    @classmethod
+    def brute_force(cls, alphabet: str, length: int) -> "Keyspace":
+        """Espacio de todas las cadenas de ``length`` símbolos de ``alphabet``."""
+        return cls([alphabet] * length)
+
+    def __repr__(self) -> str:
+        return f"Keyspace(posiciones={len(self.alphabets)}, indices={self.indices!r})"
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def size(self) -> int:
+        """Número de candidatos de la vista (admite enteros muy grandes)."""
+        return self.indices.stop - self.indices.start if self.indices.step == 1 else len(self.indices)
+
+    @property
+    def start(self) -> int:
+        """Primer índice absoluto de la vista."""
+        return self.indices.start
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, "Keyspace"]:
+        if isinstance(key, slice):
+            return Keyspace(self.alphabets, self.indices[key])
+        return self.unrank(self.indices[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_from(self.indices.start)
+
+    def __contains__(self, candidate: object) -> bool:
+        if not isinstance(candidate, str):
+            return False
+        try:
+            return self.rank(candidate) in self.indices
+        except ValueError:
+            return False
+
+    def digits(self, index: int) -> List[int]:
+        """Descompone un índice absoluto en la posición dentro de cada alfabeto.
+
+        La última posición es la que varía más rápido, igual que en
+        ``itertools.product``.
+        """
+        if not 0 <= index < self.full_size:
+            raise IndexError(f"Índice fuera del espacio de claves: {index}")
+        digits = [0] * len(self.alphabets)
+        for pos in range(len(self.alphabets) - 1, -1, -1):
+            index, digits[pos] = divmod(index, len(self.alphabets[pos]))
+        return digits
+
+    def unrank(self, index: int) -> str:
+        """Devuelve el candidato con el índice absoluto indicado."""
+        return ''.join(chars[d] for chars, d in zip(self.alphabets, self.digits(index)))
+
+    def rank(self, candidate: str) -> int:
+        """Devuelve el índice absoluto de un candidato.
+
+        Raises:
+            ValueError: Si el candidato no pertenece al producto completo.
+        """
+        if self._lookup is None:
+            self._lookup = [{sym: i for i, sym in reversed(list(enumerate(chars)))} for chars in self.alphabets]
+        index = 0
+        offset = 0
+        for chars, lookup in zip(self.alphabets, self._lookup):
+            width = len(chars[0]) if chars else 0
+            digit = lookup.get(candidate[offset:offset + width])
+            if digit is None:
+                raise ValueError(f"El candidato no pertenece al espacio de claves: {candidate!r}")
+            index = index * len(chars) + digit
+            offset += width
+        if offset != len(candidate):
+            raise ValueError(f"El candidato no pertenece al espacio de claves: {candidate!r}")
+        return index
+
+    def iter_from(self, index: int) -> Iterator[str]:
+        """Recorre la vista a partir de un índice absoluto (reanudación).
+
+        Para vistas contiguas se parte de los dígitos de ``index`` y se
+        encadenan bloques de ``itertools.product`` con el prefijo fijo, de
+        modo que el coste inicial es O(longitud) y no O(index).
+        """
+        stop = self.indices.stop
+        start = max(index, self.indices.start)
+        if self.indices.step != 1:
+            return map(self.unrank, (i for i in self.indices if i >= start))
+        if start >= stop:
+            return iter(())
+        digits = self.digits(start)
+        last = len(self.alphabets) - 1
+        blocks = []
+        for pos in range(last, -1, -1):
+            first = digits[pos] if pos == last else digits[pos] + 1
+            if first >= len(self.alphabets[pos]):
+                continue
+            prefix = ''.join(self.alphabets[i][digits[i]] for i in range(pos))
+            blocks.append(itertools.product((prefix,), self.alphabets[pos][first:], *self.alphabets[pos + 1:]))
+        combos = itertools.chain.from_iterable(blocks)
+        if stop < self.full_size:
+            count = stop - start
+            if count <= sys.maxsize:
+                combos = itertools.islice(combos, count)
+            else:
+                # islice no admite límites mayores que sys.maxsize
+                combos = (combo for _, combo in zip(range(count), combos))
+        return map(''.join, combos)
+
+    def split(self, chunk_size: int) -> Iterator["Keyspace"]:
+        """Divide la vista en porciones contiguas de ``chunk_size`` índices."""
+        for offset in range(0, self.size, max(1, chunk_size)):
+            yield self[offset:offset + chunk_size]
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Devuelve ``k`` candidatos distintos elegidos al azar.
+
+        Args:
+            k: Número de candidatos (se limita al tamaño de la vista).
+            rng: Generador aleatorio; se puede fijar una semilla para que
+                la muestra sea reproducible.
+        """
+        rng = rng or random.Random()
+        k = min(k, self.size)
+        if self.size <= sys.maxsize:
+            return [self.unrank(index) for index in rng.sample(self.indices, k)]
+        # random.sample no admite poblaciones mayores que sys.maxsize
+        chosen: Dict[int, None] = {}
+        while len(chosen) < k:
+            chosen.setdefault(self.indices[rng.randrange(self.size)])
+        return [self.unrank(index) for index in chosen]
+
+    # ------------------------------------------------------------------
+    # Enumeración restringida a la política de contraseñas
+    # ------------------------------------------------------------------
+
+    def _policy_tables(self) -> "_PolicyTables":
+        if self._policy is None:
+            self._policy = _PolicyTables(self.alphabets)
+        return self._policy
+
+    def count_valid_below(self, index: int) -> int:
+        """Número de candidatos válidos con índice absoluto menor que ``index``."""
+        tables = self._policy_tables()
+        if index >= self.full_size:
+            return tables.total
+        if index <= 0:
+            return 0
+        total = 0
+        missing = REQUIRED_CLASSES_MASK
+        for pos, digit in enumerate(self.digits(index)):
+            if digit:
+                total += tables.cumulative(pos, missing)[digit - 1]
+            mask = tables.masks[pos][digit]
+            if mask is None:
+                break
+            missing &= ~mask
+        return total
+
+    def valid_count(self) -> int:
+        """Número exacto de candidatos de la vista que cumplen la política."""
+        if self.indices.step != 1:
+            return sum(1 for _ in self.iter_valid())
+        return self.count_valid_below(self.indices.stop) - self.count_valid_below(self.indices.start)
+
+    def unrank_valid(self, k: int) -> int:
+        """Índice absoluto del ``k``-ésimo candidato válido del producto completo.
+
+        Raises:
+            IndexError: Si ``k`` no es menor que el total de válidos.
+        """
+        tables = self._policy_tables()
+        if not 0 <= k < tables.total:
+            raise IndexError(f"Índice de candidato válido fuera de rango: {k}")
+        index = 0
+        missing = REQUIRED_CLASSES_MASK
+        for pos in range(len(self.alphabets)):
+            cumulative = tables.cumulative(pos, missing)
+            digit = bisect.bisect_right(cumulative, k)
+            if digit:
+                k -= cumulative[digit - 1]
+            index += digit * tables.weights[pos]
+            missing &= ~tables.masks[pos][digit]
+        return index
+
+    def split_valid(self, chunk_size: int) -> Iterator["Keyspace"]:
+        """Divide la vista en porciones con ``chunk_size`` candidatos válidos.
+
+        Cada porción cuesta lo mismo de recorrer con ``iter_valid``, aunque
+        los candidatos válidos no estén repartidos de forma uniforme.
+        """
+        first = self.count_valid_below(self.indices.start)
+        last = self.count_valid_below(self.indices.stop)
+        start = self.indices.start
+        for k in range(first + chunk_size, last, max(1, chunk_size)):
+            stop = self.unrank_valid(k)
+            yield Keyspace(self.alphabets, range(start, stop))
+            start = stop
+        if first < last:
+            yield Keyspace(self.alphabets, range(start, self.indices.stop))
+
+    def iter_valid(self, start: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Genera ``(índice, candidato)`` solo para candidatos válidos.
+
+        El recorrido mantiene, para cada prefijo, las clases de caracteres
+        que aún faltan y descarta el subárbol completo cuando las
+        posiciones restantes no pueden aportarlas.  El orden es el mismo
+        que el de ``iter_from``.
+
+        Args:
+            start: Índice absoluto desde el que reanudar (incluido).
+        """
+        if self.indices.step != 1:
+            lo = self.indices.start if start is None else start
+            for index in self.indices:
+                if index >= lo:
+                    candidate = self.unrank(index)
+                    if character_class_mask(candidate) == REQUIRED_CLASSES_MASK:
+                        yield index, candidate
+            return
+        for base, prefix, _, leaves in self._valid_leaf_groups(start, hashed=False):
+            for digit, sym, _ in leaves:
+                yield base + digit, prefix + sym
+
+    def search_valid(
+        self,
+        target_digests: Container[bytes],
+        start: Optional[int] = None,
+        report_every: int = HASH_BATCH_SIZE,
+    ) -> Iterator[Tuple[int, int, str, bool]]:
+        """Busca hashes recorriendo los válidos con estados de prefijo compartidos.
+
+        Cada nivel del recorrido conserva un objeto SHA‑256 ya alimentado
+        con su prefijo.  Para cada candidato solo se copia el estado de su
+        prefijo y se añade el último símbolo, sin construir ni codificar la
+        cadena completa.  El resumen se consulta en ``target_digests``, así
+        que buscar varios hashes cuesta lo mismo que buscar uno.
+
+        Args:
+            target_digests: Hashes objetivo en binario.  Se consulta en cada
+                candidato, por lo que el llamador puede retirar de él los
+                objetivos ya descubiertos.
+            start: Índice absoluto desde el que reanudar (incluido).
+            report_every: Candidatos aproximados entre dos tuplas generadas.
+
+        Genera:
+            Tuplas ``(probados, posición, candidato, encontrado)``: los
+            candidatos probados desde la tupla anterior y el índice y texto
+            del último de ellos.  Si ``encontrado`` es ``True`` ese candidato
+            coincide con un objetivo; el recorrido continúa si se sigue
+            iterando.
+        """
+        if self.indices.step != 1:
+            raise ValueError("search_valid requiere una vista contigua del espacio de claves")
+        checked = 0
+        last = None
+        for base, prefix, state, leaves in self._valid_leaf_groups(start, hashed=True):
+            copy = state.copy
+            reported = 0
+            for tried, (digit, sym, encoded) in enumerate(leaves, 1):
+                h = copy()
+                h.update(encoded)
+                if h.digest() in target_digests:
+                    yield checked + tried - reported, base + digit, prefix + sym, True
+                    checked = 0
+                    reported = tried
+            checked += len(leaves) - reported
+            last = (base, prefix, leaves[-1])
+            if checked >= report_every:
+                yield checked, base + last[2][0], prefix + last[2][1], False
+                checked = 0
+        if checked and last is not None:
+            base, prefix, (digit, sym, _) = last
+            yield checked, base + digit, prefix + sym, False
+
+    def _valid_leaf_groups(self, start: Optional[int], hashed: bool) -> Iterator[tuple]:
+        """Recorrido en profundidad con poda que agrupa las hojas por prefijo.
+
+        Genera ``(índice base, prefijo, estado, hojas)`` para cada prefijo
+        de longitud ``n - 1`` que todavía puede cumplir la política.  Las
+        hojas son ``(dígito, símbolo, símbolo codificado)`` de la última
+        posición, ya filtradas por la política y por el rango de la vista.
+        Con ``hashed`` cada prefijo lleva un objeto SHA‑256 alimentado con
+        él; en otro caso el estado es ``None``.
+        """
+        tables = self._policy_tables()
+        lo = self.indices.start if start is None else max(start, self.indices.start)
+        hi = self.indices.stop
+        if lo >= hi or not tables.total:
+            return
+        last = len(self.alphabets) - 1
+        leaf_width = len(self.alphabets[last])
+        masks = tables.masks
+        counts = tables.counts
+        weights = tables.weights
+        encoded = tables.encoded
+        # Pila de prefijos pendientes: (posición, índice base, clases que faltan, prefijo, estado)
+        stack = [(0, 0, REQUIRED_CLASSES_MASK, '', sha256_state() if hashed else None)]
+        while stack:
+            pos, base, missing, prefix, state = stack.pop()
+            if pos == last:
+                leaves = tables.leaves(missing)
+                if not (lo <= base and base + leaf_width <= hi):
+                    leaves = [leaf for leaf in leaves if lo <= base + leaf[0] < hi]
+                if leaves:
+                    yield base, prefix, state, leaves
+                continue
+            weight = weights[pos]
+            symbols = self.alphabets[pos]
+            following = counts[pos + 1]
+            first = (lo - base) // weight if lo > base else 0
+            end = min(len(symbols), -((base - hi) // weight))
+            children = []
+            for digit in range(first, end):
+                mask = masks[pos][digit]
+                if mask is None:
+                    continue
+                rest = missing & ~mask
+                if following[rest]:
+                    child_state = None
+                    if state is not None:
+                        child_state = state.copy()
+                        child_state.update(encoded[pos][digit])
+                    children.append((pos + 1, base + digit * weight, rest, prefix + symbols[digit], child_state))
+            children.reverse()
+            stack.extend(children)
+
+
+class _PolicyTables:
+    """Tablas precalculadas para enumerar y contar candidatos válidos.
+
+    Atributos:
+        masks: Para cada posición, los bits de clase de cada símbolo
+            (``None`` si el símbolo contiene caracteres no permitidos).
+        counts: ``counts[pos][faltan]`` es el número de formas válidas de
+            completar las posiciones ``pos..n`` cuando aún faltan las
+            clases ``faltan``.
+        weights: Número de combinaciones que cubre cada símbolo de una
+            posición (producto de los tamaños de las posiciones siguientes).
+        total: Número de candidatos válidos del producto completo.
+    """
+
+    def __init__(self, alphabets: Sequence[Sequence[str]]) -> None:
+        n = len(alphabets)
+        self.masks: List[List[Optional[int]]] = [[character_class_mask(sym) for sym in chars] for chars in alphabets]
+        self.encoded: List[List[bytes]] = [[sym.encode('utf-8') for sym in chars] for chars in alphabets]
+        self.weights: List[int] = [1] * n
+        for pos in range(n - 2, -1, -1):
+            self.weights[pos] = self.weights[pos + 1] * len(alphabets[pos + 1])
+        self._alphabets = alphabets
+        self._cumulative: Dict[Tuple[int, int], List[int]] = {}
+        self._leaves: Dict[int, List[Tuple[int, str, bytes]]] = {}
+        states = REQUIRED_CLASSES_MASK + 1
+        self.counts: List[List[int]] = [[0] * states for _ in range(n + 1)]
+        uniform = all(len({len(sym) for sym in chars}) == 1 for chars in alphabets)
+        length = sum(len(chars[0]) for chars in alphabets) if n and uniform else -1
+        if length == PASSWORD_LENGTH:
+            self.counts[n][0] = 1
+            for pos in range(n - 1, -1, -1):
+                following = self.counts[pos + 1]
+                current = self.counts[pos]
+                for mask in self.masks[pos]:
+                    if mask is None:
+                        continue
+                    for missing in range(states):
+                        current[missing] += following[missing & ~mask]
+        self.total = self.counts[0][REQUIRED_CLASSES_MASK] if n else 0
+
+    def cumulative(self, pos: int, missing: int) -> List[int]:
+        """Sumas acumuladas de candidatos válidos por símbolo de ``pos``."""
+        key = (pos, missing)
+        table = self._cumulative.get(key)
+        if table is None:
+            following = self.counts[pos + 1]
+            running = 0
+            table = []
+            for mask in self.masks[pos]:
+                if mask is not None:
+                    running += following[missing & ~mask]
+                table.append(running)
+            self._cumulative[key] = table
+        return table
+
+    def leaves(self, missing: int) -> List[Tuple[int, str, bytes]]:
+        """Símbolos de la última posición que completan las clases que faltan."""
+        leaves = self._leaves.get(missing)
+        if leaves is None:
+            last = len(self.masks) - 1
+            leaves = [
+                (digit, sym, self.encoded[last][digit])
+                for digit, (sym, mask) in enumerate(zip(self._alphabets[last], self.masks[last]))
+                if mask is not None and not missing & ~mask
+            ]
+            self._leaves[missing] = leaves
+        return leaves
+
+
+__all__ = [
+    "Keyspace",
+    "MASK_SETS",
+    "parse_mask",
+]
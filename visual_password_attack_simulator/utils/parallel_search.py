@@ -0,0 +1,193 @@
+"""
+Búsqueda paralela sobre espacios de claves definidos por alfabetos.
+
+Los ataques de fuerza bruta y de máscara recorren el producto cartesiano
+de un alfabeto por posición.  Este módulo divide ese producto (un
+`Keyspace`) en rangos de índices contiguos, los reparte entre procesos
+trabajadores y agrega sus resultados.  Así el hashing se ejecuta
+en varios núcleos sin competir por el GIL con el hilo de la interfaz.
+
+El módulo no depende de Qt: el ataque que lo utiliza recibe el progreso y
+el resultado mediante funciones de retorno.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+from .keyspace import Keyspace
+
+# Candidatos válidos que procesa cada tarea
+CHUNK_SIZE = 50_000
+# Segundos entre consultas de cancelación en el hilo coordinador
+POLL_INTERVAL = 0.1
+
+_cancel_event = None
+_target_digests: Collection[bytes] = frozenset()
+
+
+def default_workers() -> int:
+    """Número de procesos sugerido: todos los núcleos menos uno."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _init_worker(cancel_event, target_digests: Collection[bytes]) -> None:
+    # Los objetivos se envían una vez por proceso, no con cada tarea
+    global _cancel_event, _target_digests
+    _cancel_event = cancel_event
+    _target_digests = target_digests
+
+
+def _search_range(keyspace: Keyspace) -> Tuple[int, List[Tuple[int, str]]]:
+    """Tarea de un trabajador: recorre un rango y busca los hashes objetivo.
+
+    Returns:
+        Tupla ``(intentos, aciertos)``; cada acierto es ``(intentos hasta
+        el acierto, contraseña)``.  Si la búsqueda se cancela, los intentos
+        cuentan solo lo recorrido.
+    """
+    target_digests = _target_digests
+    attempts = 0
+    hits: List[Tuple[int, str]] = []
+    for checked, _, candidate, found in keyspace.search_valid(target_digests):
+        attempts += checked
+        if found:
+            hits.append((attempts, candidate))
+            if len(hits) == len(target_digests):
+                break
+            continue
+        # La cancelación se consulta una vez por grupo de candidatos
+        if _cancel_event is not None and _cancel_event.is_set():
+            break
+    return attempts, hits
+
+
+class ParallelKeyspaceSearch:
+    """Coordina la búsqueda de hashes repartiendo el espacio entre procesos.
+
+    El espacio se reparte en porciones con el mismo número de candidatos
+    válidos, de modo que todas las tareas cuestan lo mismo.
+
+    Con ``lane`` (un ``attacks.scheduler.WorkerLane``) cada porción se
+    envía solo si el planificador concede un trabajador, que se devuelve
+    al terminarla; así varios ataques comparten los núcleos.
+
+    Atributos:
+        attempts: Candidatos válidos probados por las tareas completadas.
+        position: Índice absoluto del espacio por debajo del cual todas las
+            tareas han terminado; sirve como punto de reanudación.
+    """
+
+    def __init__(
+        self,
+        keyspace: Keyspace,
+        target_digests: Collection[bytes],
+        workers: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+        lane: Optional[Any] = None,
+    ) -> None:
+        self.keyspace = keyspace
+        self.lane = lane
+        self.target_digests = target_digests
+        self.workers = workers or default_workers()
+        self.chunk_size = max(1, chunk_size)
+        self.attempts = 0
+        self.position = keyspace.start
+
+    def run(
+        self,
+        should_stop: Callable[[], bool],
+        on_progress: Callable[..., None],
+        on_found: Callable[[str, int], bool],
+    ) -> None:
+        """Ejecuta la búsqueda hasta descubrir todos los hashes, agotar o cancelar.
+
+        Args:
+            should_stop: Se consulta periódicamente; si devuelve ``True`` se
+                cancelan las tareas pendientes.
+            on_progress: Recibe el número acumulado de intentos (y la
+                posición como argumento ``position``) cada vez que termina
+                una tarea.
+            on_found: Recibe cada contraseña descubierta y los intentos
+                acumulados; si devuelve ``True`` (no quedan objetivos) la
+                búsqueda termina.
+        """
+        chunks = self.keyspace.split_valid(self.chunk_size)
+        # "spawn" evita heredar el estado de los hilos de Qt mediante fork
+        ctx = multiprocessing.get_context('spawn')
+        cancel_event = ctx.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(cancel_event, self.target_digests),
+        )
+        pending: Dict[Future, Keyspace] = {}
+        # Inicios de las tareas en vuelo, en orden, para calcular `position`
+        in_flight: List[int] = []
+        next_start = self.keyspace.start
+        # Porción a la espera de que el planificador conceda un trabajador
+        deferred: Optional[Keyspace] = None
+        done_all = False
+        try:
+            while True:
+                while len(pending) < self.workers * 2:
+                    chunk = deferred if deferred is not None else next(chunks, None)
+                    deferred = None
+                    if chunk is None:
+                        break
+                    if self.lane is not None and not self.lane.try_acquire():
+                        deferred = chunk
+                        break
+                    future = executor.submit(_search_range, chunk)
+                    pending[future] = chunk
+                    in_flight.append(chunk.start)
+                    next_start = chunk.indices.stop
+                if not pending:
+                    if deferred is None:
+                        break
+                    if should_stop():
+                        break
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                done, _ = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                # En el orden del espacio: ``wait`` devuelve un conjunto y los
+                # intentos de cada acierto no deben depender de ese orden
+                for future in sorted(done, key=lambda future: pending[future].start):
+                    in_flight.remove(pending.pop(future).start)
+                    if self.lane is not None:
+                        self.lane.release()
+                    attempts, hits = future.result()
+                    for offset, password in hits:
+                        if on_found(password, self.attempts + offset):
+                            # Se descartan los intentos posteriores al último acierto
+                            done_all = True
+                            attempts = offset
+                            break
+                    self.attempts += attempts
+                    if done_all:
+                        break
+                if done_all:
+                    break
+                if done:
+                    self.position = in_flight[0] if in_flight else next_start
+                    on_progress(self.attempts, position=self.position)
+                if should_stop():
+                    break
+        finally:
+            cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.lane is not None:
+                for _ in pending:
+                    self.lane.release()
+
+
+__all__ = [
+    "CHUNK_SIZE",
+    "ParallelKeyspaceSearch",
+    "default_workers",
+]
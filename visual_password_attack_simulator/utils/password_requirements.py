@@ -10,7 +10,7 @@ el comportamiento coherente en todo el proyecto.
 from __future__ import annotations
 
 import string
-from typing import List
+from typing import List, Optional
 
 # Requisitos fijos
 PASSWORD_LENGTH = 10
@@ -18,24 +18,45 @@ ALLOWED_SPECIAL_CHARACTERS = "*.-_@=|+<>%&#$"
 FORBIDDEN_CHARACTERS = set("ÑñáéíóúÁÉÍÓÚ")
 ALLOWED_CHARACTERS = string.ascii_letters + string.digits + ALLOWED_SPECIAL_CHARACTERS
 
+# Clases de caracteres de las que se exige al menos un representante.  Cada
+# clase ocupa un bit para poder seguir cuáles faltan mientras se construye
+# un candidato carácter a carácter.
+REQUIRED_CHARACTER_CLASSES = (
+    string.ascii_lowercase,
+    string.ascii_uppercase,
+    string.digits,
+    ALLOWED_SPECIAL_CHARACTERS,
+)
+REQUIRED_CLASSES_MASK = (1 << len(REQUIRED_CHARACTER_CLASSES)) - 1
+_CHARACTER_CLASS_BITS = {
+    ch: 1 << bit
+    for bit, chars in enumerate(REQUIRED_CHARACTER_CLASSES)
+    for ch in chars
+}
+
 
 def meets_password_requirements(password: str) -> bool:
-    """Comprueba si una contraseña cumple la política declarada."""
-    if len(password) != PASSWORD_LENGTH:
-        return False
-    if any(ch in FORBIDDEN_CHARACTERS for ch in password):
-        return False
-    if not all(ch in ALLOWED_CHARACTERS for ch in password):
-        return False
-    if not any(ch.islower() for ch in password):
-        return False
-    if not any(ch.isupper() for ch in password):
-        return False
-    if not any(ch.isdigit() for ch in password):
-        return False
-    if not any(ch in ALLOWED_SPECIAL_CHARACTERS for ch in password):
-        return False
-    return True
+    """Comprueba si una contraseña cumple la política declarada.
+
+    Equivale a comprobar uno a uno los requisitos de `unmet_requirements`
+    (los caracteres prohibidos no están en `ALLOWED_CHARACTERS`), pero en
+    una sola pasada sobre la contraseña.
+    """
+    return len(password) == PASSWORD_LENGTH and character_class_mask(password) == REQUIRED_CLASSES_MASK
+
+
+def character_class_mask(text: str) -> Optional[int]:
+    """Devuelve los bits de `REQUIRED_CHARACTER_CLASSES` presentes en ``text``.
+
+    Devuelve ``None`` si algún carácter no está permitido por la política.
+    """
+    mask = 0
+    for ch in text:
+        bit = _CHARACTER_CLASS_BITS.get(ch)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
 
 
 def unmet_requirements(password: str) -> List[str]:
@@ -63,6 +84,9 @@ __all__ = [
     "ALLOWED_SPECIAL_CHARACTERS",
     "FORBIDDEN_CHARACTERS",
     "ALLOWED_CHARACTERS",
+    "REQUIRED_CHARACTER_CLASSES",
+    "REQUIRED_CLASSES_MASK",
+    "character_class_mask",
     "meets_password_requirements",
     "unmet_requirements",
 ]
@@ -0,0 +1,353 @@
+"""
+Tablas arcoíris con cadenas (Hellman/Oechslin) sobre el espacio de la política.
+
+Una tabla de consulta directa guarda cada contraseña junto a su hash, de
+modo que ocupa tanto como el diccionario.  Una tabla arcoíris guarda solo
+el inicio y el final de cadenas de longitud ``L``:
+
+    p0 --H--> h0 --R0--> p1 --H--> h1 --R1--> ... --R(L-1)--> pL
+
+donde ``H`` es SHA‑256 y ``R_i`` es una función de reducción distinta por
+columna que convierte un hash en otra contraseña *válida* del espacio
+(``Keyspace.unrank_valid`` sobre el resumen tomado como entero).  Cada
+cadena cubre ``L`` contraseñas con solo dos enteros en disco; a cambio,
+cada consulta recalcula hasta ``L²/2`` pasos por tabla.  Varias tablas con
+funciones de reducción distintas (una sal por tabla) aumentan la
+cobertura.  Es el compromiso tiempo–memoria que el simulador quiere
+mostrar.
+
+El archivo binario contiene (enteros little-endian salvo los rangos):
+
+    cabecera   magic ``VPRC``, versión (u16), reservado (u16), longitud
+               de los metadatos JSON (u32)
+    metadatos  JSON con los alfabetos, la longitud de cadena y, para cada
+               tabla, su número e índice de cadenas
+    tablas     por cada tabla, los finales ordenados y después los
+               inicios, como rangos de candidatos válidos de 16 bytes
+               big-endian (el orden de bytes coincide con el numérico)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import multiprocessing
+import mmap
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .keyspace import Keyspace
+
+MAGIC = b"VPRC"
+VERSION = 1
+# Longitud de cadena, número de tablas y cadenas por tabla por defecto
+CHAIN_LENGTH = 200
+TABLE_COUNT = 4
+CHAINS_PER_TABLE = 5000
+# Cadenas que calcula cada tarea al generar en paralelo
+CHAINS_PER_TASK = 250
+
+RANK_SIZE = 16
+_HEADER = struct.Struct("<4sHHI")
+
+
+def _table_salt(table: int) -> int:
+    """Sal de la familia de reducciones de una tabla."""
+    return int.from_bytes(hashlib.sha256(f"tabla-{table}".encode("ascii")).digest()[:RANK_SIZE], "big")
+
+
+class ChainSpace:
+    """Espacio de candidatos válidos con las funciones de reducción de las cadenas.
+
+    Los puntos de las cadenas se representan por su rango entre los
+    candidatos válidos del `Keyspace` (de 0 a ``total - 1``).
+    """
+
+    def __init__(self, keyspace: Keyspace) -> None:
+        self.keyspace = keyspace
+        self.total = keyspace.valid_count()
+        if not self.total:
+            raise ValueError("El espacio de claves no contiene candidatos válidos")
+        if self.total >> (8 * RANK_SIZE):
+            raise ValueError("El espacio de claves es demasiado grande para las cadenas")
+        self._salts: Dict[int, int] = {}
+
+    def candidate(self, rank: int) -> str:
+        """Contraseña válida con el rango indicado."""
+        return self.keyspace.unrank(self.keyspace.unrank_valid(rank))
+
+    def reduce(self, digest: bytes, table: int, column: int) -> int:
+        """Función de reducción ``R_column`` de la tabla ``table``."""
+        salt = self._salts.get(table)
+        if salt is None:
+            salt = self._salts[table] = _table_salt(table)
+        value = int.from_bytes(digest[:RANK_SIZE], "big") ^ salt
+        return (value + column) % self.total
+
+    def walk(self, rank: int, table: int, first: int, last: int) -> int:
+        """Avanza una cadena desde la columna ``first`` hasta ``last`` (excluida)."""
+        candidate = self.candidate
+        reduce = self.reduce
+        for column in range(first, last):
+            rank = reduce(hashlib.sha256(candidate(rank).encode("utf-8")).digest(), table, column)
+        return rank
+
+
+def _chain_task(alphabets: Sequence[Sequence[str]], table: int, chain_length: int, starts: List[int]) -> List[Tuple[int, int]]:
+    """Tarea de un trabajador: calcula ``(final, inicio)`` de varias cadenas."""
+    space = ChainSpace(Keyspace(alphabets))
+    return [(space.walk(start, table, 0, chain_length), start) for start in starts]
+
+
+def generate_tables(
+    keyspace: Keyspace,
+    chain_length: int = CHAIN_LENGTH,
+    table_count: int = TABLE_COUNT,
+    chains_per_table: int = CHAINS_PER_TABLE,
+    workers: int = 1,
+    seed: int = 0,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[int, int]]:
+    """Genera las cadenas de varias tablas, en paralelo si ``workers > 1``.
+
+    Los inicios se eligen al azar (con semilla) entre los candidatos
+    válidos.  Las cadenas que terminan en el mismo final se fusionaron en
+    algún punto, así que solo se conserva una (tablas "perfectas").
+
+    Args:
+        on_progress: Recibe las cadenas calculadas y el total previsto.
+
+    Returns:
+        Para cada tabla, un diccionario ``final -> inicio``.
+    """
+    space = ChainSpace(keyspace)
+    rng = random.Random(seed)
+    tasks = []
+    for table in range(table_count):
+        starts = [rng.randrange(space.total) for _ in range(chains_per_table)]
+        for offset in range(0, len(starts), CHAINS_PER_TASK):
+            tasks.append((table, starts[offset:offset + CHAINS_PER_TASK]))
+    tables: List[Dict[int, int]] = [{} for _ in range(table_count)]
+    expected = table_count * chains_per_table
+    done = 0
+
+    def collect(table: int, chains: List[Tuple[int, int]]) -> None:
+        nonlocal done
+        for endpoint, start in chains:
+            tables[table].setdefault(endpoint, start)
+        done += len(chains)
+        if on_progress is not None:
+            on_progress(done, expected)
+
+    if workers <= 1:
+        for table, starts in tasks:
+            collect(table, _chain_task(keyspace.alphabets, table, chain_length, starts))
+        return tables
+    # "spawn" para no heredar estado de hilos, igual que `parallel_search`
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+        futures = [
+            (table, executor.submit(_chain_task, keyspace.alphabets, table, chain_length, starts))
+            for table, starts in tasks
+        ]
+        for table, future in futures:
+            collect(table, future.result())
+    return tables
+
+
+def write_chain_tables(
+    path: Union[str, Path],
+    keyspace: Keyspace,
+    chain_length: int,
+    tables: Sequence[Dict[int, int]],
+) -> None:
+    """Escribe las tablas de cadenas en formato binario (escritura atómica)."""
+    path = Path(path)
+    metadata = {
+        "alphabets": ["".join(chars) for chars in keyspace.alphabets],
+        "chain_length": chain_length,
+        "tables": [{"index": table, "chains": len(chains)} for table, chains in enumerate(tables)],
+    }
+    encoded = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(encoded)))
+        f.write(encoded)
+        for chains in tables:
+            endpoints = sorted(chains)
+            f.write(b"".join(endpoint.to_bytes(RANK_SIZE, "big") for endpoint in endpoints))
+            f.write(b"".join(chains[endpoint].to_bytes(RANK_SIZE, "big") for endpoint in endpoints))
+    os.replace(tmp_path, path)
+
+
+def estimated_coverage(total: int, chain_length: int, chains: int, table_count: int) -> float:
+    """Probabilidad teórica de éxito (Oechslin) de ``table_count`` tablas.
+
+    ``m_1 = chains`` y ``m_{i+1} = N (1 - e^{-m_i/N})`` estiman los puntos
+    distintos de cada columna; una tabla cubre ``1 - Π (1 - m_i / N)``.
+    """
+    if total <= 0:
+        return 0.0
+    miss = 1.0
+    m = float(chains)
+    for _ in range(chain_length):
+        miss *= 1.0 - m / total
+        m = total * -math.expm1(-m / total)
+    return 1.0 - miss ** table_count
+
+
+class RainbowChainTable:
+    """Tablas de cadenas abiertas con ``mmap`` para consultar hashes.
+
+    Atributos:
+        space: `ChainSpace` reconstruido a partir de los alfabetos guardados.
+        chain_length: Longitud de las cadenas.
+        table_count: Número de tablas.
+        chain_count: Cadenas almacenadas entre todas las tablas.
+        hashes: Hashes SHA‑256 calculados por las consultas realizadas.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._map: Optional[mmap.mmap] = None
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Tabla de cadenas truncada: {self.path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, meta_size = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"No es una tabla de cadenas compatible: {self.path}")
+            metadata = json.loads(self._map[_HEADER.size:_HEADER.size + meta_size].decode("utf-8"))
+            self.space = ChainSpace(Keyspace(metadata["alphabets"]))
+            self.chain_length = int(metadata["chain_length"])
+            # (índice de tabla, número de cadenas, desplazamiento de sus finales)
+            self._tables: List[Tuple[int, int, int]] = []
+            offset = _HEADER.size + meta_size
+            for table in metadata["tables"]:
+                chains = int(table["chains"])
+                self._tables.append((int(table["index"]), chains, offset))
+                offset += 2 * chains * RANK_SIZE
+            if offset != size:
+                raise ValueError(f"Tabla de cadenas truncada: {self.path}")
+        except Exception:
+            self.close()
+            raise
+        self.table_count = len(self._tables)
+        self.chain_count = sum(chains for _, chains, _ in self._tables)
+        self.hashes = 0
+
+    def __enter__(self) -> "RainbowChainTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera la proyección en memoria y el archivo."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def coverage(self) -> float:
+        """Cobertura teórica de las tablas sobre el espacio de candidatos válidos."""
+        if not self.table_count:
+            return 0.0
+        per_table = self.chain_count // self.table_count
+        return estimated_coverage(self.space.total, self.chain_length, per_table, self.table_count)
+
+    def _find_start(self, chains: int, offset: int, endpoint: int) -> Optional[int]:
+        key = endpoint.to_bytes(RANK_SIZE, "big")
+        lo, hi = 0, chains
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at = offset + mid * RANK_SIZE
+            if self._map[at:at + RANK_SIZE] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        at = offset + lo * RANK_SIZE
+        if lo < chains and self._map[at:at + RANK_SIZE] == key:
+            at += chains * RANK_SIZE
+            return int.from_bytes(self._map[at:at + RANK_SIZE], "big")
+        return None
+
+    def _rebuild(self, start: int, table: int, column: int, digest: bytes) -> Optional[str]:
+        """Recorre una cadena desde su inicio buscando el hash en ``column``.
+
+        Devuelve ``None`` ante una falsa alarma (otra cadena fusionada
+        llevaba al mismo final).
+        """
+        space = self.space
+        rank = start
+        for step in range(column + 1):
+            password = space.candidate(rank)
+            current = hashlib.sha256(password.encode("utf-8")).digest()
+            self.hashes += 1
+            if current == digest:
+                return password
+            rank = space.reduce(current, table, step)
+        return None
+
+    def lookup(self, digest: bytes, should_stop: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        """Busca la contraseña de un hash recorriendo las cadenas.
+
+        Para cada tabla se supone el hash en la última columna, después en
+        la penúltima, etc., y se avanza hasta el final de la cadena; si ese
+        final está en la tabla se reconstruye la cadena desde su inicio.
+
+        Args:
+            digest: Hash SHA‑256 binario.
+            should_stop: Se consulta en cada columna; si devuelve ``True``
+                la consulta se abandona.
+        """
+        space = self.space
+        length = self.chain_length
+        for column in range(length - 1, -1, -1):
+            if should_stop is not None and should_stop():
+                return None
+            for table, chains, offset in self._tables:
+                rank = space.walk(space.reduce(digest, table, column), table, column + 1, length)
+                self.hashes += length - 1 - column
+                start = self._find_start(chains, offset, rank)
+                if start is not None:
+                    password = self._rebuild(start, table, column, digest)
+                    if password is not None:
+                        return password
+        return None
+
+    def measure(self, samples: int, seed: int = 0) -> Tuple[float, float]:
+        """Mide la cobertura real con contraseñas válidas al azar.
+
+        Returns:
+            Tupla ``(fracción encontrada, segundos medios por consulta)``.
+        """
+        rng = random.Random(seed)
+        found = 0
+        start = time.perf_counter()
+        for _ in range(samples):
+            password = self.space.candidate(rng.randrange(self.space.total))
+            if self.lookup(hashlib.sha256(password.encode("utf-8")).digest()) == password:
+                found += 1
+        elapsed = time.perf_counter() - start
+        return found / max(1, samples), elapsed / max(1, samples)
+
+
+__all__ = [
+    "CHAIN_LENGTH",
+    "CHAINS_PER_TABLE",
+    "TABLE_COUNT",
+    "ChainSpace",
+    "RainbowChainTable",
+    "estimated_coverage",
+    "generate_tables",
+    "write_chain_tables",
+]
@@ -0,0 +1,222 @@
+"""
+Formato binario de la tabla arcoíris con búsqueda por hash ordenado.
+
+La tabla en texto (``<hash_hex>:<password>`` por línea) obliga a leer y
+convertir todo el archivo en un diccionario de Python antes de la primera
+consulta.  El formato binario permite abrir la tabla con ``mmap`` y
+resolver cada consulta con una búsqueda binaria sobre los hashes
+ordenados: no hay carga completa y varios procesos que abran el mismo
+archivo comparten sus páginas en memoria.
+
+Estructura (enteros little-endian):
+
+    cabecera   magic ``VPRT``, versión (u16), reservado (u16),
+               número de entradas N (u64), tamaño del bloque de
+               contraseñas (u64)
+    cubetas    257 desplazamientos (u64): las entradas cuyo hash empieza
+               por el byte ``b`` ocupan ``[cubeta[b], cubeta[b + 1])``
+    hashes     N resúmenes SHA‑256 de 32 bytes, ordenados
+    offsets    N + 1 desplazamientos (u64) dentro del bloque de contraseñas
+    bloque     contraseñas UTF‑8 concatenadas, en el orden de los hashes
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from .external_sort import ExternalSorter
+
+MAGIC = b"VPRT"
+VERSION = 1
+DIGEST_SIZE = 32
+
+_HEADER = struct.Struct("<4sHHQQ")
+_OFFSET = struct.Struct("<Q")
+_BUCKETS = 256
+_BUCKET_TABLE = struct.Struct(f"<{_BUCKETS + 1}Q")
+_HEX_SIZE = 2 * DIGEST_SIZE
+_WRITE_BUFFER = 1 << 20
+# Memoria por defecto del búfer de ordenación al escribir una tabla
+SORT_MEMORY = 64 << 20
+
+
+def _sorted_entries(
+    entries: Iterable[Tuple[bytes, str]],
+    sorter: ExternalSorter,
+) -> None:
+    """Añade las entradas al ordenador como ``<hash hex><contraseña>``.
+
+    El hash en hexadecimal (minúsculas, ancho fijo) ordena igual que en
+    binario, así que el orden de las cadenas es el de los hashes.
+    """
+    for digest, password in entries:
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"Hash de longitud no válida: {len(digest)} bytes")
+        if "\n" in password:
+            raise ValueError("Las contraseñas no pueden contener saltos de línea")
+        sorter.add(bytes(digest).hex() + password)
+
+
+def _unique_by_digest(records: Iterable[str]) -> Iterator[Tuple[bytes, bytes]]:
+    """Registros ordenados -> ``(hash, contraseña UTF-8)``, un registro por hash."""
+    previous = None
+    for record in records:
+        hex_digest = record[:_HEX_SIZE]
+        if hex_digest == previous:
+            continue
+        previous = hex_digest
+        yield bytes.fromhex(hex_digest), record[_HEX_SIZE:].encode("utf-8")
+
+
+def write_rainbow_table(
+    path: Union[str, Path],
+    entries: Iterable[Tuple[bytes, str]],
+    memory_bytes: int = SORT_MEMORY,
+    directory: Optional[Union[str, Path]] = None,
+) -> int:
+    """Escribe una tabla binaria a partir de pares ``(hash binario, contraseña)``.
+
+    Las entradas se ordenan por hash con una ordenación externa
+    (``utils.external_sort``), de modo que la memoria no depende del
+    tamaño de la tabla, y de cada hash se conserva una sola entrada.  Una
+    primera pasada por la mezcla ordenada cuenta entradas, cubetas y
+    bytes de contraseñas; la segunda escribe hashes, offsets y bloque,
+    cada sección en su posición.  El archivo se escribe primero en un
+    temporal y después se renombra, de modo que un lector nunca ve una
+    tabla a medias.
+
+    Args:
+        memory_bytes: Memoria del búfer de ordenación.
+        directory: Directorio de las runs temporales (por defecto, el
+            temporal del sistema).
+
+    Returns:
+        Número de entradas escritas.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tempfile.TemporaryDirectory(prefix="rainbow-", dir=directory) as tmp_dir, \
+            ExternalSorter(tmp_dir, memory_bytes, "rainbow") as sorter:
+        _sorted_entries(entries, sorter)
+
+        buckets = [0] * (_BUCKETS + 1)
+        count = blob_size = 0
+        for digest, password in _unique_by_digest(sorter):
+            buckets[digest[0] + 1] += 1
+            count += 1
+            blob_size += len(password)
+        for index in range(_BUCKETS):
+            buckets[index + 1] += buckets[index]
+
+        digests_at = _HEADER.size + _BUCKET_TABLE.size
+        offsets_at = digests_at + count * DIGEST_SIZE
+        blob_at = offsets_at + (count + 1) * _OFFSET.size
+        with tmp_path.open("wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, count, blob_size))
+            f.write(_BUCKET_TABLE.pack(*buckets))
+            f.truncate(blob_at + blob_size)
+        # Tres escritores, cada uno en su sección, recorren la mezcla una vez
+        with tmp_path.open("r+b", buffering=_WRITE_BUFFER) as digests, \
+                tmp_path.open("r+b", buffering=_WRITE_BUFFER) as offsets, \
+                tmp_path.open("r+b", buffering=_WRITE_BUFFER) as blob:
+            digests.seek(digests_at)
+            offsets.seek(offsets_at)
+            blob.seek(blob_at)
+            offset = 0
+            offsets.write(_OFFSET.pack(offset))
+            for digest, password in _unique_by_digest(sorter):
+                digests.write(digest)
+                blob.write(password)
+                offset += len(password)
+                offsets.write(_OFFSET.pack(offset))
+    os.replace(tmp_path, path)
+    return count
+
+
+class RainbowTableFile:
+    """Tabla arcoíris binaria abierta con ``mmap`` (solo lectura).
+
+    Uso:
+        with RainbowTableFile(path) as table:
+            password = table.lookup(digest)
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size + _BUCKET_TABLE.size:
+                raise ValueError(f"Tabla arcoíris binaria truncada: {self.path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        magic, version, _, count, blob_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"No es una tabla arcoíris binaria compatible: {self.path}")
+        self._count = count
+        self._buckets = _BUCKET_TABLE.unpack_from(self._map, _HEADER.size)
+        self._digests_at = _HEADER.size + _BUCKET_TABLE.size
+        self._offsets_at = self._digests_at + count * DIGEST_SIZE
+        self._blob_at = self._offsets_at + (count + 1) * _OFFSET.size
+        if self._blob_at + blob_size != size:
+            self.close()
+            raise ValueError(f"Tabla arcoíris binaria truncada: {self.path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "RainbowTableFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera la proyección en memoria y el archivo."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _digest(self, index: int) -> bytes:
+        start = self._digests_at + index * DIGEST_SIZE
+        return self._map[start:start + DIGEST_SIZE]
+
+    def password(self, index: int) -> str:
+        """Contraseña de la entrada ``index`` (en orden de hash)."""
+        start, stop = struct.unpack_from("<QQ", self._map, self._offsets_at + index * _OFFSET.size)
+        return self._map[self._blob_at + start:self._blob_at + stop].decode("utf-8")
+
+    def lookup(self, digest: bytes) -> Optional[str]:
+        """Busca un hash binario y devuelve su contraseña o ``None``.
+
+        La cubeta del primer byte acota el rango y dentro de él se hace
+        una búsqueda binaria, leyendo solo las páginas que se visitan.
+        """
+        if len(digest) != DIGEST_SIZE:
+            return None
+        lo = self._buckets[digest[0]]
+        hi = self._buckets[digest[0] + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._digest(lo) == digest:
+            return self.password(lo)
+        return None
+
+
+__all__ = [
+    "RainbowTableFile",
+    "write_rainbow_table",
+]
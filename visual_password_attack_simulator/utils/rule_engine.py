@@ -0,0 +1,359 @@
+"""
+Motor de reglas de mangling con sintaxis de estilo hashcat.
+
+Un archivo de reglas contiene una regla por línea; cada regla es una
+secuencia de funciones que se aplican en orden a la palabra (los espacios
+entre funciones son opcionales, las líneas vacías y las que empiezan por
+``#`` se ignoran).  Funciones admitidas (``N``/``M`` son posiciones
+``0-9`` o ``A-Z`` = 10-35, ``X``/``Y`` son caracteres):
+
+    :    sin cambios                  l    minúsculas
+    u    mayúsculas                   c    capitalizar
+    C    capitalizar inverso          t    invertir mayúsculas
+    TN   invertir mayúscula en N      r    invertir la palabra
+    d    duplicar                     f    reflejar (palabra + invertida)
+    q    duplicar cada carácter       {    rotar a la izquierda
+    }    rotar a la derecha           $X   añadir X al final
+    ^X   añadir X al principio        [    borrar el primero
+    ]    borrar el último             DN   borrar en N
+    'N   truncar a N                  xNM  extraer M desde N
+    iNX  insertar X en N              oNX  sobrescribir N con X
+    sXY  sustituir X por Y            @X   eliminar todas las X
+    zN   repetir el primero N veces   ZN   repetir el último N veces
+    k    intercambiar los 2 primeros  K    intercambiar los 2 últimos
+    UN   mayúscula en N
+
+``UN`` no existe en hashcat (allí solo ``TN``, que invierte): pone en
+mayúsculas la posición N sin tocar una letra que ya lo esté, como hacían
+las reglas fijas originales del ataque.
+
+Cada regla se compila una sola vez: los ``$``/``^`` consecutivos se funden
+en una sola concatenación y cada función tiene una versión por lotes.
+`RuleProgram.apply_batch` aplica cada regla a un lote de palabras de una
+vez y, como casi todas las funciones cambian la longitud de forma
+conocida, solo transforma las palabras cuya longitud resultante será
+``PASSWORD_LENGTH``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .password_requirements import PASSWORD_LENGTH, meets_password_requirements
+
+# Reglas por defecto del ataque (junto a ``dictionary.txt``)
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "default.rule"
+
+_POSITIONS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Longitud máxima de palabra para la que se precalcula la longitud resultante
+_MAX_LENGTH = 64
+
+_WordFn = Callable[[str], str]
+_BatchFn = Callable[[List[str]], List[str]]
+_LengthFn = Callable[[int], Optional[int]]
+
+
+class RuleSyntaxError(ValueError):
+    """Regla con una función desconocida o argumentos incompletos."""
+
+
+def _position(rule: str, index: int) -> int:
+    if index >= len(rule) or rule[index] not in _POSITIONS:
+        raise RuleSyntaxError(f"Posición no válida en la regla {rule!r}")
+    return _POSITIONS.index(rule[index])
+
+
+def _char(rule: str, index: int) -> str:
+    if index >= len(rule):
+        raise RuleSyntaxError(f"Falta un carácter en la regla {rule!r}")
+    return rule[index]
+
+
+def parse_rule(rule: str) -> List[Tuple[str, tuple]]:
+    """Descompone una regla en una lista de ``(función, argumentos)``.
+
+    Raises:
+        RuleSyntaxError: Si la regla contiene una función desconocida.
+    """
+    ops: List[Tuple[str, tuple]] = []
+    i = 0
+    while i < len(rule):
+        op = rule[i]
+        if op in ' \t':
+            i += 1
+        elif op in ':lucCtrdfq{}[]kK':
+            if op != ':':
+                ops.append((op, ()))
+            i += 1
+        elif op in "TUD'zZ":
+            ops.append((op, (_position(rule, i + 1),)))
+            i += 2
+        elif op in '$^@':
+            ops.append((op, (_char(rule, i + 1),)))
+            i += 2
+        elif op == 's':
+            ops.append((op, (_char(rule, i + 1), _char(rule, i + 2))))
+            i += 3
+        elif op in 'io':
+            ops.append((op, (_position(rule, i + 1), _char(rule, i + 2))))
+            i += 3
+        elif op == 'x':
+            ops.append((op, (_position(rule, i + 1), _position(rule, i + 2))))
+            i += 3
+        else:
+            raise RuleSyntaxError(f"Función desconocida {op!r} en la regla {rule!r}")
+    return ops
+
+
+def _fuse(ops: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+    """Funde los sufijos y los prefijos consecutivos."""
+    fused: List[Tuple[str, tuple]] = []
+    for op, args in ops:
+        last = fused[-1] if fused else None
+        if op == '$' and last and last[0] == '$':
+            fused[-1] = ('$', (last[1][0] + args[0],))
+        elif op == '^' and last and last[0] == '^':
+            fused[-1] = ('^', (args[0] + last[1][0],))
+        else:
+            fused.append((op, args))
+    return fused
+
+
+def _compile_op(op: str, args: tuple) -> Tuple[_WordFn, Optional[_BatchFn], _LengthFn]:
+    """Función por palabra, versión por lotes (si es más rápida) y efecto en la longitud."""
+    same: _LengthFn = lambda n: n
+    if op in 'lucCt':
+        method = {'l': str.lower, 'u': str.upper, 'c': str.capitalize, 't': str.swapcase}.get(op)
+        if method is None:
+            method = lambda w: w[:1].lower() + w[1:].upper()
+            return method, None, same
+        return method, lambda words: list(map(method, words)), same
+    if op == 's':
+        src, dst = args
+        # ``str.replace`` devuelve la misma cadena si no hay coincidencias
+        return (
+            (lambda w: w.replace(src, dst)),
+            (lambda words: [w.replace(src, dst) for w in words]),
+            same,
+        )
+    if op == '$':
+        suffix = args[0]
+        return (
+            (lambda w: w + suffix),
+            (lambda words: [w + suffix for w in words]),
+            (lambda n: n + len(suffix)),
+        )
+    if op == '^':
+        prefix = args[0]
+        return (
+            (lambda w: prefix + w),
+            (lambda words: [prefix + w for w in words]),
+            (lambda n: n + len(prefix)),
+        )
+    if op == 'r':
+        return (lambda w: w[::-1]), (lambda words: [w[::-1] for w in words]), same
+    if op == 'd':
+        return (lambda w: w + w), (lambda words: [w + w for w in words]), (lambda n: 2 * n)
+    if op == 'f':
+        return (lambda w: w + w[::-1]), None, (lambda n: 2 * n)
+    if op == 'q':
+        return (lambda w: ''.join(ch + ch for ch in w)), None, (lambda n: 2 * n)
+    if op == '{':
+        return (lambda w: w[1:] + w[:1]), None, same
+    if op == '}':
+        return (lambda w: w[-1:] + w[:-1]), None, same
+    if op == '[':
+        return (
+            (lambda w: w[1:]),
+            (lambda words: [w[1:] for w in words]),
+            (lambda n: max(n - 1, 0)),
+        )
+    if op == ']':
+        return (
+            (lambda w: w[:-1]),
+            (lambda words: [w[:-1] for w in words]),
+            (lambda n: max(n - 1, 0)),
+        )
+    if op == 'k':
+        return (lambda w: w[1:2] + w[:1] + w[2:]), None, same
+    if op == 'K':
+        return (lambda w: w[:-2] + w[-1:] + w[-2:-1] if len(w) > 1 else w), None, same
+    if op == '@':
+        char = args[0]
+        # La longitud resultante depende del contenido
+        return (lambda w: w.replace(char, '')), None, (lambda n: None)
+    if op == 'T':
+        pos = args[0]
+        swap = lambda w: w[:pos] + w[pos].swapcase() + w[pos + 1:] if pos < len(w) else w
+        return swap, None, same
+    if op == 'U':
+        pos = args[0]
+        upper = lambda w: w[:pos] + w[pos].upper() + w[pos + 1:] if pos < len(w) else w
+        return upper, None, same
+    if op == 'D':
+        pos = args[0]
+        return (lambda w: w[:pos] + w[pos + 1:]), None, (lambda n: n - 1 if pos < n else n)
+    if op == "'":
+        pos = args[0]
+        return (
+            (lambda w: w[:pos]),
+            (lambda words: [w[:pos] for w in words]),
+            (lambda n: min(n, pos)),
+        )
+    if op == 'x':
+        pos, count = args
+        return (lambda w: w[pos:pos + count]), None, (lambda n: max(0, min(count, n - pos)))
+    if op == 'i':
+        pos, char = args
+        insert = lambda w: w[:pos] + char + w[pos:] if pos <= len(w) else w
+        return insert, None, (lambda n: n + 1 if pos <= n else n)
+    if op == 'o':
+        pos, char = args
+        return (lambda w: w[:pos] + char + w[pos + 1:] if pos < len(w) else w), None, same
+    if op == 'z':
+        count = args[0]
+        return (lambda w: w[:1] * count + w), None, (lambda n: n + count if n else 0)
+    if op == 'Z':
+        count = args[0]
+        return (lambda w: w + w[-1:] * count), None, (lambda n: n + count if n else 0)
+    raise RuleSyntaxError(f"Función desconocida {op!r}")
+
+
+class CompiledRule:
+    """Regla ya compilada.
+
+    Atributos:
+        source: Texto original de la regla.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        compiled = [_compile_op(op, args) for op, args in _fuse(parse_rule(source))]
+        self._word_fns = [word_fn for word_fn, _, _ in compiled]
+        self._batch_fns = [
+            batch_fn or (lambda words, fn=word_fn: list(map(fn, words)))
+            for word_fn, batch_fn, _ in compiled
+        ]
+        self._length_fns = [length_fn for _, _, length_fn in compiled]
+        self._lengths: Dict[int, Optional[int]] = {}
+
+    def output_length(self, length: int) -> Optional[int]:
+        """Longitud del resultado para una palabra de ``length`` caracteres.
+
+        Devuelve ``None`` si depende del contenido de la palabra.
+        """
+        result = self._lengths.get(length, -1)
+        if result == -1:
+            result = length
+            for length_fn in self._length_fns:
+                result = length_fn(result)
+                if result is None:
+                    break
+            self._lengths[length] = result
+        return result
+
+    def apply(self, word: str) -> str:
+        """Aplica la regla a una palabra."""
+        for word_fn in self._word_fns:
+            word = word_fn(word)
+        return word
+
+    def apply_all(self, words: List[str]) -> List[str]:
+        """Aplica la regla a un lote de palabras, función a función."""
+        for batch_fn in self._batch_fns:
+            words = batch_fn(words)
+        return words
+
+
+class RuleProgram:
+    """Conjunto de reglas compiladas que se aplica a lotes de palabras.
+
+    Uso:
+        program = RuleProgram.from_file(DEFAULT_RULES_PATH)
+        for candidate in program.apply_batch(words):
+            ...
+    """
+
+    def __init__(self, rules: Iterable[str]) -> None:
+        self.rules: List[CompiledRule] = []
+        seen = set()
+        for line in rules:
+            line = line.strip('\r\n')
+            if not line.strip() or line.lstrip().startswith('#') or line in seen:
+                continue
+            seen.add(line)
+            self.rules.append(CompiledRule(line))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "RuleProgram":
+        """Compila un archivo de reglas.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            RuleSyntaxError: Si alguna regla no es válida.
+        """
+        with Path(path).open('r', encoding='utf-8') as f:
+            return cls(f)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def apply(self, word: str) -> List[str]:
+        """Resultados de todas las reglas para una palabra, sin repetidos ni filtrar."""
+        return list(dict.fromkeys(rule.apply(word) for rule in self.rules))
+
+    def _accepted_lengths(
+        self, rule: CompiledRule, lengths: Iterable[int], length: int
+    ) -> List[int]:
+        accepted = []
+        for n in lengths:
+            out = rule.output_length(n) if n <= _MAX_LENGTH else None
+            if out is None or out == length:
+                accepted.append(n)
+        return accepted
+
+    def apply_batch(self, words: Sequence[str], length: int = PASSWORD_LENGTH) -> List[str]:
+        """Candidatos válidos de un lote de palabras, sin repetidos dentro del lote.
+
+        Las palabras se agrupan por longitud y cada regla se aplica solo a
+        los grupos que pueden dar una contraseña de ``length`` caracteres.
+        El resultado sigue el orden de las reglas y, dentro de cada una,
+        el de las palabras.
+        """
+        by_length: Dict[int, List[str]] = defaultdict(list)
+        for word in words:
+            by_length[len(word)].append(word)
+        out: List[str] = []
+        for rule in self.rules:
+            for n in self._accepted_lengths(rule, by_length, length):
+                out.extend(rule.apply_all(by_length[n]))
+        # Muchas reglas no cambian algunas palabras: se descartan los
+        # repetidos antes de validar
+        return list(filter(meets_password_requirements, dict.fromkeys(out)))
+
+    def estimate(self, length_counts: Mapping[int, int], length: int = PASSWORD_LENGTH) -> int:
+        """Cota superior del número de candidatos para un histograma de longitudes.
+
+        Args:
+            length_counts: Número de palabras base de cada longitud.
+
+        Cuenta, para cada regla, las palabras cuya longitud resultante es
+        ``length``; no descuenta los candidatos que luego no cumplen la
+        política ni los repetidos.
+        """
+        return sum(
+            length_counts[n]
+            for rule in self.rules
+            for n in self._accepted_lengths(rule, length_counts, length)
+        )
+
+
+__all__ = [
+    "DEFAULT_RULES_PATH",
+    "CompiledRule",
+    "RuleProgram",
+    "RuleSyntaxError",
+    "parse_rule",
+]